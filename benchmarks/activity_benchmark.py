@@ -0,0 +1,65 @@
+"""활동 유닛 선별(휴면) 켜기/끄기 실행 시간 비교
+
+config.yaml의 배치를 --multiplier배로 늘린 시나리오(model/scenario.py)를 만들어 activity.enabled를
+끄고/켜서 같은 시드로 --max-time까지 실행하고, 틱당 처리 시간과 평균 휴면 유닛 비율을 출력한다.
+휴면은 결과를 바꾸지 않아야 하므로 두 실행의 최종 유닛 상태와 결과가 같은지도 확인한다.
+
+실행:
+    python -m benchmarks.activity_benchmark --multiplier 4 --max-time 120
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from model.config import Config
+from model.scenario import generate, scaled_formations
+from model.terrain import Terrain
+from simulation import Simulation
+
+
+def run(config: Config, enabled: bool, max_time: float, seed: int):
+    """(결과 요약, 최종 유닛 상태, 틱당 ms, 평균 휴면 비율)"""
+    random.seed(seed)
+    simulation = Simulation(config.with_overrides({'activity.enabled': enabled}), headless=True, verbose=False)
+    ticks = dormant = 0
+    start = time.perf_counter()
+    while simulation.current_time < max_time:
+        simulation.step()
+        ticks += 1
+        dormant += len(simulation.activity.dormant)
+        if simulation.check_termination():
+            break
+        simulation.current_time += simulation.sim_speed
+    elapsed = time.perf_counter() - start
+    result = simulation.get_result('max_time')
+    units = [(unit.id, unit.position, unit.status, unit.action, unit.objective) for unit in simulation.units]
+    return result.summary(), units, elapsed * 1000 / ticks, dormant / ticks / len(simulation.units)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Activity culling benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--multiplier', type=float, default=4.0, help='Scale the config.yaml placement')
+    parser.add_argument('--max-time', type=float, default=120.0, help='Simulated seconds per run')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (scenario and simulation)')
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    scenario = generate(Terrain(config=config), scaled_formations(config, args.multiplier), seed=args.seed,
+                        avoid=['river'])
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scenario.npz')
+        scenario.save(path)
+        config = config.with_overrides({'scenario_file': path})
+        runs = {enabled: run(config, enabled, args.max_time, args.seed) for enabled in (False, True)}
+
+    for enabled, (summary, _, tick_ms, dormant) in runs.items():
+        print(f"activity {'on ' if enabled else 'off'}: {tick_ms:7.2f} ms/tick, dormant {dormant:5.1%}  {summary}")
+    print(f"{len(scenario)} units, speedup {runs[False][2] / runs[True][2]:.2f}x, "
+          f"identical results: {runs[False][:2] == runs[True][:2]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""단계 실행 환경(model/env.py) 처리량 측정
+
+VectorEnv로 --num-envs개 전투를 decision_interval마다 함께 진행하여 에피소드가 --episodes번 끝날 때까지
+초당 환경 step 수와 초당 모의 틱 수를 출력한다 (VectorEnv는 환경을 차례로 진행하므로 환경 하나의 처리량과 같음).
+에피소드마다 시뮬레이션을 새로 만드는 것과
+스냅샷을 복원하는 reset()의 비용도 비교한다.
+
+실행:
+    python -m benchmarks.env_benchmark --num-envs 4 --episodes 8
+"""
+import argparse
+import random
+import time
+
+from model.config import Config
+from model.env import VectorEnv
+from simulation import Simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stepping environment benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--num-envs', type=int, default=4, help='Battles stepped in lockstep')
+    parser.add_argument('--episodes', type=int, default=8, help='Finished episodes to measure')
+    parser.add_argument('--decision-interval', type=float, default=None, help='Override env.decision_interval')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    if args.decision_interval is not None:
+        config = config.with_overrides({'env.decision_interval': args.decision_interval})
+
+    start = time.perf_counter()
+    for _ in range(10):
+        random.seed(args.seed)
+        Simulation(config, headless=True, verbose=False)
+    construct_ms = (time.perf_counter() - start) * 100
+
+    envs = VectorEnv(config, num_envs=args.num_envs, seed=args.seed)
+    start = time.perf_counter()
+    for _ in range(10):
+        envs.envs[0].reset()
+    reset_ms = (time.perf_counter() - start) * 100
+
+    envs.reset(args.seed)
+    steps = episodes = ticks = 0
+    start = time.perf_counter()
+    while episodes < args.episodes:
+        times = [env.simulation.current_time for env in envs.envs]
+        _, _, terminated, truncated, infos = envs.step()
+        steps += args.num_envs
+        episodes += int(terminated.sum() + truncated.sum())
+        for before, info in zip(times, infos):
+            ticks += round((info['time'] - before) / envs.envs[0].simulation.sim_speed)
+    elapsed = time.perf_counter() - start
+    envs.close()
+
+    print(f"new Simulation {construct_ms:.1f} ms, reset() {reset_ms:.1f} ms")
+    print(f"{args.num_envs} envs, {episodes} episodes: {steps / elapsed:.1f} env steps/s "
+          f"({steps / elapsed * 3600:,.0f}/h), {ticks / elapsed:,.0f} ticks/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""FEL 구현별 처리 성능 비교
+
+유닛마다 1초 간격 MOVE 이벤트와 불규칙한 간격의 FIRE 이벤트를 발생시키는
+부하를 기존 방식(Event 객체를 직접 넣는 heapq), EventQueue(heap), CalendarEventQueue로
+각각 처리하여 소요 시간을 비교한다.
+세 방식이 같은 이벤트를 처리하도록 난수는 유닛마다 따로 두고(같은 시간 이벤트의 처리 순서와 무관),
+기존 방식에도 FEL과 같은 중복 제거(대기 중인 FIRE가 있는 유닛의 새 FIRE는 버림)를 적용한다.
+
+실행:
+    python -m benchmarks.event_queue_benchmark --units 5000 --ticks 100
+"""
+import argparse
+import heapq
+import random
+import time
+
+from model.event import Event, EventType, create_event_queue
+
+
+def _next_events(source_id: int, current_time: float, rng: random.Random, fire_ratio: float):
+    """유닛 하나가 다음 틱에 예약하는 이벤트들"""
+    events = [Event(time=current_time + 1.0, event_type=EventType.MOVE, source_id=source_id)]
+    if rng.random() < fire_ratio:
+        events.append(Event(time=current_time + rng.triangular(2.0, 20.0, 6.0),
+                            event_type=EventType.FIRE, source_id=source_id, target_id=0))
+    return events
+
+
+def _unit_rngs(num_units: int, seed: int):
+    """유닛별 난수 생성기 (같은 시간 이벤트의 처리 순서가 달라도 유닛마다 같은 난수열)"""
+    return [random.Random(seed * num_units + unit_id) for unit_id in range(num_units)]
+
+
+def run_legacy_heapq(num_units: int, num_ticks: int, fire_ratio: float, seed: int) -> int:
+    """Event.__lt__ 비교를 사용하는 기존 heapq 방식 (FEL과 같은 FIRE 중복 제거)"""
+    rngs = _unit_rngs(num_units, seed)
+    events = []
+    fire_pending = set()  # 대기 중인 FIRE 이벤트가 있는 유닛
+
+    def push(event):
+        if event.event_type == EventType.FIRE:
+            if event.source_id in fire_pending:
+                return
+            fire_pending.add(event.source_id)
+        heapq.heappush(events, event)
+
+    for unit_id in range(num_units):
+        for event in _next_events(unit_id, 0.0, rngs[unit_id], fire_ratio):
+            push(event)
+    processed = 0
+    for tick in range(1, num_ticks + 1):
+        current = []
+        while events and events[0].time <= tick:
+            current.append(heapq.heappop(events))
+        for event in current:
+            processed += 1
+            if event.event_type == EventType.MOVE:
+                for new_event in _next_events(event.source_id, tick, rngs[event.source_id], fire_ratio):
+                    push(new_event)
+            else:
+                fire_pending.discard(event.source_id)
+    return processed
+
+
+def run_event_queue(kind: str, num_units: int, num_ticks: int, fire_ratio: float, seed: int) -> int:
+    """create_event_queue로 생성한 FEL"""
+    rngs = _unit_rngs(num_units, seed)
+    queue = create_event_queue(kind)
+    for unit_id in range(num_units):
+        for event in _next_events(unit_id, 0.0, rngs[unit_id], fire_ratio):
+            queue.schedule(event, replace=event.event_type == EventType.MOVE)
+    processed = 0
+    for tick in range(1, num_ticks + 1):
+        for event in queue.pop_until(tick):
+            processed += 1
+            if event.event_type == EventType.MOVE:
+                for new_event in _next_events(event.source_id, tick, rngs[event.source_id], fire_ratio):
+                    queue.schedule(new_event, replace=new_event.event_type == EventType.MOVE)
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Future event list benchmark')
+    parser.add_argument('--units', type=int, default=5000, help='Number of units')
+    parser.add_argument('--ticks', type=int, default=100, help='Number of 1 s ticks')
+    parser.add_argument('--fire-ratio', type=float, default=0.1, help='Chance a unit schedules a FIRE event per tick')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per queue (best time is reported)')
+    args = parser.parse_args()
+
+    runs = [
+        ('legacy heapq', lambda: run_legacy_heapq(args.units, args.ticks, args.fire_ratio, args.seed)),
+        ('heap', lambda: run_event_queue('heap', args.units, args.ticks, args.fire_ratio, args.seed)),
+        ('calendar', lambda: run_event_queue('calendar', args.units, args.ticks, args.fire_ratio, args.seed)),
+    ]
+    print(f"{args.units} units x {args.ticks} ticks")
+    counts = set()
+    baseline = None
+    for name, run in runs:
+        elapsed = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            processed = run()
+            elapsed = min(elapsed, time.perf_counter() - start)
+        counts.add(processed)
+        baseline = baseline or elapsed
+        print(f"{name:>14}: {elapsed:7.3f} s  {processed / elapsed:12.0f} events/s  ({processed} events, "
+              f"{baseline / elapsed:.2f}x legacy)")
+    if len(counts) != 1:
+        print("Event counts differ between queues")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""직사화기 사격 묶음 처리 성능 비교 (Fire.fire 차례 호출 vs Fire.resolve_direct_fire)
+
+근접전투처럼 한 틱에 사격이 수백 발 몰리는 상황을 만들기 위해 임의의 직사화기 공격자/표적 쌍을 만들고,
+같은 시드에서 두 방식의 결과(표적 상태, 공격자 행동, 난수 상태)가 같은지 확인한 뒤 소요 시간을 비교한다.
+
+실행:
+    python -m benchmarks.fire_benchmark --shots 500
+"""
+import argparse
+import copy
+import random
+import time
+
+from model.config import Config
+from model.fire import Fire
+from model.probabilities import ProbabilitySystem
+from model.unit import Unit, Team, UnitType, Action, Status
+
+DIRECT_FIRE_TYPES = [UnitType.RIFLE, UnitType.RIFLE, UnitType.RIFLE, UnitType.ANTI_TANK, UnitType.TANK]
+TARGET_TYPES = [UnitType.RIFLE, UnitType.RIFLE, UnitType.ANTI_TANK, UnitType.TANK, UnitType.COMMAND_POST]
+
+
+def make_shots(config: Config, count: int, rng: random.Random):
+    """공격자/표적 쌍 (표적 수를 사격 수의 절반으로 두어 같은 표적에 대한 연속 사격도 포함)"""
+    scale = config.pixel_to_meter_scale
+    targets = []
+    for index in range(max(count // 2, 1)):
+        target = Unit(index, Team.BLUE, rng.choice(TARGET_TYPES), (rng.randrange(300, 500), rng.randrange(150, 300)),
+                      pixel_to_meter_scale=scale)
+        target.action = rng.choice([Action.STOP, Action.MOVE])
+        targets.append(target)
+    shots = []
+    for index in range(count):
+        attacker = Unit(len(targets) + index, Team.RED, rng.choice(DIRECT_FIRE_TYPES),
+                        (rng.randrange(300, 500), rng.randrange(150, 300)), pixel_to_meter_scale=scale)
+        attacker.action = Action.FIRE
+        shots.append((attacker, rng.choice(targets)))
+    return shots
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batched direct-fire resolution benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--shots', type=int, default=500, help='Shots resolved in one tick')
+    parser.add_argument('--repeat', type=int, default=20, help='Repetitions')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    fire = Fire(config)
+    fire.BATCH_MIN_SHOTS = 0  # 묶음 크기와 관계없이 NumPy 경로 측정
+    ProbabilitySystem.preload()
+    batches = [make_shots(config, args.shots, random.Random(args.seed + index)) for index in range(args.repeat)]
+    sequential_batches, batched_batches = copy.deepcopy(batches), copy.deepcopy(batches)
+
+    random.seed(args.seed)
+    start = time.perf_counter()
+    for shots in sequential_batches:
+        for attacker, target in shots:
+            fire.fire(attacker, target, [], None, 0.0)
+    sequential_time = time.perf_counter() - start
+    sequential_state = random.getstate()
+
+    random.seed(args.seed)
+    start = time.perf_counter()
+    for shots in batched_batches:
+        fire.resolve_direct_fire(shots)
+    batched_time = time.perf_counter() - start
+
+    outcome = lambda batch_list: [(attacker.action, target.status) for shots in batch_list for attacker, target in shots]
+    disabled = sum(target.status not in [Status.ALIVE, Status.M_KILL, Status.MINOR]
+                   for shots in batched_batches for _, target in shots)
+    print(f"{args.repeat} ticks x {args.shots} shots, {disabled} shots ended on a disabled target")
+    print(f"  sequential fire(): {sequential_time * 1000 / args.repeat:8.2f} ms/tick")
+    print(f"  resolve_direct_fire: {batched_time * 1000 / args.repeat:6.2f} ms/tick  ({sequential_time / batched_time:.2f}x)")
+    if outcome(sequential_batches) != outcome(batched_batches) or random.getstate() != sequential_state:
+        print("Mismatch between batched and sequential resolution")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
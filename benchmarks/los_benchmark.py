@@ -0,0 +1,136 @@
+"""LOS 판정 성능 비교 (전체 표본 확인 vs 지형 피라미드 vs 같은 좌표 유닛의 결과 공유)
+
+임의의 관측자/목표 쌍에 대해 모든 표본 지점을 확인하는 기존 방식과
+Detect.check_los(최대/최소 고도 피라미드)의 판정 결과가 같은지 확인하고 소요 시간을 비교한다.
+또 관측자마다 --cluster개 유닛이 같은 좌표에 모여 있을 때 LOS 캐시(detection.los_cache_size)로
+결과를 공유하는 경우와 유닛마다 계산하는 경우를 비교한다.
+--upscale로 DEM을 확대하면 큰 DEM에서의 긴 시야선 비용을 측정할 수 있다.
+마지막으로 config.yaml 시나리오(이동 중인 유닛)를 --max-time초 진행하며 정확한 좌표로 묶는 캐시와
+격자 칸(detection.los_cluster_cell)으로 묶는 캐시의 적중률, LOS 계산 수, 소요 시간, 결과를 비교한다.
+
+실행:
+    python -m benchmarks.los_benchmark --pairs 20000 --upscale 4 --max-time 120 --cluster-cells 1 4
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from model.config import Config
+from model.detect import Detect
+from model.terrain import Terrain, load_dem, _dem_cache
+from model.unit import Unit, Team, UnitType
+
+
+def check_los_full(detect: Detect, observer: Unit, target: Unit) -> bool:
+    """모든 표본 지점을 차례로 확인하는 기존 LOS 판정"""
+    x1, y1 = observer.position
+    x2, y2 = target.position
+    if observer.unit_type == UnitType.DRONE:
+        observer_elevation = detect.drone_elevation
+    else:
+        observer_elevation = detect.terrain.get_elevation((int(x1), int(y1)))
+    target_elevation = detect.terrain.get_elevation((int(x2), int(y2)))
+    distance = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+    num_checks = int(distance / detect.LOS_CHECK_INTERVAL)
+    for i in range(1, num_checks):
+        x = x1 + (x2 - x1) * (i / num_checks)
+        y = y1 + (y2 - y1) * (i / num_checks)
+        current_elevation = detect.terrain.get_elevation((int(x), int(y)))
+        if current_elevation > observer_elevation and current_elevation > target_elevation:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Line-of-sight benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--pairs', type=int, default=20000, help='Number of observer/target pairs')
+    parser.add_argument('--upscale', type=int, default=1, help='Repeat each DEM cell this many times per axis')
+    parser.add_argument('--cluster', type=int, default=4, help='Co-located units per observer position')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--max-time', type=float, default=120.0,
+                        help='Simulated seconds of the moving-unit scenario comparison (0 skips it)')
+    parser.add_argument('--cluster-cells', type=int, nargs='+', default=[1, 4],
+                        help='detection.los_cluster_cell values compared with exact-coordinate caching')
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    dem_file = "database/xyz_coordinates.csv"
+    if args.upscale > 1:
+        upscaled = np.kron(load_dem(dem_file), np.ones((args.upscale, args.upscale)))
+        upscaled.setflags(write=False)
+        dem_file = f"{dem_file}@x{args.upscale}"
+        _dem_cache[dem_file] = upscaled
+    terrain = Terrain(dem_file, config)
+    detect = Detect(config.with_overrides({'detection.los_cache_size': 0}), terrain)
+    height, width = detect.terrain.dem_data.shape
+    detect.terrain.pyramid  # 피라미드 생성 시간은 측정에서 제외
+
+    rng = random.Random(args.seed)
+    pairs = []
+    for _ in range(args.pairs):
+        observer = Unit(0, Team.RED, rng.choice([UnitType.TANK, UnitType.DRONE]), (0, 0),
+                        pixel_to_meter_scale=config.pixel_to_meter_scale)
+        target = Unit(1, Team.BLUE, UnitType.TANK, (0, 0), pixel_to_meter_scale=config.pixel_to_meter_scale)
+        observer.position = (rng.uniform(0, width), rng.uniform(0, height))
+        target.position = (rng.uniform(0, width), rng.uniform(0, height))
+        pairs.append((observer, target))
+
+    start = time.perf_counter()
+    expected = [check_los_full(detect, observer, target) for observer, target in pairs]
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = [detect.check_los(observer, target) for observer, target in pairs]
+    pyramid_time = time.perf_counter() - start
+
+    print(f"DEM {width}x{height}, {args.pairs} pairs, {sum(expected) / args.pairs:.1%} visible")
+    print(f"   full samples: {full_time:7.3f} s")
+    print(f"        pyramid: {pyramid_time:7.3f} s  ({full_time / pyramid_time:.2f}x)")
+    if actual != expected:
+        print("Mismatch between pyramid and full-sample LOS")
+        raise SystemExit(1)
+
+    # 같은 좌표의 유닛 cluster개가 같은 표적을 차례로 확인
+    cached = Detect(config, terrain)
+    clustered = [(observer, target) for observer, target in pairs[:args.pairs // args.cluster]
+                 for _ in range(args.cluster)]
+    start = time.perf_counter()
+    uncached_result = [detect.check_los(observer, target) for observer, target in clustered]
+    uncached_time = time.perf_counter() - start
+    start = time.perf_counter()
+    cached_result = [cached.check_los(observer, target) for observer, target in clustered]
+    cached_time = time.perf_counter() - start
+    print(f"   cluster of {args.cluster}: {uncached_time:7.3f} s per unit, {cached_time:7.3f} s shared "
+          f"({uncached_time / cached_time:.2f}x, {cached.los_cache_hits} cache hits)")
+    if cached_result != uncached_result:
+        print("Mismatch between shared and per-unit LOS")
+        raise SystemExit(1)
+
+    if args.max_time > 0:
+        compare_scenario(config, args.max_time, args.cluster_cells, args.seed)
+
+
+def compare_scenario(config: Config, max_time: float, cluster_cells: list, seed: int) -> None:
+    """config.yaml 시나리오에서 LOS 캐시 키(정확한 좌표 / 격자 칸)별 적중률과 결과 비교"""
+    from simulation import Simulation  # 최상위 모듈이므로 실행 시점에 불러옴
+
+    config = config.with_overrides({'recorder.enabled': False})
+    print(f"scenario, {max_time:.0f} s (moving units):")
+    for cell in [0] + list(cluster_cells):
+        random.seed(seed)
+        simulation = Simulation(config.with_overrides({'detection.los_cluster_cell': cell}),
+                                headless=True, verbose=False)
+        start = time.perf_counter()
+        result = simulation.run_simulation(max_time)
+        elapsed = time.perf_counter() - start
+        detect = simulation.detect
+        checks = detect.los_cache_hits + detect.los_cache_misses
+        label = 'exact coordinates' if cell == 0 else f'cell {cell} px'
+        print(f"  {label:>17}: {detect.los_cache_hits / max(checks, 1):6.1%} hit rate, "
+              f"{detect.los_cache_misses} LOS computed of {checks}, {elapsed:6.2f} s, {result.summary()}")
+
+
+if __name__ == "__main__":
+    main()
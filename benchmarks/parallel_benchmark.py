@@ -0,0 +1,69 @@
+"""탐색/사격 가능 타겟 병렬 처리(parallel.workers)별 실행 시간 비교
+
+config.yaml의 배치를 --multiplier배로 늘린 시나리오(model/scenario.py)를 만들어 --workers의 값마다
+같은 시드로 --max-time까지 실행하고 틱당 처리 시간을 출력한다 (0은 유닛별 Python 처리).
+묶음 계산은 결정적으로 합치므로 모든 실행의 최종 유닛 상태와 결과가 같은지도 확인한다.
+
+실행:
+    python -m benchmarks.parallel_benchmark --multiplier 12 --max-time 20 --workers 0 1 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from model.config import Config
+from model.scenario import generate, scaled_formations
+from model.terrain import Terrain
+from simulation import Simulation
+
+
+def run(config: Config, workers: int, max_time: float, seed: int):
+    """(결과 요약, 최종 유닛 상태, 틱당 ms)"""
+    random.seed(seed)
+    simulation = Simulation(config.with_overrides({'parallel.workers': workers}), headless=True, verbose=False)
+    ticks = 0
+    start = time.perf_counter()
+    while simulation.current_time < max_time:
+        simulation.step()
+        ticks += 1
+        if simulation.check_termination():
+            break
+        simulation.current_time += simulation.sim_speed
+    elapsed = time.perf_counter() - start
+    simulation.sensing.close()
+    result = simulation.get_result('max_time')
+    units = [(unit.id, unit.position, unit.status, unit.action, frozenset(unit.eligible_target_list))
+             for unit in simulation.units]
+    return result.summary(), units, elapsed * 1000 / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel sensing benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--multiplier', type=float, default=12.0, help='Scale the config.yaml placement')
+    parser.add_argument('--max-time', type=float, default=20.0, help='Simulated seconds per run')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, os.cpu_count() or 1],
+                        help='Worker counts to compare (0: per-unit Python path)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (scenario and simulation)')
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    scenario = generate(Terrain(config=config), scaled_formations(config, args.multiplier), seed=args.seed,
+                        avoid=['river'])
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scenario.npz')
+        scenario.save(path)
+        config = config.with_overrides({'scenario_file': path, 'parallel.min_units': 0})
+        runs = {workers: run(config, workers, args.max_time, args.seed) for workers in args.workers}
+
+    baseline = runs[args.workers[0]]
+    for workers, (summary, units, tick_ms) in runs.items():
+        print(f"workers {workers:2d}: {tick_ms:8.2f} ms/tick ({baseline[2] / tick_ms:.2f}x)  "
+              f"identical: {(summary, units) == baseline[:2]}")
+    print(f"{len(scenario)} units, {os.cpu_count()} CPUs, {baseline[0]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""지형 경로 계획 비용장 계산/조회 시간 및 도착 시간 비교
+
+목표 지점 하나의 비용장(CostField)을 격자 크기별로 계산하는 시간과, --units개 유닛이
+같은 비용장에서 경유점을 조회하는 시간을 잰다. 또 config.yaml의 지상 유닛 초기 위치에서
+목표까지 1초 단위로 이동시켜(Movement와 같은 지형 감소율 적용) 직진과 경로 계획의 평균 도착 시간을 비교한다.
+
+실행:
+    python -m benchmarks.path_benchmark --objective 350 300
+"""
+import argparse
+import math
+import time
+
+from model.config import Config
+from model.pathfinding import CostField, PathPlanningSettings
+from model.scenario import Scenario, UNIT_TYPES
+from model.terrain import Terrain
+from model.unit import UnitType
+
+GROUND_TYPES = [UnitType.RIFLE, UnitType.ANTI_TANK, UnitType.TANK, UnitType.COMMAND_POST]
+
+
+def travel_time(decay, field, start, goal, arrive: float, final_approach: float, limit: int = 10000) -> int:
+    """감소율 1.0 기준 1픽셀/초로 goal까지 arrive 픽셀 이내에 들어오는 데 걸린 초 (field가 None이면 직진)"""
+    x, y = start
+    height, width = decay.shape
+    for second in range(limit):
+        if math.hypot(goal[0] - x, goal[1] - y) < arrive:
+            return second
+        aim = goal
+        if field is not None and field.cost_to_go((x, y)) > final_approach:
+            aim = field.waypoint((x, y))
+        dx, dy = aim[0] - x, aim[1] - y
+        distance = math.hypot(dx, dy) or 1.0
+        speed = decay[int(y), int(x)] if 0 <= int(x) < width and 0 <= int(y) < height else 1.0
+        x, y = x + dx / distance * speed, y + dy / distance * speed
+    return limit
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Terrain cost field path planning benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--objective', type=float, nargs=2, default=[350.0, 300.0], help='Maneuver objective (pixels)')
+    parser.add_argument('--cell-sizes', type=int, nargs='+', default=[2, 4, 8], help='Cost field cell sizes')
+    parser.add_argument('--units', type=int, default=10000, help='Units querying the shared field')
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    terrain = Terrain(config=config)
+    decay = terrain.decay_rate_grid()
+    goal = tuple(args.objective)
+    settings = PathPlanningSettings.from_config(config.get('path_planning'))
+
+    for cell_size in args.cell_sizes:
+        start = time.perf_counter()
+        field = CostField(decay, goal, cell_size, settings.lookahead)
+        build_ms = (time.perf_counter() - start) * 1000
+        positions = [((i * 7.3) % decay.shape[1], (i * 3.1) % decay.shape[0]) for i in range(args.units)]
+        start = time.perf_counter()
+        for position in positions:
+            field.waypoint(position)
+        query_us = (time.perf_counter() - start) * 1e6 / args.units
+        print(f"cell {cell_size:2d} ({field.rows}x{field.cols}): build {build_ms:8.1f} ms, "
+              f"waypoint {query_us:.2f} us/unit")
+
+    field = CostField(decay, goal, settings.cell_size, settings.lookahead)
+    scenario = Scenario.from_config(config)
+    starts = [(x, y) for code, x, y in zip(scenario.unit_type.tolist(), scenario.x.tolist(), scenario.y.tolist())
+              if UNIT_TYPES[code] in GROUND_TYPES]
+    straight = [travel_time(decay, None, start, goal, 10.0, settings.final_approach) for start in starts]
+    planned = [travel_time(decay, field, start, goal, 10.0, settings.final_approach) for start in starts]
+    print(f"{len(starts)} ground units to {goal}: mean arrival straight {sum(straight) / len(starts):.1f} s, "
+          f"planned {sum(planned) / len(starts):.1f} s (speed 1 px/s at decay 1.0)")
+
+
+if __name__ == '__main__':
+    main()
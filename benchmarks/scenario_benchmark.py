@@ -0,0 +1,66 @@
+"""대규모 시나리오 생성/저장/불러오기/유닛 생성 시간 측정
+
+config.yaml의 초기 배치를 --units개 규모로 키운 시나리오를 만들어 .npz와 .csv로 저장한 뒤,
+파일에서 불러와 유닛 목록을 만드는 시간을 기존 방식(유닛마다 Unit() 생성)과 비교한다.
+
+실행:
+    python -m benchmarks.scenario_benchmark --units 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from model.config import Config
+from model.scenario import Scenario, TEAMS, UNIT_TYPES, generate, scaled_formations
+from model.terrain import Terrain
+from model.unit import Unit, UnitList
+
+
+def timed(function, repeat: int):
+    """repeat회 실행 중 가장 짧은 시간(ms)과 마지막 결과"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scenario generation and bulk loading benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--units', type=int, default=10000, help='Approximate number of units')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions (best time is reported)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    config = Config.load(args.config)
+    scale = config.pixel_to_meter_scale
+    terrain = Terrain(config=config)
+    formations = scaled_formations(config, args.units / len(Scenario.from_config(config)))
+    generate_ms, scenario = timed(lambda: generate(terrain, formations, seed=args.seed), args.repeat)
+    print(f"{len(scenario)} units in {len(formations)} formations")
+    print(f"        generate: {generate_ms:8.2f} ms")
+
+    def build_one_by_one():
+        units = UnitList()
+        for unit_id, (team, unit_type, x, y) in enumerate(zip(scenario.team.tolist(), scenario.unit_type.tolist(),
+                                                               scenario.x.tolist(), scenario.y.tolist())):
+            units.append(Unit(id=unit_id, team=TEAMS[team], position=(x, y), unit_type=UNIT_TYPES[unit_type],
+                              pixel_to_meter_scale=scale))
+        return units
+
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ['npz', 'csv']:
+            path = os.path.join(directory, f'scenario.{extension}')
+            save_ms, _ = timed(lambda: scenario.save(path), args.repeat)
+            load_ms, loaded = timed(lambda: Scenario.load(path), args.repeat)
+            print(f"   save/load {extension}: {save_ms:8.2f} / {load_ms:.2f} ms ({os.path.getsize(path) / 1024:.0f} KiB)")
+    bulk_ms, _ = timed(lambda: scenario.build_units(scale), args.repeat)
+    single_ms, _ = timed(build_one_by_one, args.repeat)
+    print(f"     build units: {bulk_ms:8.2f} ms (one by one: {single_ms:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
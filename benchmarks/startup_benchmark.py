@@ -0,0 +1,50 @@
+"""헤드리스 시뮬레이션 시작 비용 측정
+
+새 파이썬 프로세스에서 simulation 모듈 import 시간과 첫 Simulation 생성 시간을 측정하여
+예산(--budget-ms)을 넘으면 종료 코드 1을 반환한다. 프로세스 풀 작업자가 매번 지불하는 비용이다.
+
+실행:
+    python -m benchmarks.startup_benchmark --budget-ms 500
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+MEASURE = """
+import json, time
+start = time.perf_counter()
+from simulation import Simulation
+imported = time.perf_counter()
+Simulation({config!r}, headless=True, verbose=False)
+constructed = time.perf_counter()
+print(json.dumps({{'import_ms': (imported - start) * 1000, 'construct_ms': (constructed - imported) * 1000}}))
+"""
+
+
+def measure(config_file: str) -> dict:
+    """새 프로세스에서 import/생성 시간(ms) 측정"""
+    output = subprocess.run([sys.executable, '-c', MEASURE.format(config=config_file)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless startup time benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of fresh processes (median is reported)')
+    parser.add_argument('--budget-ms', type=float, default=500.0, help='Startup budget (import + construction) in ms')
+    args = parser.parse_args()
+
+    samples = [measure(args.config) for _ in range(args.repeat)]
+    median = lambda key: sorted(sample[key] for sample in samples)[len(samples) // 2]
+    import_ms, construct_ms = median('import_ms'), median('construct_ms')
+    total_ms = import_ms + construct_ms
+    print(f"import {import_ms:.1f} ms, construct {construct_ms:.1f} ms, total {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms:
+        print("Startup budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""두 설정 비교의 차이 추정 표준오차: 독립 난수 vs 공통 난수(CRN) vs 대조 변량(antithetic)
+
+--param의 두 값(기본: simulation.lethal_radius 30 vs 40)으로 설정마다 --runs번 실행하여
+BLUE 전투력 비율 - RED 전투력 비율의 설정 간 차이와 그 표준오차를 네 가지 방식으로 비교한다.
+- independent: 두 설정이 서로 다른 시드 사용
+- common seeds: 같은 시드, 전역 random 하나 (용도가 다른 난수가 설정에 따라 어긋남)
+- streams: 같은 시드, (용도, 유닛)별 난수 흐름 (rng.streams)
+- antithetic: streams에 더해 같은 시드의 일반/대조 실행 쌍의 평균 사용 (시드 수는 절반)
+모든 방식의 설정별 실행 횟수는 같다.
+
+실행:
+    python -m benchmarks.variance_benchmark --param simulation.lethal_radius=30,40 --runs 16 --max-time 200
+"""
+import argparse
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from model.config import Config
+from model.runner import run_replication
+from model.unit import Team
+from sweep import parse_param
+
+
+def advantage(task) -> float:
+    config_data, seed, max_time = task
+    result = run_replication(config_data, seed, max_time)
+    return result.strength[Team.BLUE] - result.strength[Team.RED]
+
+
+def mean_std(values):
+    mean = sum(values) / len(values)
+    return mean, math.sqrt(sum((value - mean) ** 2 for value in values) / (len(values) - 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Variance reduction benchmark')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--param', type=parse_param, default=('simulation.lethal_radius', [30, 40]),
+                        help='Config path and the two values to compare')
+    parser.add_argument('--runs', type=int, default=16, help='Runs per setting (even)')
+    parser.add_argument('--max-time', type=float, default=200.0, help='Simulated seconds per run')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    args = parser.parse_args()
+
+    path, values = args.param
+    if len(values) != 2 or args.runs < 4 or args.runs % 2:
+        parser.error('--param needs exactly two values and --runs an even number >= 4')
+    base = Config.load(args.config)
+
+    def configs(overrides):
+        return [base.with_overrides({path: value, **overrides}).to_dict() for value in values]
+
+    plain, streams = configs({}), configs({'rng.streams': True})
+    anti = configs({'rng.streams': True, 'rng.antithetic': True})
+    half = args.runs // 2
+    tasks = {
+        'independent': [[(plain[variant], variant * 100000 + seed, args.max_time) for seed in range(args.runs)]
+                        for variant in (0, 1)],
+        'common seeds': [[(plain[variant], seed, args.max_time) for seed in range(args.runs)] for variant in (0, 1)],
+        'streams': [[(streams[variant], seed, args.max_time) for seed in range(args.runs)] for variant in (0, 1)],
+        'antithetic': [[(streams[variant], seed, args.max_time) for seed in range(half)] +
+                       [(anti[variant], seed, args.max_time) for seed in range(half)] for variant in (0, 1)],
+    }
+    flat = [task for mode in tasks.values() for variant in mode for task in variant]
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        outcomes = iter(executor.map(advantage, flat))
+        results = {mode: [[next(outcomes) for _ in variant] for variant in variants] for mode, variants in tasks.items()}
+
+    print(f"{path} {values[0]} vs {values[1]}, {args.runs} runs per setting, BLUE - RED strength difference:")
+    baseline = None
+    for mode, (first, second) in results.items():
+        if mode == 'independent':
+            mean0, std0 = mean_std(first)
+            mean1, std1 = mean_std(second)
+            difference, error = mean1 - mean0, math.sqrt((std0 ** 2 + std1 ** 2) / args.runs)
+        else:
+            if mode == 'antithetic':  # 일반/대조 실행 쌍의 평균끼리 비교
+                first = [(first[index] + first[half + index]) / 2 for index in range(half)]
+                second = [(second[index] + second[half + index]) / 2 for index in range(half)]
+            difference, std = mean_std([b - a for a, b in zip(first, second)])
+            error = std / math.sqrt(len(first))
+        baseline = baseline or error
+        ratio = (baseline / error) ** 2 if error > 0 else math.inf
+        print(f"  {mode:12s}: {difference:+.4f} +/- {error:.4f} (runs for the same error vs independent: 1/{ratio:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import csv
+import os
+import yaml
+from model.config import Config
+from model.doe import DoeStudy, DoeSettings, METHODS
+
+
+def parse_range(text: str):
+    """'경로=최소:최대' 형식의 파라미터 범위를 (경로, [최소, 최대])로 변환 (값은 YAML로 해석, 둘 다 정수면 정수 파라미터)"""
+    path, _, bounds = text.partition('=')
+    low, _, high = bounds.partition(':')
+    if not path or not low or not high:
+        raise argparse.ArgumentTypeError(f"Parameter must look like path=low:high, got {text}")
+    return path, [yaml.safe_load(low), yaml.safe_load(high)]
+
+
+def write_csv(path: str, rows: list) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='War Game design of experiments and Sobol sensitivity analysis')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Base config file')
+    parser.add_argument('--param', type=parse_range, action='append', default=[],
+                        help='Config path and range, e.g. simulation.lethal_radius=20.0:50.0 or num_tank_red=2:4 '
+                             '(repeatable, replaces doe.parameters of the config)')
+    parser.add_argument('--method', type=str, choices=METHODS, default=None, help='Sampling method')
+    parser.add_argument('--samples', type=int, default=None, help='Base samples N (a power of two suits sobol)')
+    parser.add_argument('--design-only', action='store_true',
+                        help='Run the N sampled points only (no Saltelli design or sensitivity indices)')
+    parser.add_argument('--replications', type=int, default=None, help='Replications per design point (shared seeds)')
+    parser.add_argument('--metrics', type=str, default=None, help='Comma-separated output metrics')
+    parser.add_argument('--cache', type=str, default=None, help='Run cache file (rerun the same command to resume)')
+    parser.add_argument('--streams', action='store_true',
+                        help='Common random numbers: separate RNG streams per purpose and unit (rng.streams)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='Base random seed for replications and sampling')
+    parser.add_argument('--max-time', type=float, default=None, help='Override max_time')
+    parser.add_argument('--output', type=str, default='results/doe.csv', help='Output CSV with design points')
+    parser.add_argument('--indices-output', type=str, default='results/doe_indices.csv',
+                        help='Output CSV with Sobol indices')
+
+    args = parser.parse_args()
+    config = Config.load(args.config)
+    if args.streams:
+        config = config.with_overrides({'rng.streams': True})
+    section = dict(config.get('doe') or {})
+    if args.param:
+        section['parameters'] = dict(args.param)
+    for key, value in [('method', args.method), ('samples', args.samples), ('replications', args.replications),
+                       ('cache_file', args.cache), ('metrics', args.metrics.split(',') if args.metrics else None),
+                       ('sensitivity', False if args.design_only else None)]:
+        if value is not None:
+            section[key] = value
+    settings = DoeSettings.from_config(section)
+
+    study = DoeStudy(config, settings, workers=args.workers, base_seed=args.seed, max_time=args.max_time)
+    dimensions = len(settings.parameters)
+    points = settings.samples * (dimensions + 2 if settings.sensitivity else 1)
+    print(f"{settings.method} design: {dimensions} parameters, {points} points x {settings.replications} replications")
+    step = max(1, points * settings.replications // 20)
+    result = study.run(
+        seed=args.seed,
+        progress=lambda completed, total: print(f"{completed}/{total} runs") if completed % step == 0 else None
+    )
+
+    write_csv(args.output, result.to_rows())
+    print(f"Saved {len(result.points)} design points to {args.output} "
+          f"({result.runs_executed} runs executed, {result.runs_cached} from cache)")
+    if result.indices:
+        write_csv(args.indices_output, result.index_rows())
+        width = max(len(path) for path in result.parameters)
+        for metric, by_parameter in result.indices.items():
+            print(f"{metric}:")
+            for path, index in by_parameter.items():
+                print(f"  {path:<{width}}  S1 {index.first:6.3f} ± {index.first_conf:.3f}  "
+                      f"ST {index.total:6.3f} ± {index.total_conf:.3f}")
+        print(f"Saved Sobol indices to {args.indices_output}")
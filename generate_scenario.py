@@ -0,0 +1,34 @@
+import argparse
+import time
+import yaml
+from model.config import Config
+from model.scenario import Formation, generate, scaled_formations
+from model.terrain import Terrain
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='War Game scenario generator')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file (terrain and base placement)')
+    parser.add_argument('--formations', type=str, default=None,
+                        help='YAML file with a "formations" list of {team, unit_type, count, center, size}')
+    parser.add_argument('--multiplier', type=float, default=None,
+                        help='Scale the config.yaml placement to this many times the units (ignored with --formations)')
+    parser.add_argument('--avoid', type=str, default='river', help='Comma-separated terrain types to avoid')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--output', type=str, default='results/scenario.npz', help='Output file (.npz or .csv)')
+
+    args = parser.parse_args()
+    config = Config.load(args.config)
+    if args.formations:
+        with open(args.formations, encoding='utf-8') as f:
+            formations = [Formation.from_dict(item) for item in yaml.safe_load(f)['formations']]
+    else:
+        formations = scaled_formations(config, args.multiplier if args.multiplier is not None else 1.0)
+
+    start = time.perf_counter()
+    scenario = generate(Terrain(config=config), formations, seed=args.seed,
+                        avoid=[name for name in args.avoid.split(',') if name])
+    scenario.save(args.output)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {len(scenario)} units in {len(formations)} formations ({elapsed * 1000:.1f} ms), saved to {args.output}")
+    print(f"Use it with `scenario_file: {args.output}` in the config file")
@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from model.config import Config
+from model.command import Command
+from model.detect import DETECTABLE_STATUSES
+from model.event import EventType
+from model.targeting import TargetIndex
+from model.unit import Unit, Team, UnitType, Action, UNIT_PROPERTIES
+
+# 표적의 최대 피탐지도 (탐지 범위 = 관측 유닛 detect_range x 표적 피탐지도)
+MAX_DETECTABILITY = max(detectability for _, detectability, _ in UNIT_PROPERTIES.values())
+
+
+@dataclass
+class ActivitySettings:
+    """활동 유닛 선별 설정 (config.yaml의 activity 항목)
+
+    - enabled: 접촉 범위 안에 적이 없는 유닛을 휴면시켜 틱별 탐지/사격 가능 타겟/예약 처리에서 제외
+      (기본 시나리오는 휴면 비율이 낮아 격자 재구성/휴면 판정 비용이 더 커서 기본값은 끔)
+    - check_interval: 휴면 판정 주기 (초)
+    - cell_size: 적 위치 공간 색인의 격자 크기 (픽셀)
+    """
+    enabled: bool = False
+    check_interval: float = 5.0
+    cell_size: float = 100.0
+
+    def __post_init__(self):
+        if self.check_interval <= 0 or self.cell_size <= 0:
+            raise ValueError("activity check_interval and cell_size must be positive")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'ActivitySettings':
+        """config.yaml의 activity 항목으로부터 생성"""
+        config = config or {}
+        return cls(
+            enabled=config.get('enabled', False),
+            check_interval=config.get('check_interval', 5.0),
+            cell_size=config.get('cell_size', 100.0)
+        )
+
+
+class SpatialGrid:
+    """팀별 유닛 위치의 균일 격자 색인"""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Team, Dict[Tuple[int, int], List[Tuple[float, float]]]] = {}
+        self.bounds: Dict[Team, List[int]] = {}  # 팀별 유닛이 있는 칸 범위 [최소 x, 최소 y, 최대 x, 최대 y]
+
+    def add(self, team: Team, position: Tuple[float, float]) -> None:
+        cell_x, cell_y = int(position[0] // self.cell_size), int(position[1] // self.cell_size)
+        self.cells.setdefault(team, {}).setdefault((cell_x, cell_y), []).append(position)
+        bounds = self.bounds.get(team)
+        if bounds is None:
+            self.bounds[team] = [cell_x, cell_y, cell_x, cell_y]
+        else:
+            bounds[:] = [min(bounds[0], cell_x), min(bounds[1], cell_y), max(bounds[2], cell_x), max(bounds[3], cell_y)]
+
+    def any_within(self, team: Team, position: Tuple[float, float], radius: float) -> bool:
+        """team 유닛 중 position에서 radius 이내에 있는 유닛이 있는지
+
+        position이 속한 칸에서 바깥쪽 고리 순서로 조회하므로 가까운 유닛이 있으면 바로 끝난다.
+        """
+        cells = self.cells.get(team)
+        if not cells:
+            return False
+        x, y = position
+        radius_squared = radius * radius
+        size = self.cell_size
+        center_x, center_y = int(x // size), int(y // size)
+        min_x, min_y, max_x, max_y = self.bounds[team]
+        # 유닛이 있는 칸 범위를 모두 덮거나 반경을 벗어나는 고리까지만 조회
+        last_ring = min(int(radius // size) + 1,
+                        max(center_x - min_x, max_x - center_x, center_y - min_y, max_y - center_y))
+        for ring in range(last_ring + 1):
+            for cell_x in range(max(center_x - ring, min_x), min(center_x + ring, max_x) + 1):
+                edge = cell_x in (center_x - ring, center_x + ring)
+                for cell_y in (range(max(center_y - ring, min_y), min(center_y + ring, max_y) + 1) if edge
+                               else (center_y - ring, center_y + ring)):
+                    for other_x, other_y in cells.get((cell_x, cell_y), ()):
+                        if (other_x - x) ** 2 + (other_y - y) ** 2 <= radius_squared:
+                            return True
+        return False
+
+
+class ActivityManager:
+    """접촉 범위 밖의 유닛을 휴면시키고 접근/명령 변경 시 깨우는 관리자
+
+    유닛의 접촉 범위는 max(detect_range x 최대 피탐지도, weapon_range)에 판정 주기 동안
+    양측이 좁힐 수 있는 거리를 더한 반경이다. 이 안에 탐지 가능한 적이 없고 사격/추적/멈춘 이동 구간이
+    없는 유닛만 휴면시키므로, 다음 판정까지 휴면 유닛은 탐지도 사격도 할 수 없어 탐색, 추적 갱신,
+    사격 가능 타겟 갱신, 사격/이동 예약을 건너뛰어도 결과가 같다 (이동 중인 구간은 계속 진행).
+    드론은 TAI 정찰 패턴이 시간에 따라 바뀌므로 휴면시키지 않는다.
+    """
+
+    def __init__(self, config: Config, movement, detect, fire, events, sim_speed: float = 1.0):
+        self.config = Config.from_any(config)
+        self.settings = ActivitySettings.from_config(self.config.get('activity'))
+        self.movement = movement
+        self.detect = detect
+        self.fire = fire
+        self.events = events
+        closing_speed = 2 * max(speed for unit_type, speed in movement.UNIT_SPEEDS.items()
+                                if unit_type != UnitType.DRONE)
+        # 판정은 틱 시작에만 하므로 판정 사이 간격은 최대 check_interval + 틱 크기
+        self.margin = (self.settings.check_interval + sim_speed) * closing_speed
+        self.dormant: Set[int] = set()
+        self.next_check = 0.0
+        self.commands: Dict[Team, tuple] = {}  # 팀별 마지막으로 본 명령 (작전단계, 기동 목표)
+        self._active: Optional[List[Unit]] = None
+
+    def is_dormant(self, unit_id: int) -> bool:
+        return unit_id in self.dormant
+
+    def active_units(self, units) -> List[Unit]:
+        """휴면이 아닌 유닛 목록 (units 순서 유지)"""
+        if not self.dormant:
+            return units
+        if self._active is None:
+            self._active = [unit for unit in units if unit.id not in self.dormant]
+        return self._active
+
+    def contact_radius(self, unit: Unit) -> float:
+        return max(unit.detect_range * MAX_DETECTABILITY, unit.weapon_range) + self.margin
+
+    def _can_sleep(self, unit: Unit) -> bool:
+        """사격/추적/이동 재개가 걸려 있지 않은 유닛인지"""
+        if unit.unit_type == UnitType.DRONE or unit.action == Action.FIRE:
+            return False
+        if self.events.has_pending(unit.id, EventType.FIRE) or self.detect.tracks.get(unit.id):
+            return False
+        trajectory = self.movement.trajectories.get(unit.id)
+        if trajectory is None:
+            return unit.objective is None
+        return trajectory.moving or trajectory.arrived
+
+    def update(self, units, current_time: float) -> None:
+        """판정 주기가 되었으면 적 위치 색인을 만들고 모든 유닛의 휴면 여부를 다시 판정"""
+        if not self.settings.enabled or current_time < self.next_check:
+            return
+        self.next_check = current_time + self.settings.check_interval
+        grid = SpatialGrid(self.settings.cell_size)
+        for unit in units:
+            if unit.unit_type != UnitType.DRONE and unit.status in DETECTABLE_STATUSES:
+                grid.add(unit.team, unit.position)
+        enemies = {Team.RED: Team.BLUE, Team.BLUE: Team.RED}
+        dormant = set()
+        for unit in units:
+            in_contact = grid.any_within(enemies[unit.team], unit.position, self.contact_radius(unit))
+            if in_contact:
+                continue
+            if unit.id in self.dormant or self._can_sleep(unit):
+                dormant.add(unit.id)
+        for unit_id in dormant - self.dormant:
+            self._sleep(units.find(unit_id))
+        self.dormant = dormant
+        self._active = None
+
+    def _sleep(self, unit: Unit) -> None:
+        """휴면 진입: 공유받은 탐지 목록과 사격 가능 타겟 비우기 (접촉 범위 밖이므로 사격할 표적 없음)"""
+        unit.clear_targets()
+        unit.clear_eligible_targets()
+        self.fire.target_indexes[unit.id] = TargetIndex()
+
+    def check_command(self, team: Team, command: Command, units) -> None:
+        """작전단계나 기동 목표가 바뀐 팀의 유닛을 모두 깨움 (새 기동 목표/사격 우선순위를 이번 틱에 반영)
+
+        기동 목표는 작전단계 변경 외에 Command.apply_overrides(model/env.py의 행동)로도 바뀐다.
+        """
+        key = (command.phase, tuple(command.maneuver_objective or ()))
+        if self.commands.get(team) == key:
+            return
+        self.commands[team] = key
+        woken = {unit.id for unit in units if unit.team == team} & self.dormant
+        if woken:
+            self.dormant -= woken
+            self._active = None
+
+    def get_state(self) -> tuple:
+        return frozenset(self.dormant), self.next_check, dict(self.commands)
+
+    def set_state(self, state: tuple) -> None:
+        dormant, self.next_check, commands = state
+        self.dormant = set(dormant)
+        self.commands = dict(commands)
+        self._active = None
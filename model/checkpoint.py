@@ -0,0 +1,120 @@
+import gzip
+import pickle
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from model.unit import Unit, Team
+from model.command import Command
+from model.movement import Trajectory
+
+CHECKPOINT_VERSION = 5
+
+# 체크포인트에 저장하는 유닛/명령 필드 (나머지 속성은 유닛 타입과 설정에서 다시 계산됨)
+UNIT_STATE_FIELDS = ('position', 'status', 'action', 'target_list', 'eligible_target_list', 'objective', 'target')
+COMMAND_STATE_FIELDS = ('phase', 'TAI', 'fire_priority', 'maneuver_objective', 'next_phase', 'plan')
+
+
+@dataclass
+class SimulationState:
+    """시뮬레이션 전체 상태 스냅샷
+
+    유닛 상태, FEL, 드론 탐지 패턴, 이동 구간, 탐지 추적, 휴면 유닛, 지휘 명령, 난수 상태(용도별 흐름 포함)를 기본 타입과 불변 객체로만 담는다.
+    지형/확률표 같은 정적 데이터는 포함하지 않으므로 같은 유닛 구성의 Simulation에 복원해야 한다.
+    """
+    current_time: float
+    units: List[Tuple[Any, ...]]  # (id, *UNIT_STATE_FIELDS)
+    events: dict  # FutureEventList.get_state()
+    drone_positions: Dict[int, int]
+    drone_last_objective_change: Dict[int, float]
+    commands: Dict[Team, Tuple[Any, ...]]  # COMMAND_STATE_FIELDS
+    rng_state: Any
+    config: Optional[dict] = None  # 체크포인트 파일에서 Simulation을 다시 만들 때 사용
+    trajectories: Dict[int, Trajectory] = field(default_factory=dict)  # 유닛 id -> 현재 이동 구간 (불변)
+    tracks: Dict[int, Dict[int, float]] = field(default_factory=dict)  # 관측 유닛 id -> {표적 id: 마지막 탐지 시간}
+    activity: Optional[tuple] = None  # ActivityManager.get_state() (휴면 유닛 id, 다음 판정 시간, 팀별 명령)
+    streams: Optional[dict] = None  # RandomStreams.get_state() (용도별 난수 흐름을 쓰지 않으면 None)
+    version: int = field(default=CHECKPOINT_VERSION)
+
+
+def capture_state(units: List[Unit], events, movement, detect, activity, commands: Dict[Team, Command], current_time: float,
+                  config: Optional[dict] = None, streams=None) -> SimulationState:
+    """현재 상태의 스냅샷 생성 (이후 시뮬레이션이 진행되어도 바뀌지 않도록 가변 값은 복사)"""
+    return SimulationState(
+        current_time=current_time,
+        units=[
+            (unit.id, unit.position, unit.status, unit.action, frozenset(unit.target_list),
+             frozenset(unit.eligible_target_list), unit.objective, unit.target)
+            for unit in units
+        ],
+        events=events.get_state(),
+        drone_positions=dict(movement.drone_positions),
+        drone_last_objective_change=dict(movement.drone_last_objective_change),
+        trajectories=dict(movement.trajectories),
+        tracks={observer_id: dict(tracks) for observer_id, tracks in detect.tracks.items()},
+        activity=activity.get_state(),
+        commands={
+            team: (command.phase, command.TAI, dict(command.fire_priority),
+                   list(command.maneuver_objective) if command.maneuver_objective is not None else None,
+                   command.next_phase, command.plan)
+            for team, command in commands.items()
+        },
+        rng_state=random.getstate(),
+        streams=streams.get_state() if streams else None,
+        config=config
+    )
+
+
+def restore_state(state: SimulationState, units: List[Unit], events, movement, detect, activity, commands: Dict[Team, Command],
+                  streams=None) -> None:
+    """스냅샷을 기존 유닛/FEL/이동/명령 객체에 복원 (객체를 새로 만들지 않으므로 참조가 유지됨)"""
+    if state.version != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.version} (expected {CHECKPOINT_VERSION})")
+    units_by_id = {unit.id: unit for unit in units}
+    if set(units_by_id) != {unit_state[0] for unit_state in state.units}:
+        raise ValueError("Checkpoint units do not match the simulation units")
+
+    for unit_id, position, status, action, target_list, eligible_target_list, objective, target in state.units:
+        unit = units_by_id[unit_id]
+        unit.position = position
+        unit.status = status
+        unit.action = action
+        unit.target_list = set(target_list)
+        unit.eligible_target_list = set(eligible_target_list)
+        unit.objective = objective
+        unit.target = target
+
+    events.set_state(state.events)
+    movement.drone_positions = dict(state.drone_positions)
+    movement.drone_last_objective_change = dict(state.drone_last_objective_change)
+    movement.trajectories = dict(state.trajectories)
+    detect.tracks = {observer_id: dict(tracks) for observer_id, tracks in state.tracks.items()}
+    activity.set_state(state.activity)
+
+    for team, command_state in state.commands.items():
+        command = commands[team]
+        for name, value in zip(COMMAND_STATE_FIELDS, command_state):
+            setattr(command, name, value)
+        command.fire_priority = dict(command.fire_priority)
+        if command.maneuver_objective is not None:
+            command.maneuver_objective = list(command.maneuver_objective)
+
+    random.setstate(state.rng_state)
+    if streams:
+        streams.set_state(state.streams)
+
+
+def save_checkpoint(state: SimulationState, path: str) -> None:
+    """스냅샷을 파일로 저장 (경로가 .gz로 끝나면 gzip 압축)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_checkpoint(path: str) -> SimulationState:
+    """save_checkpoint()로 저장한 스냅샷 로드"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        state = pickle.load(f)
+    if not isinstance(state, SimulationState):
+        raise ValueError(f"{path} is not a simulation checkpoint")
+    return state
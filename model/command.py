@@ -34,6 +34,7 @@ class Command:
     fire_priority: Dict[UnitType, int] = None  # 유닛 타입별 우선순위
     maneuver_objective: List[Tuple[float, float]] = None  # 목표 지점들
     next_phase: Phase = None  # 다음 작전단계
+    plan: Dict[Phase, dict] = None  # 작전단계별 명령 재정의 (parse_command_plan 참고)
 
     def __post_init__(self):
         if self.fire_priority is None:
@@ -46,6 +47,27 @@ class Command:
             }
         self.next_phase = self.phase  # 초기값은 현재 단계로 설정
 
+    def apply_plan(self, plan: Optional[Dict[Phase, dict]]) -> 'Command':
+        """작전단계별 명령 재정의를 설정하고 현재 단계에 적용"""
+        self.plan = plan
+        self._apply_phase_overrides()
+        return self
+
+    def _apply_phase_overrides(self) -> None:
+        """현재 작전단계의 재정의 값(TAI, fire_priority, maneuver_objective) 적용"""
+        overrides = (self.plan or {}).get(self.phase)
+        if overrides:
+            self.apply_overrides(overrides)
+
+    def apply_overrides(self, overrides: dict) -> None:
+        """parse_command_overrides로 변환한 재정의 값을 현재 명령에 적용 (작전단계가 바뀌면 그 단계의 명령으로 대체됨)"""
+        if 'TAI' in overrides:
+            self.TAI = overrides['TAI']
+        if 'fire_priority' in overrides:
+            self.fire_priority = {**self.fire_priority, **overrides['fire_priority']}
+        if 'maneuver_objective' in overrides:
+            self.maneuver_objective = overrides['maneuver_objective']
+
     @classmethod
     def create_phase_1_command(cls, team: Team):
         if team == Team.RED:
@@ -159,8 +181,8 @@ class Command:
         # 1. 결심조건 평가
         Decision_criteria = self._evaluate_decision_criteria(command_post, all_units)
         
-        # 2. 작전단계 변경
-        if Decision_criteria:
+        # 2. 작전단계 변경 (이미 도달한 단계면 명령을 다시 만들지 않아 env.py 등에서 재정의한 명령을 유지)
+        if Decision_criteria and self.next_phase != self.phase:
             self._update_phase()
 
     def _evaluate_decision_criteria(self, command_post: Unit, all_units: List[Unit]) -> bool:
@@ -208,6 +230,13 @@ class Command:
         
         return False
 
+    def force_phase(self, phase: Phase) -> None:
+        """결심조건과 관계없이 작전단계를 변경 (what-if 분석용)"""
+        if phase == Phase.Deep_fires:
+            raise ValueError("Cannot force a return to Deep_fires")
+        self.next_phase = phase
+        self._update_phase()
+
     def _update_phase(self) -> None:
         """작전단계를 변경하고 관련 명령을 업데이트"""
         if self.next_phase == Phase.CLOSE_COMBAT:
@@ -222,5 +251,35 @@ class Command:
         self.TAI = new_command.TAI
         self.fire_priority = new_command.fire_priority
         self.maneuver_objective = new_command.maneuver_objective
+        self._apply_phase_overrides()
         self._log_phase_change()
 
+
+def parse_command_plan(section: Optional[dict]) -> Dict[Phase, dict]:
+    """config.yaml의 commands.<TEAM> 항목을 작전단계별 명령 재정의로 변환
+
+    예) commands:
+          RED:
+            Deep_fires:
+              TAI: [650, 350]
+              fire_priority: {TANK: 1, ARTILLERY: 3}
+            CLOSE_COMBAT:
+              maneuver_objective: [[350, 300]]
+    """
+    return {Phase[phase_name]: parse_command_overrides(overrides) for phase_name, overrides in (section or {}).items()}
+
+
+def parse_command_overrides(overrides: Optional[dict]) -> dict:
+    """명령 재정의 값(TAI, fire_priority의 유닛 타입 이름, maneuver_objective)을 Command 필드 값으로 변환"""
+    parsed = {}
+    overrides = overrides or {}
+    if 'TAI' in overrides:
+        parsed['TAI'] = tuple(overrides['TAI']) if overrides['TAI'] is not None else None
+    if 'fire_priority' in overrides:
+        parsed['fire_priority'] = {UnitType[name] if isinstance(name, str) else name: priority
+                                   for name, priority in overrides['fire_priority'].items()}
+    if 'maneuver_objective' in overrides:
+        objectives = overrides['maneuver_objective']
+        parsed['maneuver_objective'] = [tuple(point) for point in objectives] if objectives else None
+    return parsed
+
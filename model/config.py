@@ -0,0 +1,97 @@
+import copy
+from typing import Any, Dict, Optional, Union
+import yaml
+
+DEFAULT_CONFIG_FILE = 'config.yaml'
+
+
+class Config:
+    """시뮬레이션 설정 (config.yaml)
+
+    Simulation에서 생성하여 모든 컴포넌트에 전달한다.
+    dict처럼 config['simulation'], config.get('max_time') 형태로 접근할 수 있다.
+    """
+
+    def __init__(self, data: Optional[dict] = None):
+        self.data = data or {}
+
+    @classmethod
+    def load(cls, config_file: str = DEFAULT_CONFIG_FILE) -> 'Config':
+        """설정 파일 로드"""
+        with open(config_file, 'r') as f:
+            return cls(yaml.safe_load(f))
+
+    @classmethod
+    def from_any(cls, config: Union[str, dict, 'Config', None]) -> 'Config':
+        """파일 경로, dict 또는 Config로부터 Config 생성 (None이면 기본 설정)"""
+        if config is None:
+            return get_default_config()
+        if isinstance(config, Config):
+            return config
+        if isinstance(config, dict):
+            return cls(config)
+        return cls.load(config)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def get_path(self, path: str, default: Any = None) -> Any:
+        """점(.)으로 구분된 경로의 값 반환 (예: 'simulation.lethal_radius')"""
+        node = self.data
+        for key in path.split('.'):
+            if not isinstance(node, dict) or key not in node:
+                return default
+            node = node[key]
+        return node
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> 'Config':
+        """점(.)으로 구분된 경로의 값을 바꾼 새 Config 반환 (원본은 변경하지 않음)"""
+        data = copy.deepcopy(self.data)
+        for path, value in overrides.items():
+            node = data
+            keys = path.split('.')
+            for key in keys[:-1]:
+                if not isinstance(node.get(key), dict):
+                    node[key] = {}
+                node = node[key]
+            node[keys[-1]] = value
+        return Config(data)
+
+    def to_dict(self) -> dict:
+        return copy.deepcopy(self.data)
+
+    # 자주 쓰는 시뮬레이션 설정
+    @property
+    def pixel_to_meter_scale(self) -> float:
+        return self.data['simulation']['pixel_to_meter_scale']
+
+    @property
+    def lethal_radius(self) -> float:
+        """포병 치사반경 (미터)"""
+        return self.data['simulation']['lethal_radius']
+
+    @property
+    def mountain_detect_prob(self) -> float:
+        return self.data['simulation']['mountain_detect_prob']
+
+    @property
+    def drone_elevation(self) -> float:
+        """드론 고도 (미터)"""
+        return self.data['simulation']['drone_elevation']
+
+
+_default_config: Optional[Config] = None
+
+
+def get_default_config() -> Config:
+    """현재 디렉토리의 config.yaml (처음 호출될 때 한 번만 읽음)"""
+    global _default_config
+    if _default_config is None:
+        _default_config = Config.load(DEFAULT_CONFIG_FILE)
+    return _default_config
@@ -1,29 +1,124 @@
-from typing import List, Optional
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from model.unit import Unit, Status, UnitType, Team
+from model.event import Event, EventType
 from model.terrain import Terrain
 from model.function import calculate_distance
-import random
-import yaml
+from model.config import Config
+from model.streams import RandomStreams
+import numpy as np
+
+DETECTABLE_STATUSES = [Status.ALIVE, Status.M_KILL, Status.MINOR]  # 탐지 대상이 되는 표적 상태
+DESTROYED_STATUSES = [Status.FATAL, Status.K_KILL]  # 탐색하지 않는 센서 상태
+
+# 유닛 타입별 기본 탐색 주기 (초)
+DEFAULT_SCAN_INTERVALS = {
+    UnitType.RIFLE: 2.0,
+    UnitType.ANTI_TANK: 2.0,
+    UnitType.TANK: 1.0,
+    UnitType.ARTILLERY: 5.0,
+    UnitType.DRONE: 1.0,
+    UnitType.COMMAND_POST: 3.0,
+}
+
+
+@dataclass
+class DetectionSettings:
+    """센서 탐색 주기와 추적 유지 설정 (config.yaml의 detection 항목)
+
+    - scan_interval: 유닛 타입별 탐색(DETECT 이벤트) 주기 (초)
+    - track_max_age: 다시 탐지되지 않은 추적을 유지하는 시간 (초)
+    - los_cache_size: LOS 판정 결과 캐시의 최대 항목 수 (0이면 캐시하지 않음, 가득 차면 가장 오래 쓰지 않은 항목부터 제거)
+    - los_cluster_cell: 0보다 크면 관측/표적 좌표를 이 크기(픽셀, 1이면 DEM 셀)의 격자 칸 모서리로 묶어 LOS 판정
+      (같은 칸의 유닛들이 칸-칸 쌍별로 한 번 계산한 결과를 공유, 칸 안에서의 위치 차이는 무시)
+    """
+    scan_interval: Dict[UnitType, float] = field(default_factory=lambda: dict(DEFAULT_SCAN_INTERVALS))
+    track_max_age: float = 5.0
+    los_cache_size: int = 200000
+    los_cluster_cell: int = 0
+
+    def __post_init__(self):
+        if any(interval <= 0 for interval in self.scan_interval.values()):
+            raise ValueError("detection scan_interval must be positive")
+        if self.los_cluster_cell < 0:
+            raise ValueError("detection los_cluster_cell must be >= 0")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'DetectionSettings':
+        """config.yaml의 detection 항목으로부터 생성 (scan_interval은 유닛 타입 이름별 초)"""
+        config = config or {}
+        scan_interval = dict(DEFAULT_SCAN_INTERVALS)
+        for name, interval in (config.get('scan_interval') or {}).items():
+            scan_interval[UnitType[name]] = float(interval)
+        return cls(scan_interval=scan_interval, track_max_age=config.get('track_max_age', 5.0),
+                   los_cache_size=int(config.get('los_cache_size', 200000)),
+                   los_cluster_cell=int(config.get('los_cluster_cell', 0)))
 
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
 
-PIXEL_TO_METER_SCALE = config['simulation']['pixel_to_meter_scale']
 class Detect:
-    def __init__(self):
-        self.terrain = Terrain()
-        self.MOUNTAIN_DETECT_PROB = config['simulation']['mountain_detect_prob']  # 산악지형 탐지 확률
+    LOS_CHECK_INTERVAL = 10  # LOS 표본 간격 (픽셀)
+    LOS_LEAF_SAMPLES = 8  # 이 수 이하의 표본 구간은 피라미드 없이 직접 확인
+
+    def __init__(self, config: Config = None, terrain: Terrain = None, streams: Optional[RandomStreams] = None):
+        self.config = Config.from_any(config)
+        self.terrain = terrain or Terrain(config=self.config)
+        self.streams = streams or RandomStreams()  # 용도별 난수 흐름 (model/streams.py)
+        self.MOUNTAIN_DETECT_PROB = self.config.mountain_detect_prob  # 산악지형 탐지 확률
+        self.drone_elevation = self.config.drone_elevation / self.config.pixel_to_meter_scale  # 미터를 픽셀로 변환
+        self.settings = DetectionSettings.from_config(self.config.get('detection'))
+        self.tracks: Dict[int, Dict[int, float]] = {}  # 관측 유닛 id -> {표적 id: 마지막 탐지 시간}
+        # (관측 위치, 드론 여부, 표적 위치) -> LOS 판정 결과 (지형은 바뀌지 않으므로 항목이 무효화되지 않음, LRU 순서)
+        self._los_cache: OrderedDict = OrderedDict()
+        self.los_cache_hits = 0
+        self.los_cache_misses = 0
+
+    def los_position(self, position: Tuple[float, float]) -> Tuple[float, float]:
+        """LOS 판정에 쓰는 좌표 (los_cluster_cell이 0보다 크면 격자 칸의 모서리 좌표)"""
+        cell = self.settings.los_cluster_cell
+        if cell <= 0:
+            return position
+        return math.floor(position[0] / cell) * cell, math.floor(position[1] / cell) * cell
 
     def check_los(self, observer: Unit, target: Unit) -> bool:
-        """시야선(LOS) 확인"""
-            
+        """시야선(LOS) 확인
+
+        판정은 관측/표적 좌표와 관측 고도(드론 고도 또는 관측 좌표의 지형 고도)로만 정해지므로 결과를 캐시하여,
+        같은 좌표에 모인 유닛들과 정지한 관측/표적 쌍은 LOS를 한 번만 계산하고 결과를 공유한다.
+        los_cluster_cell을 쓰면 좌표를 격자 칸으로 묶으므로(지상 관측 고도도 칸마다 하나) 이동 중인 밀집 대형도
+        칸-칸 쌍마다 한 번만 계산한다.
+        """
+        observer_position = self.los_position(observer.position)
+        target_position = self.los_position(target.position)
+        is_drone = observer.unit_type == UnitType.DRONE
+        cache_size = self.settings.los_cache_size
+        if cache_size <= 0:
+            return self._compute_los(observer_position, is_drone, target_position)
+        key = (observer_position, is_drone, target_position)
+        cache = self._los_cache
+        visible = cache.get(key)
+        if visible is None:
+            self.los_cache_misses += 1
+            visible = self._compute_los(observer_position, is_drone, target_position)
+            if len(cache) >= cache_size:
+                cache.popitem(last=False)
+            cache[key] = visible
+        else:
+            self.los_cache_hits += 1
+            cache.move_to_end(key)
+        return visible
+
+    def _compute_los(self, observer_position: Tuple[float, float], is_drone: bool,
+                     target_position: Tuple[float, float]) -> bool:
+        """시야선(LOS) 계산"""
         # 두 유닛의 위치와 고도
-        x1, y1 = observer.position
-        x2, y2 = target.position
+        x1, y1 = observer_position
+        x2, y2 = target_position
         
         # 드론의 경우 고도를 설정값으로 고정하고 픽셀로 변환
-        if observer.unit_type == UnitType.DRONE:
-            observer_elevation = config['simulation']['drone_elevation'] / PIXEL_TO_METER_SCALE  # 미터를 픽셀로 변환
+        if is_drone:
+            observer_elevation = self.drone_elevation
         else:
             # 지형의 고도는 이미 픽셀 단위
             observer_elevation = self.terrain.get_elevation((int(x1), int(y1)))
@@ -35,23 +130,45 @@ class Detect:
         distance = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
         
         # 10픽셀 간격으로 체크
-        check_interval = 10
-        num_checks = int(distance / check_interval)
-        
-        # 두 유닛 사이의 직선 경로를 체크
-        for i in range(1, num_checks):  # 시작점과 끝점은 제외
-            # 현재 확인할 지점의 좌표 계산
-            x = x1 + (x2 - x1) * (i / num_checks)
-            y = y1 + (y2 - y1) * (i / num_checks)
-            
-            # 현재 지점의 고도 (이미 픽셀 단위)
-            current_elevation = self.terrain.get_elevation((int(x), int(y)))
-            
-            # 현재 지점의 고도가 관측자나 목표의 고도보다 높으면 시야 차단
-            if current_elevation > observer_elevation and current_elevation > target_elevation:
-                return False
-                
-        return True
+        num_checks = int(distance / self.LOS_CHECK_INTERVAL)
+
+        # 시작점과 끝점을 제외한 표본 지점 중 하나라도 관측자와 목표의 고도보다 높으면 시야 차단
+        return not self._los_blocked(x1, y1, x2, y2, num_checks, max(observer_elevation, target_elevation))
+
+    def _los_blocked(self, x1: float, y1: float, x2: float, y2: float, num_checks: int, height: float) -> bool:
+        """표본 지점 1 ~ num_checks-1 중 고도가 height보다 높은 지점이 있는지 확인
+
+        표본 구간이 지나는 셀 영역의 고도 범위를 지형 피라미드로 먼저 확인하여
+        최대 고도가 height 이하면 구간 전체를 통과, 최소 고도가 height보다 높으면 차단으로 판정하고,
+        그 사이인 경우(능선 부근)에만 구간을 나누어 확인한다. 판정 결과는 모든 표본을 확인한 것과 같다.
+        """
+        if num_checks < 2:
+            return False
+        pyramid = self.terrain.pyramid
+        get_elevation = self.terrain.get_elevation
+        dx, dy = x2 - x1, y2 - y1
+        stack = [(1, num_checks - 1)]
+        while stack:
+            first, last = stack.pop()
+            if last - first < self.LOS_LEAF_SAMPLES:
+                for i in range(first, last + 1):
+                    x = x1 + dx * (i / num_checks)
+                    y = y1 + dy * (i / num_checks)
+                    if get_elevation((int(x), int(y))) > height:
+                        return True
+                continue
+            # 표본 좌표는 번호에 대해 단조이므로 양 끝 표본의 셀이 구간의 셀 영역을 결정
+            xa, xb = int(x1 + dx * (first / num_checks)), int(x1 + dx * (last / num_checks))
+            ya, yb = int(y1 + dy * (first / num_checks)), int(y1 + dy * (last / num_checks))
+            low, high = pyramid.bounds(min(xa, xb), min(ya, yb), max(xa, xb), max(ya, yb))
+            if high <= height:
+                continue
+            if low > height:
+                return True
+            middle = (first + last) // 2
+            stack.append((middle + 1, last))
+            stack.append((first, middle))
+        return False
 
     def detect_target(self, observer: Unit, target: Unit) -> bool:
         """적 유닛 탐지"""
@@ -68,18 +185,67 @@ class Detect:
             return False
         
         # 4. 지형에 따른 탐지 확률 적용
+        return self._terrain_check(target)
+
+    def _terrain_check(self, target: Unit) -> bool:
+        """거리와 LOS를 통과한 표적에 지형에 따른 탐지 확률 적용 (산악 지형의 표적만 난수 사용)"""
         target_terrain = self.terrain.get_terrain_type((int(target.position[0]), int(target.position[1])))
         
         if target_terrain == 'mountain':
             detect_prob = self.MOUNTAIN_DETECT_PROB
-            if random.random() > detect_prob:
+            if self.streams.get('detection', target.id).random() > detect_prob:
                 return False
         
-        # 5. 탐지 성공
+        # 탐지 성공
         return True
 
-    def share_info(self, team: Team, all_units: List[Unit]) -> None:
-        """지휘소를 통한 표적 정보 공유"""
+    def check_los_many(self, observer: Unit, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """한 관측 유닛에서 여러 표적 위치(xs, ys)로의 LOS를 NumPy로 한 번에 확인 (check_los와 같은 판정)
+
+        표적별 표본 지점을 한 배열로 펼쳐 고도를 한 번에 조회한다. 대부분 NumPy 연산이므로
+        여러 스레드에서 동시에 호출할 수 있다 (model/sensing.py).
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        cell = self.settings.los_cluster_cell
+        if cell > 0:  # check_los와 같은 격자 칸 모서리 좌표
+            xs, ys = np.floor(xs / cell) * cell, np.floor(ys / cell) * cell
+        x1, y1 = self.los_position(observer.position)
+        if observer.unit_type == UnitType.DRONE:
+            observer_elevation = self.drone_elevation
+        else:
+            observer_elevation = self.terrain.get_elevation((int(x1), int(y1)))
+        heights = np.maximum(observer_elevation, self.terrain.get_elevations(xs, ys))
+        dx, dy = xs - x1, ys - y1
+        # np.float_power는 Python의 ** 연산과 같은 C pow를 쓰므로 표본 수가 check_los와 같음
+        distances = np.float_power(np.float_power(dx, 2) + np.float_power(dy, 2), 0.5)
+        num_checks = (distances / self.LOS_CHECK_INTERVAL).astype(int)
+        # 표적 p의 표본 번호 1 ~ num_checks[p]-1을 한 배열로 펼침
+        counts = np.maximum(num_checks - 1, 0)
+        pairs = np.repeat(np.arange(len(xs)), counts)
+        starts = np.cumsum(counts) - counts
+        steps = np.arange(len(pairs)) - starts[pairs] + 1
+        fractions = steps / num_checks[pairs]
+        elevations = self.terrain.get_elevations(x1 + dx[pairs] * fractions, y1 + dy[pairs] * fractions)
+        visible = np.ones(len(xs), dtype=bool)
+        visible[pairs[elevations > heights[pairs]]] = False
+        return visible
+
+    def record_detections(self, observer: Unit, candidates: List[Unit], current_time: float) -> None:
+        """거리와 LOS를 통과한 표적(candidates, 유닛 순서)에 update_detection의 나머지 처리 적용
+
+        지형 탐지 확률의 난수를 update_detection과 같은 순서로 쓰므로 결과가 같다.
+        """
+        tracks = self.tracks.setdefault(observer.id, {})
+        for target in candidates:
+            if self._terrain_check(target):
+                observer.add_target(target.id)
+                tracks[target.id] = current_time
+
+    def share_info(self, team: Team, all_units: List[Unit], receivers: Optional[List[Unit]] = None) -> None:
+        """지휘소를 통한 표적 정보 공유 (receivers를 주면 그 유닛들끼리만 공유, 기본값: 모든 유닛)"""
+        if receivers is None:
+            receivers = all_units
         # 팀의 지휘소 찾기
         command_post = next((u for u in all_units 
                            if u.team == team 
@@ -88,37 +254,75 @@ class Detect:
         # 지휘소가 살아있는 경우 모든 유닛의 표적 정보 공유
         if command_post and command_post.status in [Status.ALIVE, Status.M_KILL, Status.MINOR]:
             shared_targets = set()        
-            for unit in all_units:
+            for unit in receivers:
                 if unit.team == team:
                     shared_targets.update(unit.target_list)
             
             # 공유된 표적 정보를 팀의 모든 유닛에 전달
-            for unit in all_units:
+            for unit in receivers:
                 if unit.team == team:
                     unit.target_list.update(shared_targets)
         # 지휘소가 피해를 받은 경우 드론의 표적 정보만 포병에게 공유
         else:
             # 드론의 표적 정보 수집
             drone_targets = set()
-            for unit in all_units:
+            for unit in receivers:
                 if unit.team == team and unit.unit_type == UnitType.DRONE:
                     drone_targets.update(unit.target_list)
             
             # 드론의 표적 정보를 포병에게만 전달
-            for unit in all_units:
+            for unit in receivers:
                 if unit.team == team and unit.unit_type == UnitType.ARTILLERY:
                     unit.target_list.update(drone_targets)
 
-    def update_detection(self, observer: Unit, all_units: List[Unit]):
-        """모든 적 유닛에 대한 탐지 업데이트"""
-        #observer.clear_targets()  # 이전 탐지 목록 초기화
-        
+    def can_scan(self, unit: Unit) -> bool:
+        """탐색 가능 여부 (파괴/사망한 유닛은 탐색하지 않음)"""
+        return unit.status not in DESTROYED_STATUSES
+
+    def schedule_scan(self, unit: Unit, time: float) -> Event:
+        """time에 실행할 탐색(DETECT) 이벤트"""
+        return Event(time=time, event_type=EventType.DETECT, source_id=unit.id)
+
+    def first_scan_time(self, unit: Unit, current_time: float) -> float:
+        """첫 탐색 시간 (같은 타입의 유닛들이 한 틱에 몰리지 않도록 id로 주기 안에서 분산)"""
+        interval = self.settings.scan_interval[unit.unit_type]
+        return current_time + interval * ((unit.id % 10 + 1) / 10)
+
+    def next_scan_time(self, unit: Unit, scan_time: float, current_time: float) -> float:
+        """scan_time에 예약되었던 탐색 다음의 탐색 시간 (주기가 틱보다 짧아도 current_time 이후)"""
+        interval = self.settings.scan_interval[unit.unit_type]
+        next_time = scan_time + interval
+        while next_time <= current_time:
+            next_time += interval
+        return next_time
+
+    def update_detection(self, observer: Unit, all_units: List[Unit], current_time: float = 0.0):
+        """모든 적 유닛에 대한 탐색 1회: 탐지한 표적을 target_list에 추가하고 추적의 마지막 탐지 시간 갱신"""
+        tracks = self.tracks.setdefault(observer.id, {})
         for target in all_units:
-            if target.team != observer.team and target.status in [Status.ALIVE, Status.M_KILL, Status.MINOR]:
+            if target.team != observer.team and target.status in DETECTABLE_STATUSES:
                 if self.detect_target(observer, target):
                     observer.add_target(target.id)
-        
-        
-        # 지휘소를 통한 표적 정보 공유
-        #self.share_info(observer.team, all_units)
-                    
\ No newline at end of file
+                    tracks[target.id] = current_time
+
+    def refresh_tracks(self, units, current_time: float, observers: Optional[List[Unit]] = None) -> None:
+        """추적 정보로 observers(기본값: 모든 유닛)의 target_list 재구성 (공유 전 자신의 추적만)
+
+        track_max_age보다 오래 다시 탐지되지 않은 추적, 탐지 대상 상태가 아닌 표적,
+        파괴/사망한 관측 유닛의 추적은 제거한다.
+        """
+        max_age = self.settings.track_max_age
+        for unit in (units if observers is None else observers):
+            unit.clear_targets()
+            tracks = self.tracks.get(unit.id)
+            if not tracks:
+                continue
+            if not self.can_scan(unit):
+                tracks.clear()
+                continue
+            for target_id, last_seen in list(tracks.items()):
+                target = units.find(target_id)
+                if target is None or target.status not in DETECTABLE_STATUSES or current_time - last_seen > max_age:
+                    del tracks[target_id]
+                else:
+                    unit.add_target(target_id)
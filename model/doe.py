@@ -0,0 +1,387 @@
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+from model.config import Config
+from model.optimize import candidate_key
+from model.replication import WINNER_NAMES, OutcomeAggregator
+from model.runner import run_replication
+from model.unit import Team, UnitType
+
+METHODS = ('lhs', 'sobol')
+# 실행마다 캐시에 저장하는 지표 (지표 목록을 바꾸어도 캐시를 다시 쓸 수 있도록 모두 저장)
+ALL_METRICS = ([f'win_rate.{name}' for name in WINNER_NAMES] + [f'strength.{team.name}' for team in Team] +
+               ['end_time'] + [f'surviving.{team.name}.{unit_type.name}' for team in Team for unit_type in UnitType])
+
+# Sobol 수열 방향수 (Joe & Kuo, new-joe-kuo-6.21201의 2~21번째 차원): (원시다항식 차수 s, 계수 a, 초기 방향수 m)
+# 첫 번째 차원은 모든 방향수가 1인 van der Corput 수열
+SOBOL_DIRECTIONS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+MAX_SOBOL_DIMENSIONS = len(SOBOL_DIRECTIONS) + 1
+SOBOL_BITS = 32
+
+# 실행 결과 캐시 파일 저장 주기 (초, 중단되어도 이 시간 안의 결과만 다시 실행)
+SAVE_INTERVAL = 30.0
+
+
+def _direction_numbers(dimensions: int) -> np.ndarray:
+    """차원별 방향수 v_k = m_k / 2^k를 SOBOL_BITS 비트 정수로 나타낸 (dimensions, SOBOL_BITS) 배열"""
+    directions = [[1 << (SOBOL_BITS - 1 - k) for k in range(SOBOL_BITS)]]
+    for degree, coefficients, initial in SOBOL_DIRECTIONS[:dimensions - 1]:
+        row = [m << (SOBOL_BITS - 1 - k) for k, m in enumerate(initial)]
+        for k in range(degree, SOBOL_BITS):
+            value = row[k - degree] ^ (row[k - degree] >> degree)
+            for i in range(1, degree):
+                if (coefficients >> (degree - 1 - i)) & 1:
+                    value ^= row[k - i]
+            row.append(value)
+        directions.append(row)
+    return np.array(directions, dtype=np.uint64)
+
+
+def sobol_sequence(n: int, dimensions: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Sobol 수열의 처음 n개 점 (n, dimensions), 값은 [0, 1)
+
+    Gray code 순서로 점마다 방향수 하나만 XOR하여 만든다. rng가 주어지면 차원별 무작위 비트열을 XOR(digital shift)하여
+    균등성(2의 거듭제곱 개 점의 층화)을 유지한 채 무작위화한다 (원점 (0, ..., 0)도 나오지 않음).
+    n이 2의 거듭제곱일 때 균등성이 가장 좋다.
+    """
+    if not 1 <= dimensions <= MAX_SOBOL_DIMENSIONS:
+        raise ValueError(f"Sobol sequence supports 1 to {MAX_SOBOL_DIMENSIONS} dimensions, got {dimensions}")
+    directions = _direction_numbers(dimensions)
+    points = np.zeros((n, dimensions), dtype=np.uint64)
+    state = np.zeros(dimensions, dtype=np.uint64)
+    for index in range(1, n):
+        bit = (~(index - 1) & index).bit_length() - 1  # index - 1의 가장 낮은 0 비트
+        state ^= directions[:, bit]
+        points[index] = state
+    if rng is not None:
+        points ^= rng.integers(0, 1 << SOBOL_BITS, size=dimensions, dtype=np.uint64)
+    return points / float(1 << SOBOL_BITS)
+
+
+def latin_hypercube(n: int, dimensions: int, rng: np.random.Generator) -> np.ndarray:
+    """라틴 하이퍼큐브 표본 (n, dimensions): 차원마다 [0, 1)을 n등분한 구간에 점이 하나씩 오도록 구간 순서를 섞음"""
+    strata = np.argsort(rng.random((n, dimensions)), axis=0)
+    return (strata + rng.random((n, dimensions))) / n
+
+
+def saltelli_design(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """두 독립 표본 행렬 A, B와 A의 i열을 B의 i열로 바꾼 AB_i를 [A, B, AB_1, ..., AB_d] 순서로 쌓은 (N(d+2), d) 설계"""
+    blocks = [a, b]
+    for column in range(a.shape[1]):
+        ab = a.copy()
+        ab[:, column] = b[:, column]
+        blocks.append(ab)
+    return np.vstack(blocks)
+
+
+def sobol_indices(outputs: np.ndarray, dimensions: int) -> Tuple[np.ndarray, np.ndarray]:
+    """saltelli_design 순서 출력의 1차 지수(Saltelli 2010)와 전체 지수(Jansen) (출력 분산이 0이면 nan)"""
+    n = len(outputs) // (dimensions + 2)
+    f_a, f_b = outputs[:n], outputs[n:2 * n]
+    f_ab = outputs[2 * n:].reshape(dimensions, n)
+    variance = np.var(np.concatenate([f_a, f_b]))
+    if variance == 0:
+        return np.full(dimensions, np.nan), np.full(dimensions, np.nan)
+    first = np.mean(f_b * (f_ab - f_a), axis=1) / variance
+    total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / variance
+    return first, total
+
+
+@dataclass
+class DoeParameter:
+    """실험계획 입력 하나: 설정 경로와 범위 (두 경계가 모두 정수면 정수 파라미터)"""
+    path: str
+    low: float
+    high: float
+    integer: bool = False
+
+    def __post_init__(self):
+        if not self.low < self.high:
+            raise ValueError(f"doe parameter {self.path} needs low < high, got [{self.low}, {self.high}]")
+
+    @classmethod
+    def from_range(cls, path: str, bounds: List[Any]) -> 'DoeParameter':
+        if len(bounds) != 2:
+            raise ValueError(f"doe parameter {path} needs [low, high], got {bounds}")
+        low, high = bounds
+        integer = all(isinstance(bound, int) and not isinstance(bound, bool) for bound in bounds)
+        return cls(path=path, low=low, high=high, integer=integer)
+
+    def value(self, u: float) -> Union[int, float]:
+        """[0, 1) 좌표를 범위 안의 값으로 변환 (정수는 low~high 각 값이 같은 폭을 차지)"""
+        if self.integer:
+            return int(min(self.low + math.floor(u * (self.high - self.low + 1)), self.high))
+        return float(self.low + u * (self.high - self.low))
+
+
+@dataclass
+class DoeSettings:
+    """실험계획/민감도 분석 설정 (config.yaml의 doe 항목)
+
+    - method: 표본 추출 방법 (lhs: 라틴 하이퍼큐브, sobol: 무작위화한 Sobol 수열)
+    - samples: 기본 표본 수 N (sensitivity면 N(d+2)개 설계점, 아니면 N개)
+    - sensitivity: Saltelli 설계로 1차/전체 Sobol 지수 계산
+    - replications: 설계점별 반복 실행 수 (모든 설계점이 같은 시드 사용)
+    - metrics: 출력 지표 (model/replication.py의 OutcomeAggregator.metric 이름)
+    - parameters: 설정 경로별 [최소, 최대] (예: simulation.lethal_radius, num_tank_red, unit_properties.TANK.detect_range)
+    - bootstrap, confidence: 지수 신뢰구간을 구하는 부트스트랩 재표본 수와 신뢰수준
+    - cache_file: 실행 결과 캐시 (중단된 분석을 다시 실행하면 끝난 실행은 건너뜀)
+    """
+    method: str = 'sobol'
+    samples: int = 64
+    sensitivity: bool = True
+    replications: int = 4
+    metrics: List[str] = field(default_factory=lambda: ['win_rate.BLUE', 'strength.RED', 'strength.BLUE'])
+    parameters: List[DoeParameter] = field(default_factory=list)
+    bootstrap: int = 100
+    confidence: float = 0.95
+    cache_file: Optional[str] = 'results/doe_cache.json'
+
+    def __post_init__(self):
+        if self.method not in METHODS:
+            raise ValueError(f"doe method must be one of {METHODS}, got {self.method}")
+        if self.samples < 2 or self.replications < 1 or self.bootstrap < 0:
+            raise ValueError("doe needs samples >= 2, replications >= 1 and bootstrap >= 0")
+        if not 0 < self.confidence < 1:
+            raise ValueError("doe confidence must be in (0, 1)")
+        if not self.parameters:
+            raise ValueError("doe needs at least one parameter")
+        dimensions = len(self.parameters) * (2 if self.sensitivity else 1)
+        if self.method == 'sobol' and dimensions > MAX_SOBOL_DIMENSIONS:
+            raise ValueError(f"doe sobol supports {MAX_SOBOL_DIMENSIONS} dimensions "
+                             f"(sensitivity uses two per parameter), got {dimensions}; use method lhs")
+        unknown = set(self.metrics) - set(ALL_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown doe metrics: {sorted(unknown)}")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'DoeSettings':
+        """config.yaml의 doe 항목으로부터 생성"""
+        config = config or {}
+        return cls(
+            method=config.get('method', 'sobol'),
+            samples=int(config.get('samples', 64)),
+            sensitivity=config.get('sensitivity', True),
+            replications=int(config.get('replications', 4)),
+            metrics=list(config.get('metrics', ['win_rate.BLUE', 'strength.RED', 'strength.BLUE'])),
+            parameters=[DoeParameter.from_range(path, bounds)
+                        for path, bounds in (config.get('parameters') or {}).items()],
+            bootstrap=int(config.get('bootstrap', 100)),
+            confidence=config.get('confidence', 0.95),
+            cache_file=config.get('cache_file', 'results/doe_cache.json')
+        )
+
+
+@dataclass
+class SensitivityIndex:
+    """파라미터 하나의 Sobol 지수와 부트스트랩 신뢰구간 반폭"""
+    first: float  # 1차 지수: 이 파라미터 단독으로 설명하는 출력 분산 비율
+    total: float  # 전체 지수: 다른 파라미터와의 상호작용을 포함한 비율
+    first_conf: float
+    total_conf: float
+
+
+@dataclass
+class DoeResult:
+    parameters: List[str]
+    points: List[Dict[str, Any]]  # 설계점별 파라미터 값
+    blocks: List[str]  # 설계점별 Saltelli 구분 (A, B, AB_<경로>, sensitivity가 아니면 design)
+    outputs: Dict[str, np.ndarray]  # 지표별 설계점 출력 (반복 실행 평균)
+    indices: Dict[str, Dict[str, SensitivityIndex]]  # 지표별, 파라미터별 Sobol 지수
+    runs_executed: int
+    runs_cached: int
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """CSV 출력을 위한 설계점별 행"""
+        rows = []
+        for index, (point, block) in enumerate(zip(self.points, self.blocks)):
+            row = {'point': index, 'block': block}
+            row.update(point)
+            row.update({name: float(values[index]) for name, values in self.outputs.items()})
+            rows.append(row)
+        return rows
+
+    def index_rows(self) -> List[Dict[str, Any]]:
+        """CSV 출력을 위한 지표 x 파라미터별 Sobol 지수 행"""
+        return [{'metric': metric, 'parameter': path, 'S1': index.first, 'S1_conf': index.first_conf,
+                 'ST': index.total, 'ST_conf': index.total_conf}
+                for metric, by_parameter in self.indices.items() for path, index in by_parameter.items()]
+
+
+_worker_config: Optional[Config] = None
+
+
+def _set_worker_config(config_data: dict) -> None:
+    """작업자 프로세스 초기화: 기본 설정을 한 번만 받아 두고 작업에는 파라미터 값만 보냄"""
+    global _worker_config
+    _worker_config = Config(config_data)
+
+
+def _run_task(task: Tuple[str, Dict[str, Any], int, Optional[float]]) -> Tuple[str, int, Dict[str, float]]:
+    """프로세스 풀 작업 단위 (캐시 키, 파라미터 값, 시드, 최대 시간) -> (캐시 키, 시드, 모든 지표)"""
+    key, overrides, seed, max_time = task
+    aggregator = OutcomeAggregator()
+    aggregator.add(run_replication(_worker_config.with_overrides(overrides), seed, max_time))
+    return key, seed, {name: aggregator.metric(name).mean for name in ALL_METRICS}
+
+
+class DoeStudy:
+    """라틴 하이퍼큐브/Sobol 설계로 설정 파라미터를 표본 추출하여 반복 실행하고 Sobol 민감도 지수를 계산
+
+    격자 스윕과 달리 실행 수가 파라미터 수에 선형(N(d+2) x 반복 수)으로 늘어난다.
+    모든 설계점이 같은 시드 목록(base_seed + 반복 번호)을 쓰고(rng.streams를 켜면 차이 추정 분산이 더 줄어듦),
+    실행 결과는 (설계점 설정, 시드 목록, 최대 시간) 해시별로 cache_file에 주기적으로 저장하므로
+    중단된 분석을 같은 설정으로 다시 실행하면 끝난 실행은 건너뛴다. 같은 seed의 Sobol 설계는 samples를 늘려도
+    앞쪽 점이 같으므로 표본을 늘릴 때도 이전 결과를 다시 쓴다 (Saltelli 설계의 B 행렬 열은 파라미터 수에 따라 달라짐).
+    """
+
+    def __init__(self, base_config: Union[str, dict, Config], settings: Optional[DoeSettings] = None,
+                 workers: int = 1, base_seed: int = 0, max_time: Optional[float] = None):
+        self.config = Config.from_any(base_config)
+        self.settings = settings or DoeSettings.from_config(self.config.get('doe'))
+        self.workers = workers
+        self.base_seed = base_seed
+        self.max_time = max_time
+        self.seeds = [base_seed + replication for replication in range(self.settings.replications)]
+        self.cache: Dict[str, Dict[str, Dict[str, float]]] = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        path = self.settings.cache_file
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_cache(self) -> None:
+        path = self.settings.cache_file
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.cache, f)
+        os.replace(path + '.tmp', path)
+
+    def design(self, seed: int = 0) -> Tuple[np.ndarray, List[str]]:
+        """[0, 1) 좌표의 설계 행렬과 행별 구분"""
+        settings = self.settings
+        rng = np.random.default_rng(seed)
+        n, dimensions = settings.samples, len(settings.parameters)
+        columns = dimensions * (2 if settings.sensitivity else 1)
+        if settings.method == 'sobol':
+            base = sobol_sequence(n, columns, rng)
+        else:
+            base = latin_hypercube(n, columns, rng)
+        if not settings.sensitivity:
+            return base, ['design'] * n
+        blocks = ['A'] * n + ['B'] * n
+        for parameter in settings.parameters:
+            blocks.extend([f'AB_{parameter.path}'] * n)
+        return saltelli_design(base[:, :dimensions], base[:, dimensions:]), blocks
+
+    def run(self, seed: int = 0, progress=None) -> DoeResult:
+        """설계점을 모두 실행하고 지표/민감도 지수 계산 (seed는 설계 난수 시드, progress(완료 실행 수, 전체 실행 수))"""
+        settings = self.settings
+        unit_points, blocks = self.design(seed)
+        points = [{parameter.path: parameter.value(u) for parameter, u in zip(settings.parameters, row)}
+                  for row in unit_points.tolist()]
+        keys, tasks = [], []
+        pending = set()
+        for point in points:
+            config_data = self.config.with_overrides(point).to_dict()
+            config_data.pop('doe', None)  # doe 설정(표본 수 등)을 바꾸어도 같은 설계점의 결과를 다시 씀
+            key = candidate_key(config_data, self.seeds, self.max_time)
+            keys.append(key)
+            if key in pending:
+                continue
+            pending.add(key)
+            done = self.cache.get(key, {})
+            tasks.extend((key, point, run_seed, self.max_time) for run_seed in self.seeds if str(run_seed) not in done)
+        total_runs = len(pending) * len(self.seeds)
+        self._execute(tasks, total_runs, progress)
+
+        outputs = {name: np.array([np.mean([self.cache[key][str(run_seed)][name] for run_seed in self.seeds])
+                                   for key in keys])
+                   for name in settings.metrics}
+        indices = self._indices(outputs, seed) if settings.sensitivity else {}
+        return DoeResult(parameters=[parameter.path for parameter in settings.parameters], points=points,
+                         blocks=blocks, outputs=outputs, indices=indices,
+                         runs_executed=len(tasks), runs_cached=total_runs - len(tasks))
+
+    def _execute(self, tasks: List[tuple], total_runs: int, progress) -> None:
+        """작업을 프로세스 풀에서 실행하며 SAVE_INTERVAL마다, 그리고 끝나거나 중단될 때 캐시 저장"""
+        if not tasks:
+            return
+        completed = total_runs - len(tasks)
+        last_save = time.monotonic()
+        executor = None
+        try:
+            if self.workers > 1:
+                executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_set_worker_config,
+                                               initargs=(self.config.to_dict(),))
+                outputs = (future.result() for future in as_completed([executor.submit(_run_task, task)
+                                                                       for task in tasks]))
+            else:
+                _set_worker_config(self.config.to_dict())
+                outputs = map(_run_task, tasks)
+            for key, seed, metrics in outputs:
+                self.cache.setdefault(key, {})[str(seed)] = metrics
+                completed += 1
+                if progress:
+                    progress(completed, total_runs)
+                if time.monotonic() - last_save >= SAVE_INTERVAL:
+                    self._save_cache()
+                    last_save = time.monotonic()
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+            self._save_cache()
+
+    def _indices(self, outputs: Dict[str, np.ndarray], seed: int) -> Dict[str, Dict[str, SensitivityIndex]]:
+        """지표별 Sobol 지수와 A/B 행(과 같은 번호의 AB_i 행)을 다시 뽑는 부트스트랩 신뢰구간"""
+        settings = self.settings
+        dimensions, n = len(settings.parameters), settings.samples
+        z = NormalDist().inv_cdf((1 + settings.confidence) / 2)
+        rng = np.random.default_rng(seed)
+        resamples = rng.integers(0, n, size=(settings.bootstrap, n))
+        offsets = np.arange(dimensions + 2)[:, None] * n
+        indices = {}
+        for name, values in outputs.items():
+            first, total = sobol_indices(values, dimensions)
+            first_conf = total_conf = np.full(dimensions, np.nan)
+            if settings.bootstrap > 1:
+                samples = [sobol_indices(values[(offsets + rows).ravel()], dimensions) for rows in resamples]
+                first_conf = z * np.nanstd([sample[0] for sample in samples], axis=0, ddof=1)
+                total_conf = z * np.nanstd([sample[1] for sample in samples], axis=0, ddof=1)
+            indices[name] = {
+                parameter.path: SensitivityIndex(first=float(first[i]), total=float(total[i]),
+                                                 first_conf=float(first_conf[i]), total_conf=float(total_conf[i]))
+                for i, parameter in enumerate(settings.parameters)
+            }
+        return indices
@@ -0,0 +1,244 @@
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from model.config import Config
+from model.command import Phase, parse_command_overrides
+from model.recorder import COLUMNS
+from model.termination import team_strength
+from model.unit import Team, UnitType, Status, Action
+
+# 행동으로 재정의할 수 있는 Command 필드 (parse_command_overrides 형식)
+ACTION_FIELDS = ('fire_priority', 'TAI', 'maneuver_objective')
+
+# 관측의 유닛별 배열 (이름, dtype) - enum 값은 스냅샷 기록(model/recorder.py)과 같은 code로 저장
+UNIT_COLUMNS = [(name, dtype) for name, dtype in COLUMNS if name not in ('time', 'phase')]
+ENUM_CODES = {
+    'team': {team: code for code, team in enumerate(Team)},
+    'unit_type': {unit_type: code for code, unit_type in enumerate(UnitType)},
+    'status': {status: code for code, status in enumerate(Status)},
+    'action': {action: code for code, action in enumerate(Action)},
+    'phase': {phase: code for code, phase in enumerate(Phase)},
+}
+TEAMS = list(Team)
+
+
+@dataclass
+class EnvSettings:
+    """단계 실행 환경 설정 (config.yaml의 env 항목)
+
+    - decision_interval: step() 한 번에 진행하는 모의 시간 (초, 틱 크기의 배수)
+    - team: 보상 기준 팀 (보상 = 이 팀과 적 팀의 전투력 비율 차이의 증가량)
+    - max_time: 이 시간에 도달하면 truncated (없으면 config.yaml의 max_time)
+    """
+    decision_interval: float = 10.0
+    team: Team = Team.BLUE
+    max_time: Optional[float] = None
+
+    def __post_init__(self):
+        if self.decision_interval <= 0:
+            raise ValueError("env decision_interval must be positive")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'EnvSettings':
+        """config.yaml의 env 항목으로부터 생성"""
+        config = config or {}
+        return cls(
+            decision_interval=config.get('decision_interval', 10.0),
+            team=Team[config.get('team', 'BLUE')],
+            max_time=config.get('max_time')
+        )
+
+
+class WarGameEnv:
+    """시뮬레이션을 결정 주기 단위로 진행하는 Gym 형식 환경
+
+    reset(seed)은 처음 만든 시뮬레이션의 스냅샷을 복원하므로 지형/시나리오를 다시 읽지 않는다.
+    step(actions)은 팀별 명령 재정의(fire_priority, TAI, maneuver_objective)를 적용하고
+    decision_interval만큼 헤드리스로 진행한 뒤 (관측, 보상, terminated, truncated, info)를 반환한다.
+    재정의는 작전단계가 바뀌면 그 단계의 명령으로 대체되므로 필요하면 매 step마다 다시 준다.
+    환경마다 난수 상태를 따로 두고 진행할 때만 전역 random에 넣으므로, 여러 환경을 번갈아 진행해도
+    각 환경의 결과는 혼자 진행한 것과 같다.
+    """
+
+    def __init__(self, config: Union[str, dict, Config] = 'config.yaml', seed: Optional[int] = None):
+        from simulation import Simulation  # 최상위 모듈이므로 실행 시점에 불러옴
+        self.config = Config.from_any(config).with_overrides({'recorder.enabled': False})
+        self.settings = EnvSettings.from_config(self.config.get('env'))
+        self._rng_state = random.Random(seed).getstate()
+        with self._own_rng():
+            self.simulation = Simulation(self.config, headless=True, verbose=False)
+        self.max_time = self.settings.max_time if self.settings.max_time is not None else self.simulation.max_time
+        self._initial_state = self.simulation.snapshot()
+        self.reason: Optional[str] = None
+        self._advantage = self._strength_advantage()
+
+    @contextmanager
+    def _own_rng(self):
+        """이 환경의 난수 상태로 전역 random을 바꾸어 실행하고 호출한 쪽의 난수 상태는 되돌림"""
+        outer_state = random.getstate()
+        random.setstate(self._rng_state)
+        try:
+            yield
+        finally:
+            self._rng_state = random.getstate()
+            random.setstate(outer_state)
+
+    @property
+    def done(self) -> bool:
+        return self.reason is not None
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """초기 상태로 되돌리고 첫 관측 반환 (seed가 없으면 이 환경의 난수 흐름을 이어서 사용)"""
+        with self._own_rng():
+            if seed is None:
+                seed = random.getrandbits(64)
+            self.simulation.restore(self._initial_state)
+            self.simulation.reseed(seed)
+        self.reason = None
+        self._advantage = self._strength_advantage()
+        return self.observe()
+
+    def apply_actions(self, actions: Optional[dict]) -> None:
+        """팀별(팀 이름 또는 Team) 명령 재정의 적용
+
+        예) {'BLUE': {'fire_priority': {'TANK': 1}, 'maneuver_objective': [[350, 300]]}, 'RED': {'TAI': [650, 350]}}
+        """
+        for team, overrides in (actions or {}).items():
+            team = Team[team] if isinstance(team, str) else team
+            unknown = set(overrides or {}) - set(ACTION_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown action fields for {team.value}: {sorted(unknown)}")
+            self.simulation.commands[team].apply_overrides(parse_command_overrides(overrides))
+
+    def step(self, actions: Optional[dict] = None) -> Tuple[Dict[str, np.ndarray], float, bool, bool, dict]:
+        """행동을 적용하고 decision_interval만큼 진행"""
+        if self.done:
+            raise RuntimeError(f"Episode has ended ({self.reason}); call reset()")
+        self.apply_actions(actions)
+        self._advance(self.simulation.current_time + self.settings.decision_interval)
+        advantage = self._strength_advantage()
+        reward, self._advantage = advantage - self._advantage, advantage
+        terminated = self.done and self.reason != 'max_time'
+        return self.observe(), reward, terminated, self.reason == 'max_time', self.info()
+
+    def run_until(self, until_time: float) -> Dict[str, np.ndarray]:
+        """행동 없이 until_time까지(또는 종료될 때까지) 진행하고 관측 반환"""
+        if not self.done:
+            self._advance(until_time)
+        return self.observe()
+
+    def _advance(self, until_time: float) -> None:
+        with self._own_rng():
+            self.reason = self.simulation.fast_forward(min(until_time, self.max_time))
+        if self.reason is None and self.simulation.current_time >= self.max_time:
+            self.reason = 'max_time'
+
+    def _strength_advantage(self) -> float:
+        own = self.settings.team
+        enemy = Team.RED if own == Team.BLUE else Team.BLUE
+        return team_strength(self.simulation.units, own) - team_strength(self.simulation.units, enemy)
+
+    def observe(self, out: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """현재 상태의 관측 (out을 주면 그 배열들에 채움)
+
+        - time: 모의 시간
+        - unit_id, team, unit_type, x, y, status, action, target: 유닛별 배열 (유닛 목록 순서, 사격 대상이 없으면 target -1)
+        - phase, strength: Team 순서(RED, BLUE)의 작전단계 code와 전투력 비율
+        """
+        units = self.simulation.units
+        if out is None:
+            out = {name: np.empty(len(units), dtype=dtype) for name, dtype in UNIT_COLUMNS}
+            out['time'] = np.empty((), dtype=float)
+            out['phase'] = np.empty(len(TEAMS), dtype=np.int8)
+            out['strength'] = np.empty(len(TEAMS), dtype=float)
+        out['time'][...] = self.simulation.current_time
+        out['unit_id'][:] = [unit.id for unit in units]
+        out['team'][:] = [ENUM_CODES['team'][unit.team] for unit in units]
+        out['unit_type'][:] = [ENUM_CODES['unit_type'][unit.unit_type] for unit in units]
+        out['x'][:] = [unit.position[0] for unit in units]
+        out['y'][:] = [unit.position[1] for unit in units]
+        out['status'][:] = [ENUM_CODES['status'][unit.status] for unit in units]
+        out['action'][:] = [ENUM_CODES['action'][unit.action] for unit in units]
+        out['target'][:] = [unit.target if unit.target is not None else -1 for unit in units]
+        out['phase'][:] = [ENUM_CODES['phase'][self.simulation.commands[team].phase] for team in TEAMS]
+        out['strength'][:] = [team_strength(units, team) for team in TEAMS]
+        return out
+
+    def info(self) -> dict:
+        return {
+            'time': self.simulation.current_time,
+            'reason': self.reason,
+            'phase': {team.value: command.phase.name for team, command in self.simulation.commands.items()},
+        }
+
+    def close(self) -> None:
+        self.simulation.sensing.close()
+
+
+class VectorEnv:
+    """여러 전투(WarGameEnv)를 같은 결정 주기로 함께 진행하고 관측을 (환경 수, ...) 배열로 묶어 반환
+
+    환경을 차례로 진행하는 편의용 묶음이다: 틱별 탐지/사격/이동 계산은 환경 사이에 묶지 않고 환경마다
+    WarGameEnv.step을 파이썬 반복문으로 호출하므로 처리량은 환경 수를 늘려도 WarGameEnv 하나와 같다
+    (기본 시나리오에서 약 11만 env step/시간, benchmarks/env_benchmark.py). 묶는 것은 관측 배열뿐이며,
+    관측은 미리 만든 배치 배열의 행에 바로 채운다. 처리량을 늘리려면 환경을 프로세스별로 나누어 실행한다.
+    환경마다 난수 상태가 따로 있으므로 i번째 환경의 결과는 seed + i로 만든 WarGameEnv를 혼자 진행한 것과 같다.
+    autoreset=True면 끝난 환경은 같은 step에서 reset되고, 끝난 시점의 관측은 info['final_observation']에 담긴다.
+    관측을 묶으려면 모든 환경의 유닛 수가 같아야 한다.
+    """
+
+    def __init__(self, configs: Union[str, dict, Config, List[Union[str, dict, Config]]] = 'config.yaml',
+                 num_envs: Optional[int] = None, seed: Optional[int] = None, autoreset: bool = True):
+        if not isinstance(configs, list):
+            configs = [configs] * (num_envs or 1)
+        self.envs = [WarGameEnv(config, seed=None if seed is None else seed + index)
+                     for index, config in enumerate(configs)]
+        self.num_envs = len(self.envs)
+        self.autoreset = autoreset
+        sizes = {len(env.simulation.units) for env in self.envs}
+        if len(sizes) > 1:
+            raise ValueError(f"All environments must have the same number of units (got {sorted(sizes)})")
+        first = self.envs[0].observe()
+        self._batch = {name: np.empty((self.num_envs,) + values.shape, dtype=values.dtype)
+                       for name, values in first.items()}
+
+    def _observe(self) -> Dict[str, np.ndarray]:
+        for index, env in enumerate(self.envs):
+            env.observe({name: values[index, ...] for name, values in self._batch.items()})
+        return {name: values.copy() for name, values in self._batch.items()}
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        for index, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + index)
+        return self._observe()
+
+    def step(self, actions: Optional[List[Optional[dict]]] = None):
+        """환경별 행동 목록을 적용하고 환경을 차례로 진행
+
+        (관측 배치, 보상 배열, terminated 배열, truncated 배열, 환경별 info 목록)을 반환한다.
+        """
+        actions = actions if actions is not None else [None] * self.num_envs
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}")
+        rewards = np.zeros(self.num_envs)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            observation, rewards[index], terminated[index], truncated[index], info = env.step(action)
+            if env.done and self.autoreset:
+                info['final_observation'] = observation
+                env.reset()
+            infos.append(info)
+        return self._observe(), rewards, terminated, truncated, infos
+
+    def run_until(self, until_time: float) -> Dict[str, np.ndarray]:
+        for env in self.envs:
+            env.run_until(until_time)
+        return self._observe()
+
+    def close(self) -> None:
+        for env in self.envs:
+            env.close()
@@ -1,11 +1,16 @@
-from dataclasses import dataclass
-from typing import Callable, Any, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable, Any, List, Optional, Tuple, Dict
 from enum import Enum
 import heapq
+import itertools
+import bisect
+import math
 
 class EventType(Enum):
     MOVE = "MOVE"
     FIRE = "FIRE"
+    DETECT = "DETECT"
 
 @dataclass
 class Event:
@@ -15,33 +20,115 @@ class Event:
     target_id: Optional[int] = None  # 이벤트의 대상 유닛 ID (있는 경우)
     position: Optional[Tuple[float, float]] = None  # 이동 이벤트에서 사용
     data: Any = None  # 추가 데이터
+    cancelled: bool = field(default=False, compare=False)  # 취소 여부 (lazy deletion)
 
     def __lt__(self, other):
         """시간을 기준으로 비교"""
         return self.time < other.time
 
-class EventQueue:
+class FutureEventList(ABC):
+    """미래 이벤트 목록(FEL) 공통 인터페이스
+
+    - 유닛별로 (source_id, event_type) 당 대기 중인 이벤트를 최대 1개만 유지
+    - schedule()이 반환하는 Event 객체가 취소용 핸들 역할을 함
+    - 취소는 lazy deletion으로 처리: 표시만 해두고 pop 시 버림
+    - 저장소에 남은 취소된 이벤트가 살아있는 이벤트보다 많아지면 저장소를 재구성
+    - 동일 시간 이벤트는 예약 순서(sequence number)대로 처리
+
+    하위 클래스는 (time, seq, event) 항목을 저장하는 _push_entry, _pop_entry,
+    _peek_entry, _entries, _rebuild, _storage_size 를 구현하고,
+    필요하면 pop_until을 저장소에 맞게 일괄 처리하도록 재정의한다.
+    """
+    COMPACT_MIN_SIZE = 64  # 이 크기 이하의 저장소는 재구성하지 않음
+
     def __init__(self):
-        self._queue: List[Event] = []
+        self._pending: Dict[Tuple[int, EventType], Event] = {}
+        self._counter = itertools.count()  # 동일 시간 이벤트의 순서 보장
         self._current_time: float = 0.0
+        self._stale = 0  # 저장소 안에 남아있는 취소된 이벤트 수
+
+        # 저장소 크기 지표
+        self.scheduled_count = 0
+        self.cancelled_count = 0
+        self.discarded_count = 0
+        self.compaction_count = 0
+        self.peak_size = 0
 
-    def schedule(self, event: Event):
-        """새로운 이벤트를 큐에 추가"""
-        heapq.heappush(self._queue, (event.time, event))
+    def schedule(self, event: Event, replace: bool = True) -> Optional[Event]:
+        """새로운 이벤트를 큐에 추가
+
+        같은 유닛의 같은 종류 이벤트가 이미 대기 중이면
+        replace=True일 때 기존 이벤트를 취소하고, False일 때 새 이벤트를 버린다.
+        """
+        key = (event.source_id, event.event_type)
+        existing = self._pending.get(key)
+        if existing is not None:
+            if not replace:
+                return None
+            self.cancel(existing)
+
+        size = self._push_entry((event.time, next(self._counter), event))
+        self._pending[key] = event
+        self.scheduled_count += 1
+        if size > self.peak_size:
+            self.peak_size = size
+        return event
 
-    def get_next_event(self) -> Event:
+    def cancel(self, event: Event) -> bool:
+        """이벤트 취소 (이미 처리되었거나 취소된 경우 False)"""
+        key = (event.source_id, event.event_type)
+        if self._pending.get(key) is not event:
+            return False
+        del self._pending[key]
+        event.cancelled = True
+        self._stale += 1
+        self.cancelled_count += 1
+        self._maybe_compact()
+        return True
+
+    def cancel_unit(self, source_id: int, event_type: Optional[EventType] = None) -> int:
+        """유닛의 대기 중인 이벤트 취소, 취소된 이벤트 수 반환"""
+        types = [event_type] if event_type else list(EventType)
+        cancelled = 0
+        for etype in types:
+            event = self._pending.get((source_id, etype))
+            if event is not None and self.cancel(event):
+                cancelled += 1
+        return cancelled
+
+    def pending(self, source_id: int, event_type: EventType) -> Optional[Event]:
+        """유닛의 대기 중인 이벤트 반환"""
+        return self._pending.get((source_id, event_type))
+
+    def has_pending(self, source_id: int, event_type: EventType) -> bool:
+        """유닛의 대기 중인 이벤트 존재 여부"""
+        return (source_id, event_type) in self._pending
+
+    def get_next_event(self) -> Optional[Event]:
         """다음 이벤트를 가져옴"""
-        if not self._queue:
+        self._discard_cancelled()
+        entry = self._pop_entry()
+        if entry is None:
             return None
-        _, event = heapq.heappop(self._queue)
+        event = entry[2]
+        del self._pending[(event.source_id, event.event_type)]
         self._current_time = event.time
         return event
 
-    def peek_next_event(self) -> Event:
+    def pop_until(self, time: float) -> List[Event]:
+        """time 이하의 모든 이벤트를 시간 순서대로 꺼냄"""
+        events = []
+        while True:
+            event = self.peek_next_event()
+            if event is None or event.time > time:
+                return events
+            events.append(self.get_next_event())
+
+    def peek_next_event(self) -> Optional[Event]:
         """다음 이벤트를 확인만 하고 제거하지 않음"""
-        if not self._queue:
-            return None
-        return self._queue[0][1]
+        self._discard_cancelled()
+        entry = self._peek_entry()
+        return entry[2] if entry is not None else None
 
     def get_current_time(self) -> float:
         """현재 시뮬레이션 시간 반환"""
@@ -49,4 +136,251 @@ class EventQueue:
 
     def is_empty(self) -> bool:
         """이벤트 큐가 비어있는지 확인"""
-        return len(self._queue) == 0 
\ No newline at end of file
+        return not self._pending
+
+    def __len__(self) -> int:
+        """대기 중인 (취소되지 않은) 이벤트 수"""
+        return len(self._pending)
+
+    def count_pending(self, exclude: Tuple[EventType, ...] = ()) -> int:
+        """exclude 종류를 뺀 대기 중인 이벤트 수 (대기 이벤트 수에 비례하는 비용)"""
+        return sum(1 for _, event_type in self._pending if event_type not in exclude)
+
+    def get_state(self) -> dict:
+        """대기 중인 이벤트와 카운터를 체크포인트용 기본 타입으로 반환 (취소된 이벤트는 제외)"""
+        entries = sorted((entry for entry in self._entries() if not entry[2].cancelled), key=lambda entry: entry[:2])
+        next_seq = next(self._counter)
+        self._counter = itertools.count(next_seq)
+        return {
+            'entries': [(time, seq, event.event_type, event.source_id, event.target_id, event.position, event.data)
+                        for time, seq, event in entries],
+            'next_seq': next_seq,
+            'current_time': self._current_time,
+            'counts': (self.scheduled_count, self.cancelled_count, self.discarded_count,
+                       self.compaction_count, self.peak_size),
+        }
+
+    def set_state(self, state: dict) -> None:
+        """get_state()로 저장한 상태로 복원 (기존 이벤트는 모두 버림)"""
+        entries = []
+        self._pending = {}
+        for time, seq, event_type, source_id, target_id, position, data in state['entries']:
+            event = Event(time, event_type, source_id, target_id, position, data)
+            entries.append((time, seq, event))
+            self._pending[(source_id, event_type)] = event
+        self._rebuild(entries)
+        self._counter = itertools.count(state['next_seq'])
+        self._current_time = state['current_time']
+        self._stale = 0
+        (self.scheduled_count, self.cancelled_count, self.discarded_count,
+         self.compaction_count, self.peak_size) = state['counts']
+
+    def metrics(self) -> Dict[str, int]:
+        """저장소 크기 지표 반환"""
+        return {
+            'heap_size': self._storage_size(),
+            'pending': len(self._pending),
+            'stale': self._stale,
+            'peak_heap_size': self.peak_size,
+            'scheduled': self.scheduled_count,
+            'cancelled': self.cancelled_count,
+            'discarded': self.discarded_count,
+            'compactions': self.compaction_count,
+        }
+
+    def _discard_cancelled(self):
+        """맨 앞의 취소된 이벤트 제거"""
+        while True:
+            entry = self._peek_entry()
+            if entry is None or not entry[2].cancelled:
+                return
+            self._pop_entry()
+            self._stale -= 1
+            self.discarded_count += 1
+
+    def _maybe_compact(self):
+        """취소된 이벤트가 절반을 넘으면 저장소 재구성"""
+        size = self._storage_size()
+        if size > self.COMPACT_MIN_SIZE and self._stale * 2 > size:
+            self._rebuild([entry for entry in self._entries() if not entry[2].cancelled])
+            self.discarded_count += self._stale
+            self._stale = 0
+            self.compaction_count += 1
+
+    # 저장소 구현 (하위 클래스에서 정의)
+    @abstractmethod
+    def _push_entry(self, entry: Tuple[float, int, Event]) -> int:
+        """항목을 저장하고 저장소 크기를 반환"""
+
+    @abstractmethod
+    def _pop_entry(self) -> Optional[Tuple[float, int, Event]]:
+        """가장 앞선 항목을 꺼냄 (비어 있으면 None)"""
+
+    @abstractmethod
+    def _peek_entry(self) -> Optional[Tuple[float, int, Event]]:
+        """가장 앞선 항목을 확인만 함 (비어 있으면 None)"""
+
+    @abstractmethod
+    def _entries(self) -> List[Tuple[float, int, Event]]:
+        """저장된 모든 항목 (순서 무관)"""
+
+    @abstractmethod
+    def _rebuild(self, entries: List[Tuple[float, int, Event]]):
+        """entries로 저장소를 다시 구성"""
+
+    @abstractmethod
+    def _storage_size(self) -> int:
+        """저장된 항목 수 (취소된 항목 포함)"""
+
+class EventQueue(FutureEventList):
+    """이진 힙(heapq) 기반 FEL"""
+
+    def __init__(self):
+        super().__init__()
+        self._queue: List[Tuple[float, int, Event]] = []
+
+    def _push_entry(self, entry):
+        heapq.heappush(self._queue, entry)
+        return len(self._queue)
+
+    def _pop_entry(self):
+        return heapq.heappop(self._queue) if self._queue else None
+
+    def pop_until(self, time: float) -> List[Event]:
+        """time 이하의 모든 이벤트를 시간 순서대로 꺼냄"""
+        events = []
+        queue, pending = self._queue, self._pending
+        while queue and queue[0][0] <= time:
+            event = heapq.heappop(queue)[2]
+            if event.cancelled:
+                self._stale -= 1
+                self.discarded_count += 1
+                continue
+            del pending[(event.source_id, event.event_type)]
+            events.append(event)
+        if events:
+            self._current_time = events[-1].time
+        return events
+
+    def _peek_entry(self):
+        return self._queue[0] if self._queue else None
+
+    def _entries(self):
+        return self._queue
+
+    def _rebuild(self, entries):
+        self._queue = entries
+        heapq.heapify(self._queue)
+
+    def _storage_size(self):
+        return len(self._queue)
+
+class CalendarEventQueue(FutureEventList):
+    """시간 버킷(calendar queue) 기반 FEL
+
+    이벤트를 bucket_width 초 단위 버킷에 나누어 담는다. 버킷 안의 이벤트는
+    해당 버킷이 처리될 차례가 되었을 때 한 번만 정렬하므로, 대부분의 이벤트가
+    1초 뒤로 예약되는 이동 이벤트일 때 push는 O(1), pop은 상수 시간에 가깝다.
+    """
+
+    def __init__(self, bucket_width: float = 1.0):
+        super().__init__()
+        if bucket_width <= 0:
+            raise ValueError(f"bucket_width must be positive, got {bucket_width}")
+        self.bucket_width = bucket_width
+        self._buckets: Dict[int, List[Tuple[float, int, Event]]] = {}  # 대기 중인 (정렬 전) 버킷
+        self._bucket_heap: List[int] = []  # 비어있지 않은 버킷 번호
+        self._active: List[Tuple[float, int, Event]] = []  # 처리 중인 (정렬된) 버킷
+        self._active_index: Optional[int] = None
+        self._head = 0  # _active에서 다음에 꺼낼 위치
+        self._size = 0
+
+    def _push_entry(self, entry):
+        index = math.floor(entry[0] / self.bucket_width)
+        self._size += 1
+        if self._active_index is not None and index <= self._active_index:
+            # 처리 중인 버킷 (또는 과거 시간) 이벤트는 정렬 상태를 유지하며 삽입
+            bisect.insort(self._active, entry, lo=self._head)
+            return self._size
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            self._buckets[index] = [entry]
+            heapq.heappush(self._bucket_heap, index)
+        else:
+            bucket.append(entry)
+        return self._size
+
+    def _advance(self) -> bool:
+        """처리 중인 버킷이 비었으면 다음 버킷을 정렬해 활성화"""
+        if self._head < len(self._active):
+            return True
+        if not self._bucket_heap:
+            self._active, self._active_index, self._head = [], None, 0
+            return False
+        index = heapq.heappop(self._bucket_heap)
+        self._active = self._buckets.pop(index)
+        self._active.sort()
+        self._active_index = index
+        self._head = 0
+        return True
+
+    def _pop_entry(self):
+        if not self._advance():
+            return None
+        entry = self._active[self._head]
+        self._head += 1
+        self._size -= 1
+        return entry
+
+    def _peek_entry(self):
+        if not self._advance():
+            return None
+        return self._active[self._head]
+
+    def pop_until(self, time: float) -> List[Event]:
+        """time 이하의 모든 이벤트를 시간 순서대로 꺼냄 (버킷 단위 일괄 처리)"""
+        events = []
+        while self._advance():
+            active, head = self._active, self._head
+            end = head
+            while end < len(active) and active[end][0] <= time:
+                event = active[end][2]
+                end += 1
+                if event.cancelled:
+                    self._stale -= 1
+                    self.discarded_count += 1
+                    continue
+                del self._pending[(event.source_id, event.event_type)]
+                events.append(event)
+            self._size -= end - head
+            self._head = end
+            if end < len(active):
+                break
+        if events:
+            self._current_time = events[-1].time
+        return events
+
+    def _entries(self):
+        entries = self._active[self._head:]
+        for bucket in self._buckets.values():
+            entries.extend(bucket)
+        return entries
+
+    def _rebuild(self, entries):
+        self._buckets = {}
+        self._bucket_heap = []
+        self._active, self._active_index, self._head = [], None, 0
+        self._size = 0
+        for entry in entries:
+            self._push_entry(entry)
+
+    def _storage_size(self):
+        return self._size
+
+def create_event_queue(kind: str = "heap", bucket_width: float = 1.0) -> FutureEventList:
+    """설정값에 따른 FEL 생성 (heap | calendar)"""
+    if kind == "heap":
+        return EventQueue()
+    if kind == "calendar":
+        return CalendarEventQueue(bucket_width)
+    raise ValueError(f"Unknown event queue type: {kind}")
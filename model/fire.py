@@ -1,34 +1,41 @@
 from typing import List, Optional, Dict, Tuple
-from model.unit import Unit, Status, Action, UnitType
+from model.unit import Unit, Status, Action, UnitType, find_unit
 from model.event import Event, EventType
 from model.command import Command
 from model.detect import Detect
 from model.terrain import Terrain
-from model.probabilities import ProbabilitySystem
+from model.probabilities import ProbabilitySystem, VEHICLE_TYPES, VEHICLE_KILL_STATUSES, PERSONNEL_KILL_STATUSES
+from model.targeting import TargetIndex
 from model.function import calculate_distance, calculate_point_distance
 import random
 import math
-import pandas as pd
 import numpy as np
-import yaml
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
-
-PIXEL_TO_METER_SCALE = config['simulation']['pixel_to_meter_scale']
+from model.config import Config
+from model.streams import RandomStreams
 
 class Fire:
-    def __init__(self):
-        self.detect = Detect()
-        self.terrain = Terrain()
+    BATCH_MIN_SHOTS = 32  # 이보다 적은 사격 묶음은 NumPy 준비 비용이 더 커서 fire()로 차례로 처리
+
+    def __init__(self, config: Config = None, terrain: Terrain = None, detect: Detect = None,
+                 streams: Optional[RandomStreams] = None):
+        self.config = Config.from_any(config)
+        self.terrain = terrain or Terrain(config=self.config)
+        self.streams = streams or RandomStreams()  # 용도별 난수 흐름 (model/streams.py)
+        self.detect = detect or Detect(self.config, self.terrain, self.streams)
+        self.lethal_radius = self.config.lethal_radius / self.config.pixel_to_meter_scale  # 치사반경 (픽셀)
+        self.friendly_fire_radius = 30.0 / self.config.pixel_to_meter_scale  # 아군 피해 확인 반경 30m (픽셀)
+        self.target_indexes: Dict[int, TargetIndex] = {}  # 유닛 id별 사격 가능 표적 후보
 
     
 
-    def calculate_impact_point(self, target_position: Tuple[float, float], distance: float) -> Tuple[float, float]:
+    def calculate_impact_point(self, target_position: Tuple[float, float], distance: float,
+                               rng: Optional[random.Random] = None) -> Tuple[float, float]:
         """곡사화기의 탄착지점 계산
         
         Args:
             target_position: 목표 지점 좌표
             distance: 사거리 (픽셀단위)
+            rng: 사용할 난수 생성기 (기본값: random 모듈, 사격은 공격 유닛의 impact 난수 흐름, 시각화는 별도 생성기를 넘김)
             
         Returns:
             Tuple[float, float]: 탄착지점 좌표
@@ -38,8 +45,9 @@ class Fire:
         sigma_x = 0.01 * distance  # 편의 공산오차
         
         # 정규분포를 따르는 랜덤 오차 생성
-        error_x = random.gauss(0, sigma_x)
-        error_y = random.gauss(0, sigma_y)
+        rng = rng or random
+        error_x = rng.gauss(0, sigma_x)
+        error_y = rng.gauss(0, sigma_y)
         
         # 탄착지점 계산
         impact_x = target_position[0] + error_x
@@ -68,7 +76,7 @@ class Fire:
             all_units: 모든 유닛 리스트
             current_time: 현재 시뮬레이션 시간
         """
-        lethal_radius = config['simulation']['lethal_radius'] / PIXEL_TO_METER_SCALE
+        lethal_radius = self.lethal_radius
         affected_units = []
         
         # 치사반경 내의 모든 유닛에 대해 피해 적용
@@ -81,8 +89,9 @@ class Fire:
                     # 피해확률 계산
                     damage_prob = self.calculate_damage_probability(distance, lethal_radius)
                     
-                    # 피해 적용 여부 결정
-                    if random.random() <= damage_prob:
+                    # 피해 적용 여부 결정 (피격 유닛의 곡사화기 피해 전용 흐름: 그 유닛의 직사 사격 판정 흐름과 분리)
+                    damage_stream = self.streams.get('artillery_damage', unit.id)
+                    if damage_stream.random() <= damage_prob:
                         # 방호상태 확인
                         protection_state = self.get_protection_state(unit)
                         
@@ -92,15 +101,15 @@ class Fire:
                         if unit.unit_type in [UnitType.TANK, UnitType.ARTILLERY]:
                             m_kill_prob = kill_probs.get(Status.M_KILL, 0.0)
                             if unit.status == Status.ALIVE:
-                                rand_val = random.random()
+                                rand_val = damage_stream.random()
                             else:  # M_KILL 상태
-                                rand_val = random.uniform(m_kill_prob, 1.0)
+                                rand_val = damage_stream.uniform(m_kill_prob, 1.0)
                         else:  # RIFLE, ANTI_TANK, COMMAND_POST
                             minor_prob = kill_probs.get(Status.MINOR, 0.0)
                             if unit.status == Status.ALIVE:
-                                rand_val = random.random()
+                                rand_val = damage_stream.random()
                             else:
-                                rand_val = random.uniform(minor_prob, 1.0)
+                                rand_val = damage_stream.uniform(minor_prob, 1.0)
                         
                         cumulative = 0.0
                         old_status = unit.status
@@ -112,12 +121,12 @@ class Fire:
                                 break
 
     def update_eligible_targets(self, unit: Unit, all_units: List[Unit]) -> None:
-        """사격 가능한 타겟 목록 업데이트"""
-        unit.clear_eligible_targets()  # 기존 사격 가능 타겟 목록 초기화
+        """사격 가능한 타겟 목록과 표적 후보 색인(TargetIndex) 업데이트"""
+        eligible = []
         
         # target_list의 각 타겟에 대해 거리 확인
         for target_id in unit.target_list:
-            target = next((u for u in all_units if u.id == target_id), None)
+            target = find_unit(all_units, target_id)
             if target:
                 # 
                 if target.status in [Status.ALIVE, Status.M_KILL, Status.MINOR]:
@@ -129,10 +138,29 @@ class Fire:
                     if distance <= unit.weapon_range:
                         # 직사화기의 경우 LOS 체크
                         if unit.unit_type in [UnitType.RIFLE, UnitType.TANK, UnitType.ANTI_TANK, UnitType.COMMAND_POST]:
-                            if self.detect.check_los(unit, target):  # LOS가 확보된 경우에만 타겟 추가
-                                unit.add_eligible_target(target_id)
-                        else:  # 곡사화기(ARTILLERY)는 LOS 체크 없이 타겟 추가
-                            unit.add_eligible_target(target_id)
+                            if not self.detect.check_los(unit, target):  # LOS가 확보된 경우에만 타겟 추가
+                                continue
+                        # 곡사화기(ARTILLERY)는 LOS 체크 없이 타겟 추가
+                        eligible.append((target_id, target.unit_type, distance))
+        self.set_eligible_targets(unit, eligible)
+
+    def set_eligible_targets(self, unit: Unit, eligible: List[Tuple[int, UnitType, float]]) -> None:
+        """사격 가능한 타겟 목록과 표적 후보 색인을 eligible((표적 id, 유닛 타입, 거리) 목록)로 설정"""
+        unit.clear_eligible_targets()  # 기존 사격 가능 타겟 목록 초기화
+        unit.eligible_target_list.update(target_id for target_id, _, _ in eligible)
+        index = self.target_indexes.get(unit.id)
+        if index is None:
+            self.target_indexes[unit.id] = TargetIndex.from_candidates(eligible)
+        else:
+            index.update(eligible)  # 바뀐 표적만 추가/제거/거리 갱신
+
+    def rebuild_target_index(self, unit: Unit, all_units: List[Unit]) -> None:
+        """현재 사격 가능 타겟 목록으로 표적 후보 색인만 다시 생성 (체크포인트 복원 후 사용)"""
+        index = self.target_indexes[unit.id] = TargetIndex()
+        for target_id in unit.eligible_target_list:
+            target = find_unit(all_units, target_id)
+            if target:
+                index.add(target_id, target.unit_type, calculate_distance(unit, target))
 
     def get_protection_state(self, target: Unit) -> str:
         """타겟의 방호상태를 결정
@@ -154,42 +182,22 @@ class Fire:
             return "ES" if not is_moving else "EM"
 
     def finding_target(self, attacker: Unit, all_units: List[Unit], command: Command) -> Optional[int]:
-        """사격 가능한 표적 중에서 목표 선정"""
+        """사격 가능한 표적 중에서 목표 선정
+
+        - Artillery: command.fire_priority 값이 가장 낮은 유닛 타입의 표적 중 무작위 선택
+        - 그 외: 가장 가까운 표적 선택
+        update_eligible_targets에서 만든 표적 후보 색인을 사용한다.
+        """
         if not attacker.eligible_target_list:
             return None
-            
-        # Artillery는 command.fire_priority를 고려
+        index = self.target_indexes.get(attacker.id)
+        if index is None:
+            self.rebuild_target_index(attacker, all_units)
+            index = self.target_indexes[attacker.id]
+
         if attacker.unit_type == UnitType.ARTILLERY:
-            # 우선순위별로 표적 분류
-            priority_targets = {}
-            for target_id in attacker.eligible_target_list:
-                target = next((u for u in all_units if u.id == target_id), None)
-                if target:  
-                    priority = command.fire_priority.get(target.unit_type, 0)
-                    if priority not in priority_targets:
-                        priority_targets[priority] = []
-                    priority_targets[priority].append(target_id)
-            
-            # 가장 낮은 우선순위의 표적들 중에서 랜덤 선택
-            if priority_targets:
-                lowest_priority = min(priority_targets.keys())
-                return random.choice(priority_targets[lowest_priority])
-            return None
-        
-        # Artillery가 아닌 경우 거리가 가까운 표적 선정
-        else:
-            min_distance = float('inf')
-            selected_target = None
-            
-            for target_id in attacker.eligible_target_list:
-                target = next((u for u in all_units if u.id == target_id), None)
-                if target:  # eligible_target_list에는 이미 ALIVE와 M_KILL만 있음
-                    distance = calculate_distance(attacker, target)
-                    if distance < min_distance:
-                        min_distance = distance
-                        selected_target = target_id
-            
-            return selected_target
+            return index.priority_target(command.fire_priority, self.streams.get('target', attacker.id))
+        return index.nearest_target()
 
     def fire(self, attacker: Unit, target: Unit, all_units: List[Unit], command: Command, current_time: float) -> Optional[Event]:
         """유닛의 사격 처리"""
@@ -204,10 +212,10 @@ class Fire:
         # 곡사화기인 경우 다른 방식으로 처리
         if attacker.unit_type == UnitType.ARTILLERY:
             # 탄착지점 계산
-            impact_point = self.calculate_impact_point(target.position, distance)
+            impact_point = self.calculate_impact_point(target.position, distance, self.streams.get('impact', attacker.id))
             
             # 치사반경 내 아군 확인
-            lethal_radius = 30.0 / PIXEL_TO_METER_SCALE # 치사반경 30m
+            lethal_radius = self.friendly_fire_radius # 치사반경 30m
             friendly_units_in_radius = []
             
             for unit in all_units:
@@ -243,7 +251,7 @@ class Fire:
         protection_state = self.get_protection_state(target)
         hit_prob = ProbabilitySystem.get_hit_probability(attacker.unit_type, target.unit_type, distance, protection_state)
         
-        hit_success = random.random() <= hit_prob
+        hit_success = self.streams.get('hit', attacker.id).random() <= hit_prob
 
         # 4. 살상확률 계산 및 상태 결정
         if hit_success:
@@ -252,15 +260,15 @@ class Fire:
             if target.unit_type in [UnitType.TANK, UnitType.ARTILLERY]:
                 m_kill_prob = kill_probs.get(Status.M_KILL, 0.0)
                 if target.status == Status.ALIVE:
-                    rand_val = random.random()  # 0~1 범위
+                    rand_val = self.streams.get('kill', attacker.id).random()  # 0~1 범위
                 else:  # M_KILL 상태
-                    rand_val = random.uniform(m_kill_prob, 1.0)  # m_kill_prob~1 범위
+                    rand_val = self.streams.get('kill', attacker.id).uniform(m_kill_prob, 1.0)  # m_kill_prob~1 범위
             else:  # RIFLE, ANTI_TANK, COMMAND_POST
                 minor_prob = kill_probs.get(Status.MINOR, 0.0)
                 if target.status == Status.ALIVE:
-                    rand_val = random.random()  # 0~1 범위
+                    rand_val = self.streams.get('kill', attacker.id).random()  # 0~1 범위
                 else:
-                    rand_val = random.uniform(minor_prob, 1.0)  # minor_prob~1 범위
+                    rand_val = self.streams.get('kill', attacker.id).uniform(minor_prob, 1.0)  # minor_prob~1 범위
                 
             cumulative = 0.0
             old_status = target.status
@@ -273,17 +281,59 @@ class Fire:
         attacker.update_action(Action.STOP)  # 사격 완료 후 STOP으로 변경
         return None
 
+    def resolve_direct_fire(self, shots: List[Tuple[Unit, Unit]]) -> None:
+        """같은 틱에 연달아 처리할 직사화기 사격 (공격자, 표적) 묶음을 한 번에 처리
+
+        거리, 방호상태, 명중확률, 피해 상태별 확률은 묶음 전체에 대해 NumPy로 한 번에 구하고,
+        명중/피해 판정과 상태 변경은 사격 순서대로 적용한다. 앞선 사격으로 표적 상태가 바뀌면
+        뒤의 사격은 바뀐 상태로 판정하고, 난수도 사격마다 fire()와 같은 순서로 뽑으므로
+        fire()를 차례로 호출한 것과 결과가 같다. BATCH_MIN_SHOTS보다 작은 묶음은 fire()로 처리한다.
+        """
+        if len(shots) < self.BATCH_MIN_SHOTS:
+            for attacker, target in shots:
+                self.fire(attacker, target, [], None, 0.0)
+            return
+        attackers, targets = zip(*shots)
+        attacker_xy = np.array([attacker.position for attacker in attackers], dtype=float)
+        target_xy = np.array([target.position for target in targets], dtype=float)
+        distances = np.sqrt(((attacker_xy - target_xy) ** 2).sum(axis=1))
+        mountain = self.terrain.get_elevations(target_xy[:, 0], target_xy[:, 1]) >= self.terrain.MOUNTAIN_THRESHOLD
+        moving = [target.action == Action.MOVE for target in targets]
+        protection_states = [('DM' if is_moving else 'DS') if is_mountain else ('EM' if is_moving else 'ES')
+                             for is_mountain, is_moving in zip(mountain.tolist(), moving)]
+        hit_probs, kill_probs = ProbabilitySystem.batch_probabilities(
+            [target.unit_type for target in targets], distances, protection_states)
+        hit_probs = hit_probs.tolist()
+        cumulative_probs = np.cumsum(kill_probs, axis=1).tolist()  # 앞에서부터 차례로 더한 값 (fire()의 누적합과 같음)
+        low_probs = kill_probs[:, 0].tolist()  # 차량 M_KILL / 인원 MINOR 확률
+
+        for index, (attacker, target) in enumerate(shots):
+            if target.status not in [Status.ALIVE, Status.M_KILL, Status.MINOR]:
+                attacker.update_action(Action.STOP)
+                continue
+            if (target.action == Action.MOVE) != moving[index]:
+                # 앞선 사격으로 표적(이면서 공격자)의 행동이 바뀐 경우만 개별 처리
+                self.fire(attacker, target, [], None, 0.0)
+                continue
+            if self.streams.get('hit', attacker.id).random() <= hit_probs[index]:
+                kill_stream = self.streams.get('kill', attacker.id)
+                if target.status == Status.ALIVE:
+                    rand_val = kill_stream.random()
+                else:  # kill_stream.uniform(low, 1.0)과 같은 값
+                    rand_val = low_probs[index] + (1.0 - low_probs[index]) * kill_stream.random()
+                statuses = VEHICLE_KILL_STATUSES if target.unit_type in VEHICLE_TYPES else PERSONNEL_KILL_STATUSES
+                for status, cumulative in zip(statuses, cumulative_probs[index]):
+                    if rand_val <= cumulative:
+                        target.update_status(status)
+                        break
+            attacker.update_action(Action.STOP)
+
     def schedule_fire_event(self, unit: Unit, all_units: List[Unit], command: Command, current_time: float) -> Optional[Event]:
         """사격 이벤트 스케줄링"""
         if not unit.can_fire():
             return None
 
-        # 탐지 상태 업데이트
-        self.detect.update_detection(unit, all_units)
-        
-        # 사격 가능 타겟 목록 업데이트
-        self.update_eligible_targets(unit, all_units)
-        
+        # 탐지/사격 가능 타겟 목록은 이벤트 처리 후 갱신된 상태를 그대로 사용
         # 사격 가능한 타겟이 있는지 확인
         if not unit.eligible_target_list:
             return None
@@ -291,12 +341,13 @@ class Fire:
         # finding_target을 통해 목표 선정
         target_id = self.finding_target(unit, all_units, command)
         if target_id is not None:
-            target = next((u for u in all_units if u.id == target_id), None)
+            target = find_unit(all_units, target_id)
             if target:
                 unit.update_action(Action.FIRE)  # 사격 이벤트 생성 시 FIRE로 변경
+                unit.update_target(target_id)
                 return Event(
                     event_type=EventType.FIRE,
-                    time=current_time + unit.get_fire_interval(),
+                    time=current_time + unit.get_fire_interval(self.streams.get('fire_interval', unit.id)),
                     source_id=unit.id,
                     target_id=target_id
                 )
@@ -0,0 +1,111 @@
+import os
+import pickle
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from model.unit import Team
+from model.command import Phase
+from model.probabilities import ProbabilitySystem
+from model.termination import SimulationResult
+
+
+@dataclass
+class Branch:
+    """현재 시점에서 갈라져 나가는 what-if 실행 하나
+
+    - seed: 분기 시점 이후의 난수 시드
+    - force_phase: 분기 직후 팀별로 강제할 작전단계 (예: {Team.RED: Phase.CLOSE_COMBAT})
+    - apply: 분기 직후 시뮬레이션에 적용할 임의의 변경 (fork 사용 시 pickle 가능할 필요 없음)
+    """
+    seed: Optional[int] = None
+    force_phase: Dict[Team, Phase] = field(default_factory=dict)
+    apply: Optional[Callable[[Any], None]] = None
+
+
+def _run_branch(simulation, branch: Branch, max_time: Optional[float]) -> SimulationResult:
+    """분기 설정을 적용하고 시뮬레이션을 끝까지 실행"""
+    simulation.reseed(branch.seed)
+    for team, phase in branch.force_phase.items():
+        simulation.commands[team].force_phase(phase)
+    if branch.apply:
+        branch.apply(simulation)
+    return simulation.run_simulation(max_time, hold_window=False)
+
+
+def _detach_outputs(simulation) -> dict:
+    """분기 실행 중에는 화면/비디오/스냅샷 기록을 하지 않도록 분리"""
+    detached = {'visualizer': simulation.visualizer, 'record_video': simulation.record_video,
+                'recorder': simulation.recorder, 'verbose': simulation.verbose}
+    simulation.visualizer = None
+    simulation.record_video = False
+    simulation.recorder = None
+    simulation.verbose = False
+    return detached
+
+
+def _run_child(simulation, branch: Branch, max_time: Optional[float], write_fd: int) -> None:
+    """fork된 자식 프로세스: 분기를 실행하고 결과를 파이프로 보낸 뒤 즉시 종료"""
+    try:
+        _detach_outputs(simulation)
+        payload = pickle.dumps((True, _run_branch(simulation, branch, max_time)))
+    except BaseException:
+        payload = pickle.dumps((False, traceback.format_exc()))
+    with os.fdopen(write_fd, 'wb') as pipe:
+        pipe.write(payload)
+    os._exit(0)  # 부모의 atexit 처리(pygame 종료 등)를 실행하지 않음
+
+
+def _collect_child(pid: int, read_fd: int) -> SimulationResult:
+    """자식 프로세스의 결과를 읽고 종료를 기다림"""
+    with os.fdopen(read_fd, 'rb') as pipe:
+        payload = pipe.read()
+    os.waitpid(pid, 0)
+    if not payload:
+        raise RuntimeError(f"Branch process {pid} exited without a result")
+    ok, value = pickle.loads(payload)
+    if not ok:
+        raise RuntimeError(f"Branch process {pid} failed:\n{value}")
+    return value
+
+
+def run_forked(simulation, branches: List[Branch], max_time: Optional[float] = None,
+               workers: Optional[int] = None) -> List[SimulationResult]:
+    """os.fork로 분기마다 자식 프로세스를 만들어 병렬 실행
+
+    자식은 부모 메모리를 copy-on-write로 공유하므로 지형, DEM, 확률표를 복사하지 않는다.
+    동시에 실행하는 자식 수는 workers(기본값: CPU 수)로 제한한다.
+    """
+    ProbabilitySystem.preload()  # 자식마다 따로 읽지 않도록 fork 전에 로드
+    workers = max(1, workers or os.cpu_count() or 1)
+    results: List[Optional[SimulationResult]] = [None] * len(branches)
+    running = []  # (분기 번호, pid, 읽기 fd)
+    for index, branch in enumerate(branches):
+        if len(running) >= workers:
+            done_index, pid, read_fd = running.pop(0)
+            results[done_index] = _collect_child(pid, read_fd)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _run_child(simulation, branch, max_time, write_fd)
+        os.close(write_fd)
+        running.append((index, pid, read_fd))
+    for done_index, pid, read_fd in running:
+        results[done_index] = _collect_child(pid, read_fd)
+    return results
+
+
+def run_serial(simulation, branches: List[Branch], max_time: Optional[float] = None) -> List[SimulationResult]:
+    """os.fork를 쓸 수 없을 때: 스냅샷을 복원하며 분기를 차례로 실행하고 마지막에 분기 시점 상태로 되돌림"""
+    state = simulation.snapshot()
+    detached = _detach_outputs(simulation)
+    results = []
+    try:
+        for branch in branches:
+            simulation.restore(state)
+            results.append(_run_branch(simulation, branch, max_time))
+    finally:
+        simulation.restore(state)
+        for name, value in detached.items():
+            setattr(simulation, name, value)
+    return results
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 from typing import Tuple, Union, List
 from model.unit import Unit
 
@@ -34,3 +35,19 @@ def calculate_point_distance(point1: Tuple[float, float], point2: Tuple[float, f
         (point1[0] - point2[0]) ** 2 +
         (point1[1] - point2[1]) ** 2
     )
+
+def calculate_distances(point: Tuple[float, float], xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Calculate the distances from a point to many points in pixels.
+
+    Matches calculate_distance exactly: np.float_power uses the same C pow as Python's ** operator.
+
+    Args:
+        point: Point coordinates (x, y)
+        xs: X coordinates of the other points
+        ys: Y coordinates of the other points
+
+    Returns:
+        np.ndarray: Distances in pixels
+    """
+    return np.sqrt(np.float_power(point[0] - np.asarray(xs, dtype=float), 2) +
+                   np.float_power(point[1] - np.asarray(ys, dtype=float), 2))
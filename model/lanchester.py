@@ -0,0 +1,297 @@
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+from model.config import Config
+from model.unit import Team, UnitType, Status, mean_fire_interval
+from model.command import Command, parse_command_plan
+from model.probabilities import ProbabilitySystem
+from model.scenario import Scenario
+
+# 집계 모델의 그룹 (팀, 유닛 타입) - 드론은 사격하지 않고 탐지되지 않으므로 제외
+GROUP_TYPES = [UnitType.RIFLE, UnitType.ANTI_TANK, UnitType.TANK, UnitType.ARTILLERY, UnitType.COMMAND_POST]
+GROUPS = [(team, unit_type) for team in [Team.RED, Team.BLUE] for unit_type in GROUP_TYPES]
+GROUP_INDEX = {group: index for index, group in enumerate(GROUPS)}
+ARTILLERY_ROWS = np.array([unit_type == UnitType.ARTILLERY for _, unit_type in GROUPS])
+
+# 사격 불가(무력화) 상태 - Unit.can_fire()가 False인 상태
+NEUTRALIZED_STATUSES = {
+    'vehicle': [Status.F_KILL, Status.MF_KILL, Status.K_KILL],  # TANK, ARTILLERY
+    'personnel': [Status.SERIOUS, Status.CRITICAL, Status.FATAL],  # RIFLE, ANTI_TANK, COMMAND_POST
+}
+PRIORITY_BASE = 10.0  # 포병 표적 배분 가중치 PRIORITY_BASE ** -우선순위 (우선순위가 높은 표적에 거의 전부 배분)
+
+
+FIRE_CLASSES = ['direct', 'artillery']  # rate_scale 보정 단위 (팀별 직사화기 / 포병)
+SCALE_KEYS = [(team, fire_class) for team in [Team.RED, Team.BLUE] for fire_class in FIRE_CLASSES]
+GROUP_SCALE_INDEX = np.array([SCALE_KEYS.index((team, 'artillery' if unit_type == UnitType.ARTILLERY else 'direct'))
+                              for team, unit_type in GROUPS])
+
+# 집계 모델이 읽는 설정 경로 (이 경로와 그 하위 경로, num_* 유닛 수 외의 설정은 결과에 영향이 없음)
+AGGREGATE_CONFIG_PATHS = ('simulation.pixel_to_meter_scale', 'simulation.lethal_radius', 'lanchester',
+                          'scenario_file', 'initial_positions', 'commands')
+
+
+def ignored_config_paths(paths: Sequence[str]) -> list:
+    """집계 모델이 읽지 않는 설정 경로 (탐지/지형/유닛 특성 등은 rate_scale 보정으로만 반영됨)"""
+    return [path for path in paths
+            if not path.startswith('num_')
+            and not any(path == used or path.startswith(used + '.') for used in AGGREGATE_CONFIG_PATHS)]
+
+
+@dataclass
+class LanchesterSettings:
+    """집계 모델 설정 (config.yaml의 lanchester 항목)
+
+    - engagement_range / artillery_range: 직사화기 / 포병의 대표 교전 거리 (미터)
+    - protection_state: 표적의 대표 방호상태 (ES, EM, DS, DM)
+    - dt: 적분 시간 간격 (초)
+    - rate_scale: 팀별 {direct, artillery} 사격률 보정 계수 (calibrate()로 추정, 탐지/LOS/기동 효과를 흡수)
+    """
+    engagement_range: float = 500.0
+    artillery_range: float = 5000.0
+    protection_state: str = 'ES'
+    dt: float = 5.0
+    rate_scale: Dict[Team, Dict[str, float]] = field(
+        default_factory=lambda: {team: {fire_class: 1.0 for fire_class in FIRE_CLASSES} for team in [Team.RED, Team.BLUE]})
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'LanchesterSettings':
+        """config.yaml의 lanchester 항목으로부터 생성 (rate_scale은 팀별 숫자 또는 {direct, artillery})"""
+        config = config or {}
+        settings = cls(
+            engagement_range=config.get('engagement_range', 500.0),
+            artillery_range=config.get('artillery_range', 5000.0),
+            protection_state=config.get('protection_state', 'ES'),
+            dt=config.get('dt', 5.0)
+        )
+        for team_name, scale in (config.get('rate_scale') or {}).items():
+            if isinstance(scale, dict):
+                settings.rate_scale[Team(team_name)].update(scale)
+            else:
+                settings.rate_scale[Team(team_name)] = {fire_class: scale for fire_class in FIRE_CLASSES}
+        return settings
+
+    def scale_vector(self) -> np.ndarray:
+        """SCALE_KEYS 순서의 보정 계수 벡터"""
+        return np.array([self.rate_scale[team][fire_class] for team, fire_class in SCALE_KEYS], dtype=float)
+
+
+def initial_counts(config: Config) -> np.ndarray:
+    """그룹별 초기 유닛 수 (Simulation._load_initial_units와 같은 시나리오 기준)"""
+    scenario_file = config.get('scenario_file')
+    scenario = Scenario.load(scenario_file) if scenario_file else Scenario.from_config(config)
+    counts = np.zeros(len(GROUPS))
+    for group, count in scenario.counts().items():
+        if group in GROUP_INDEX:
+            counts[GROUP_INDEX[group]] = count
+    return counts
+
+
+def neutralize_probability(kill_probs: Dict[Status, float], target_type: UnitType) -> float:
+    """명중(피해) 시 표적이 사격 불가 상태가 될 확률 (정상 상태 표적 기준)"""
+    kind = 'vehicle' if target_type in [UnitType.TANK, UnitType.ARTILLERY] else 'personnel'
+    return float(sum(kill_probs.get(status, 0.0) for status in NEUTRALIZED_STATUSES[kind]))
+
+
+def artillery_damage_probability(config: Config, distance: float) -> float:
+    """포병 1발이 조준한 표적에 피해를 줄 기댓값
+
+    Fire.calculate_impact_point의 공산오차(사거리 2%, 편의 1%)와 가우시안 피해함수를
+    결합한 값으로, 치사반경 밖 절단은 무시한다: Π L / sqrt(L² + σ²)
+    """
+    lethal_radius = config.lethal_radius / config.pixel_to_meter_scale
+    distance = distance / config.pixel_to_meter_scale
+    sigmas = [0.01 * distance, 0.02 * distance]
+    return float(np.prod([lethal_radius / math.sqrt(lethal_radius ** 2 + sigma ** 2) for sigma in sigmas]))
+
+
+@lru_cache(maxsize=None)
+def _base_rate_matrix(engagement_range: float, artillery_range: float, protection_state: str,
+                      pixel_to_meter_scale: float, lethal_radius: float) -> np.ndarray:
+    """보정 전 무력화 비율 행렬 (교전 조건별로 한 번만 계산, 읽기 전용)"""
+    config = Config({'simulation': {'pixel_to_meter_scale': pixel_to_meter_scale, 'lethal_radius': lethal_radius}})
+    rates = np.zeros((len(GROUPS), len(GROUPS)))
+    for (team, shooter), i in GROUP_INDEX.items():
+        rate_of_fire = 1.0 / mean_fire_interval(shooter)
+        for (target_team, target), j in GROUP_INDEX.items():
+            if target_team == team:
+                continue
+            if shooter == UnitType.ARTILLERY:
+                hit_prob = artillery_damage_probability(config, artillery_range)
+                kill_probs = ProbabilitySystem.get_kill_probability(shooter, target, 0.0, protection_state)
+            elif shooter == UnitType.RIFLE and target == UnitType.TANK:
+                continue  # Rifle은 전차를 공격할 수 없음
+            else:
+                distance = engagement_range / pixel_to_meter_scale
+                hit_prob = ProbabilitySystem.get_hit_probability(shooter, target, distance, protection_state)
+                kill_probs = ProbabilitySystem.get_kill_probability(shooter, target, distance, protection_state)
+            rates[i, j] = rate_of_fire * hit_prob * neutralize_probability(kill_probs, target)
+    rates.setflags(write=False)
+    return rates
+
+
+def kill_rate_matrix(config: Config, settings: LanchesterSettings) -> np.ndarray:
+    """사격 그룹 i의 유닛 1개가 표적 그룹 j를 초당 무력화하는 비율 K[i, j]
+
+    ProbabilitySystem의 명중/살상확률과 평균 사격 소요시간(Unit.get_fire_interval의 기댓값)으로 계산하고
+    rate_scale로 보정한다. 거리는 엔티티 모델과 같이 픽셀 단위로 확률표에 전달한다.
+    """
+    base = _base_rate_matrix(settings.engagement_range, settings.artillery_range, settings.protection_state,
+                             config.pixel_to_meter_scale, config.lethal_radius)
+    return base * settings.scale_vector()[GROUP_SCALE_INDEX][:, None]
+
+
+def priority_weights(config: Config) -> np.ndarray:
+    """표적 배분 가중치 W[i, j]
+
+    포병은 지휘 명령(Deep_fires 단계)의 fire_priority 순서로, 직사화기는 표적 수에 비례하여 배분한다.
+    """
+    weights = np.ones((len(GROUPS), len(GROUPS)))
+    command_plans = config.get('commands') or {}
+    for team in [Team.RED, Team.BLUE]:
+        command = Command.create_phase_1_command(team).apply_plan(parse_command_plan(command_plans.get(team.value)))
+        i = GROUP_INDEX[(team, UnitType.ARTILLERY)]
+        for (target_team, target), j in GROUP_INDEX.items():
+            if target_team != team:
+                weights[i, j] = PRIORITY_BASE ** -command.fire_priority.get(target, 0)
+    return weights
+
+
+@dataclass
+class LanchesterResult:
+    """집계 모델 적분 결과"""
+    times: np.ndarray  # [시간]
+    counts: np.ndarray  # [배치, 시간, 그룹]
+
+    def final_counts(self) -> np.ndarray:
+        return self.counts[:, -1, :]
+
+    def strength(self, initial: np.ndarray) -> Dict[Team, np.ndarray]:
+        """팀별 전투력 비율 (사격 가능 유닛 / 초기 유닛, 드론 제외)"""
+        final = self.final_counts()
+        result = {}
+        for team in [Team.RED, Team.BLUE]:
+            columns = [GROUP_INDEX[(team, unit_type)] for unit_type in GROUP_TYPES]
+            result[team] = final[:, columns].sum(axis=1) / np.maximum(initial[:, columns].sum(axis=1), 1.0)
+        return result
+
+    def surviving(self, batch_index: int = 0) -> Dict[Team, Dict[UnitType, float]]:
+        """팀/유닛 타입별 최종 사격 가능 유닛 수 (SimulationResult.surviving과 같은 형태, 드론 제외)"""
+        final = self.final_counts()[batch_index]
+        return {team: {unit_type: float(final[GROUP_INDEX[(team, unit_type)]]) for unit_type in GROUP_TYPES}
+                for team in [Team.RED, Team.BLUE]}
+
+
+class LanchesterModel:
+    """팀/유닛 타입 그룹 단위의 Lanchester 소모 모델 (여러 설정을 배치로 묶어 한 번에 적분)
+
+    사격 그룹 i는 살아있는 표적 그룹 j에 배분 가중치에 비례하여 사격하고, 표적 그룹의 감소율은
+    dx_j/dt = -Σ_i x_i K_ij 배분_ij 이다. 직사화기는 표적 수에 비례하여, 포병은 fire_priority 순서로
+    (가중치 W_ij * min(x_j, 1)) 배분한다.
+    엔티티 모델 대비 탐지/LOS/기동을 생략하므로 rate_scale로 보정하여 사용한다 (calibrate 참고).
+    """
+
+    def __init__(self, initial: np.ndarray, rates: np.ndarray, weights: np.ndarray, dt: float = 5.0):
+        self.initial = np.atleast_2d(initial).astype(float)
+        self.rates = rates if rates.ndim == 3 else rates[None]
+        weights = weights if weights.ndim == 3 else weights[None]
+        feasible = self.rates > 0
+        self.direct_weights = np.where(feasible & ~ARTILLERY_ROWS[None, :, None], weights, 0.0)
+        self.artillery_weights = np.where(feasible & ARTILLERY_ROWS[None, :, None], weights, 0.0)
+        self.dt = dt
+
+    @classmethod
+    def from_configs(cls, configs: Sequence[Union[str, dict, Config]],
+                     settings: Optional[LanchesterSettings] = None) -> 'LanchesterModel':
+        """설정 목록으로부터 배치 모델 생성 (settings를 주지 않으면 각 설정의 lanchester 항목 사용)"""
+        configs = [Config.from_any(config) for config in configs]
+        initial, rates, weights = [], [], []
+        for config in configs:
+            config_settings = settings or LanchesterSettings.from_config(config.get('lanchester'))
+            initial.append(initial_counts(config))
+            rates.append(kill_rate_matrix(config, config_settings))
+            weights.append(priority_weights(config))
+        dt = (settings or LanchesterSettings.from_config(configs[0].get('lanchester'))).dt
+        return cls(np.array(initial), np.array(rates), np.array(weights), dt)
+
+    def derivative(self, x: np.ndarray) -> np.ndarray:
+        """dx/dt (x: [배치, 그룹])"""
+        shares = self.direct_weights * x[:, None, :] + self.artillery_weights * np.minimum(x, 1.0)[:, None, :]
+        total = shares.sum(axis=2, keepdims=True)
+        allocation = np.divide(shares, total, out=np.zeros_like(shares), where=total > 0)
+        return -(x[:, :, None] * self.rates * allocation).sum(axis=1)
+
+    def integrate(self, end_time: float) -> LanchesterResult:
+        """RK4로 0 ~ end_time 적분 (유닛 수는 0 이상으로 제한)"""
+        steps = max(1, int(math.ceil(end_time / self.dt)))
+        dt = end_time / steps
+        x = self.initial.copy()
+        history = np.empty((x.shape[0], steps + 1, x.shape[1]))
+        history[:, 0] = x
+        derivative = self.derivative
+        for step in range(1, steps + 1):
+            k1 = derivative(x)
+            k2 = derivative(np.maximum(x + 0.5 * dt * k1, 0.0))
+            k3 = derivative(np.maximum(x + 0.5 * dt * k2, 0.0))
+            k4 = derivative(np.maximum(x + dt * k3, 0.0))
+            x = np.maximum(x + dt / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4), 0.0)
+            history[:, step] = x
+        return LanchesterResult(np.linspace(0.0, end_time, steps + 1), history)
+
+
+def observed_counts(summary) -> np.ndarray:
+    """runner.CellSummary의 평균 생존 유닛 수를 그룹 벡터로 변환"""
+    counts = np.zeros(len(GROUPS))
+    for (team, unit_type), index in GROUP_INDEX.items():
+        counts[index] = summary.mean_surviving[team][unit_type]
+    return counts
+
+
+def calibrate(config: Union[str, dict, Config], observed: np.ndarray, end_time: float,
+              settings: Optional[LanchesterSettings] = None,
+              iterations: int = 100) -> Tuple[Dict[Team, Dict[str, float]], float]:
+    """엔티티 모델 반복 실행의 평균 생존 유닛 수(observed)에 맞도록 rate_scale 추정
+
+    공통 계수 격자에서 시작점을 고른 뒤 log(rate_scale) 공간에서 좌표 탐색으로 최종 유닛 수의 제곱오차를 최소화한다.
+    반복마다 모든 좌표의 ± 후보를 배치로 묶어 한 번에 적분한다.
+    반환값: (팀별 {direct, artillery} rate_scale, 제곱오차 합)
+    """
+    config = Config.from_any(config)
+    settings = settings or LanchesterSettings.from_config(config.get('lanchester'))
+    initial = initial_counts(config)
+    weights = priority_weights(config)
+    base_rates = kill_rate_matrix(config, LanchesterSettings(settings.engagement_range, settings.artillery_range,
+                                                            settings.protection_state, settings.dt))
+
+    def errors(candidates: np.ndarray) -> np.ndarray:
+        """log(rate_scale) 후보 [후보, SCALE_KEYS]의 제곱오차"""
+        rates = base_rates[None] * np.exp(candidates)[:, GROUP_SCALE_INDEX, None]
+        count = len(candidates)
+        model = LanchesterModel(np.repeat(initial[None], count, axis=0), rates,
+                                np.repeat(weights[None], count, axis=0), settings.dt)
+        final = model.integrate(end_time).final_counts()
+        return ((final - observed[None]) ** 2).sum(axis=1)
+
+    # 시작점: 현재 rate_scale과 공통 계수 격자(1e-4 ~ 10) 중 오차가 가장 작은 값
+    starts = np.concatenate([np.log(settings.scale_vector())[None],
+                             np.repeat(np.linspace(np.log(1e-4), np.log(10.0), 21)[:, None], len(SCALE_KEYS), axis=1)])
+    start_errors = errors(starts)
+    best, best_error = starts[int(np.argmin(start_errors))], float(np.min(start_errors))
+    directions = np.concatenate([np.eye(len(SCALE_KEYS)), -np.eye(len(SCALE_KEYS))])
+    step = 1.0
+    for _ in range(iterations):
+        candidates = best[None] + step * directions
+        candidate_errors = errors(candidates)
+        index = int(np.argmin(candidate_errors))
+        if candidate_errors[index] < best_error:
+            best, best_error = candidates[index], candidate_errors[index]
+        else:
+            step /= 2
+            if step < 1e-3:
+                break
+    rate_scale = {team: {} for team in [Team.RED, Team.BLUE]}
+    for (team, fire_class), value in zip(SCALE_KEYS, np.exp(best)):
+        rate_scale[team][fire_class] = float(value)
+    return rate_scale, float(best_error)
@@ -1,31 +1,50 @@
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from model.unit import Unit, Status, Team, Action, UnitType
 from model.event import Event, EventType
 from model.command import Command
 from model.terrain import Terrain
 from model.detect import Detect
-from model.function import calculate_distance, calculate_point_distance
-import random
+from model.function import calculate_point_distance
+from model.pathfinding import PathPlanningSettings, load_cost_field
+from model.streams import RandomStreams
 import math
-import yaml 
+from dataclasses import dataclass
+from model.config import Config
 
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
 
-PIXEL_TO_METER_SCALE = config['simulation']['pixel_to_meter_scale']
+@dataclass(frozen=True)
+class Trajectory:
+    """유닛의 현재 이동 구간 (start_time에 start에서 출발하여 end_time까지 등속 직선 이동)
+
+    위치는 position_at으로 필요할 때 계산하고, 구간 끝에서만 MOVE 이벤트를 처리한다.
+    - goal: 유닛의 목표 지점 (지상 유닛은 오차 포함)
+    - key: 목표 변경 감지용 기준 지점 (maneuver_objective 또는 드론 방안 중심)
+    - moving: 진행 중인 구간이면 True (멈췄거나 도착했으면 False)
+    - arrived: 목표에 도착하여 멈춤
+    """
+    start: Tuple[float, float]
+    velocity: Tuple[float, float]
+    start_time: float
+    end_time: float
+    goal: Optional[Tuple[float, float]]
+    key: Optional[Tuple[float, float]]
+    moving: bool = True
+    arrived: bool = False
+
+    @classmethod
+    def stationary(cls, position: Tuple[float, float], current_time: float, goal, key,
+                   moving: bool = False, arrived: bool = False) -> 'Trajectory':
+        """제자리 구간 (moving=True면 속도 0으로 이동 중인 유닛)"""
+        return cls(position, (0.0, 0.0), current_time, math.inf, goal, key, moving, arrived)
+
+    def position_at(self, time: float) -> Tuple[float, float]:
+        """time의 위치 (구간 밖의 시간은 구간 시작/끝 위치)"""
+        elapsed = min(max(time, self.start_time), self.end_time) - self.start_time
+        if elapsed == 0:
+            return self.start
+        return (self.start[0] + self.velocity[0] * elapsed, self.start[1] + self.velocity[1] * elapsed)
 
 class Movement:
-    # 상수 정의
-    MIN_DISTANCE_TO_OBJECTIVE = 50.0 / PIXEL_TO_METER_SCALE  # 목표 지점에 도달했다고 판단하는 최소 거리 (미터를 픽셀로 변환)
-    UNIT_SPEEDS = {  # 유닛 타입별 이동 속도 (픽셀/초)
-        UnitType.RIFLE: 7/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
-        UnitType.ANTI_TANK: 5/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
-        UnitType.TANK: 13/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
-        UnitType.ARTILLERY: 0 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
-        UnitType.DRONE: 25/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
-        UnitType.COMMAND_POST: 5/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30
-    }
-     
     # 드론 탐지 패턴 정의
     DRONE_PATTERN = [
         (1, 1), (1, 2), (1, 3),
@@ -33,13 +52,30 @@ class Movement:
         (3, 1), (3, 2), (3, 3)
     ]
     DRONE_OBJECTIVE_CHANGE_TIME = 60.0  # 목표 지점 변경 주기 (초)
-    DRONE_GRID_SIZE = 250 / PIXEL_TO_METER_SCALE  # 방안의 크기 (미터를 픽셀로 변환)
 
-    def __init__(self):
-        self.terrain = Terrain()
-        self.detect = Detect()
+    def __init__(self, config: Config = None, terrain: Terrain = None, detect: Detect = None,
+                 streams: Optional[RandomStreams] = None):
+        self.config = Config.from_any(config)
+        self.terrain = terrain or Terrain(config=self.config)
+        self.streams = streams or RandomStreams()  # 용도별 난수 흐름 (model/streams.py)
+        self.detect = detect or Detect(self.config, self.terrain, self.streams)
         self.drone_positions = {}  # 드론의 현재 탐지 패턴 위치 저장
         self.drone_last_objective_change = {}  # 드론의 마지막 목표 지점 변경 시간 저장
+        self.trajectories: Dict[int, Trajectory] = {}  # 유닛 id -> 현재 이동 구간
+
+        # 상수 정의 (픽셀 단위이므로 설정의 pixel_to_meter_scale에 따라 결정)
+        PIXEL_TO_METER_SCALE = self.config.pixel_to_meter_scale
+        self.MIN_DISTANCE_TO_OBJECTIVE = 50.0 / PIXEL_TO_METER_SCALE  # 목표 지점에 도달했다고 판단하는 최소 거리 (미터를 픽셀로 변환)
+        self.UNIT_SPEEDS = {  # 유닛 타입별 이동 속도 (픽셀/초)
+            UnitType.RIFLE: 7/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
+            UnitType.ANTI_TANK: 5/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
+            UnitType.TANK: 13/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
+            UnitType.ARTILLERY: 0 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
+            UnitType.DRONE: 25/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30,
+            UnitType.COMMAND_POST: 5/5 * 1000/3600 /PIXEL_TO_METER_SCALE * 30
+        }
+        self.DRONE_GRID_SIZE = 250 / PIXEL_TO_METER_SCALE  # 방안의 크기 (미터를 픽셀로 변환)
+        self.path_planning = PathPlanningSettings.from_config(self.config.get('path_planning'))
 
     def get_unit_speed(self, unit: Unit, position: Tuple[float, float]) -> float:
         """유닛의 이동 속도 반환 (지형 영향 포함)"""
@@ -103,84 +139,156 @@ class Movement:
                 base_objective = command.maneuver_objective[0]
                 # 2차원 좌표에 랜덤 오차를 한 번에 더함
                 # 목적지가 다 겹칠 수 있으니, -100~+100 uniform dist 적용해서 더해서 좀 흐트러지게 설정.
-                return tuple(x + random.uniform(-100, 100) for x in base_objective)
+                rng = self.streams.get('objective', unit.id)
+                return tuple(x + rng.uniform(-100, 100) for x in base_objective)
         return None
 
+    def get_waypoint(self, unit: Unit, command: Command) -> Optional[Tuple[float, float]]:
+        """경로 계획 사용 시 maneuver_objective 비용장을 따라 향할 경유점 (직진할 경우 None)
+
+        같은 maneuver_objective를 가진 유닛들은 비용장 하나를 공유한다.
+        목표까지 남은 비용이 final_approach 이하이면 각자의 목표 지점으로 직진한다.
+        """
+        if not self.path_planning.enabled or unit.unit_type == UnitType.DRONE or not command.maneuver_objective:
+            return None
+        field = load_cost_field(self.terrain, command.maneuver_objective[0], self.path_planning)
+        if field.cost_to_go(unit.position) <= self.path_planning.final_approach:
+            return None
+        return field.waypoint(unit.position)
+
+    def advance(self, units, current_time: float) -> None:
+        """이동 중인 유닛의 위치를 현재 시간의 궤적 위치로 갱신 (틱마다 한 번)"""
+        for unit_id, trajectory in self.trajectories.items():
+            if trajectory.moving:
+                unit = units.find(unit_id)
+                if unit is not None:
+                    unit.update_position(trajectory.position_at(current_time))
+
+    def halt(self, unit: Unit, current_time: float) -> bool:
+        """진행 중인 구간을 current_time 위치에서 멈춤 (목표는 유지하여 다음 move에서 이어서 이동)
+
+        멈춘 구간이 있었으면 True (호출하는 쪽에서 대기 중인 MOVE 이벤트를 취소)
+        """
+        trajectory = self.trajectories.get(unit.id)
+        if trajectory is None or not trajectory.moving:
+            return False
+        position = trajectory.position_at(current_time)
+        unit.update_position(position)
+        self.trajectories[unit.id] = Trajectory.stationary(position, current_time, trajectory.goal, trajectory.key)
+        return True
+
+    def _objective_key(self, unit: Unit, command: Command, current_time: float) -> Optional[Tuple[float, float]]:
+        """목표 변경 감지용 기준 지점 (지상 유닛은 maneuver_objective, 드론은 현재 방안 중심)"""
+        if unit.unit_type == UnitType.DRONE:
+            return self.calculate_drone_objective(unit, command, current_time)
+        if unit.unit_type in [UnitType.RIFLE, UnitType.TANK, UnitType.ANTI_TANK, UnitType.COMMAND_POST]:
+            if command.maneuver_objective and len(command.maneuver_objective) > 0:
+                return tuple(command.maneuver_objective[0])
+        return None
+
+    def _next_drone_objective(self, unit: Unit, command: Command, current_time: float) -> Optional[Tuple[float, float]]:
+        """드론이 방안에 도착하면 바로 다음 패턴 방안으로 목표 변경"""
+        current_pattern = self.drone_positions.get(unit.id, 0)
+        self.drone_positions[unit.id] = (current_pattern + 1) % len(self.DRONE_PATTERN)
+        self.drone_last_objective_change[unit.id] = current_time
+        return self.calculate_drone_objective(unit, command, current_time)
+
+    def _plan(self, unit: Unit, command: Command, goal: Tuple[float, float], key: Tuple[float, float],
+              current_time: float) -> Optional[Event]:
+        """unit.position에서 goal을 향한 다음 구간 계획, 구간 끝의 MOVE 이벤트 반환
+
+        구간은 목표 도착, 지형 감소율이 바뀌는 경계, 경로 계획 경유점 중 가장 가까운 곳에서 끝나며
+        구간 안에서는 속도가 일정하다. 목표에 도착했으면 멈추고 None.
+        """
+        if calculate_point_distance(unit.position, goal) < self.MIN_DISTANCE_TO_OBJECTIVE:
+            if unit.unit_type != UnitType.DRONE:
+                self.trajectories[unit.id] = Trajectory.stationary(unit.position, current_time, goal, key, arrived=True)
+                unit.update_action(Action.STOP)
+                unit.update_objective(None)
+                return None
+            # 드론은 다음 패턴 방안으로 바로 이동
+            goal = key = self._next_drone_objective(unit, command, current_time)
+            if goal is None or calculate_point_distance(unit.position, goal) < self.MIN_DISTANCE_TO_OBJECTIVE:
+                self.trajectories[unit.id] = Trajectory.stationary(unit.position, current_time, goal, key)
+                return None
+
+        unit.update_objective(goal)
+        unit.update_action(Action.MOVE)
+
+        # 경로 계획: 목표 대신 비용장의 경유점 방향으로 이동
+        aim = self.get_waypoint(unit, command) or goal
+        dx = aim[0] - unit.position[0]
+        dy = aim[1] - unit.position[1]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            aim, dx, dy = goal, goal[0] - unit.position[0], goal[1] - unit.position[1]
+            length = math.hypot(dx, dy)
+        direction = (dx / length, dy / length)
+
+        # 다음 지형 경계까지 같은 속도로 이동
+        decay_rate, length = self.terrain.next_decay_change(unit, unit.position, direction, length)
+        speed = self.UNIT_SPEEDS.get(unit.unit_type, 0.0) * decay_rate
+        if speed <= 0:
+            self.trajectories[unit.id] = Trajectory.stationary(unit.position, current_time, goal, key, moving=True)
+            return None
+        trajectory = Trajectory(unit.position, (direction[0] * speed, direction[1] * speed), current_time,
+                                current_time + length / speed, goal, key)
+        self.trajectories[unit.id] = trajectory
+        return Event(
+            event_type=EventType.MOVE,
+            time=trajectory.end_time,
+            source_id=unit.id,
+            position=trajectory.position_at(trajectory.end_time)
+        )
+
     def move(self, unit: Unit, command: Command, current_time: float, all_units: List[Unit]) -> Optional[Event]:
-        """유닛 이동 실행
-        1. objective 방향으로 1초 후의 new position 계산
-        3. FEL에 move event 예약 (1초 후 new position으로 이동)
-        3. action을 move로 변경
+        """유닛 이동 계획 (틱마다 호출)
+
+        1. 목표(maneuver_objective / 드론 방안)가 그대로이고 진행 중인 구간이 있으면 아무것도 하지 않음 (None)
+        2. 목표가 바뀌었으면 새 목표 지점을 정하고, 멈춰 있던 유닛은 기존 목표로 다음 구간을 계획
+        3. 구간 끝(도착, 지형 경계, 경유점)에 MOVE 이벤트를 예약하도록 반환하고 action을 MOVE로 변경
         """
         if not self.can_move(unit):
+            self.halt(unit, current_time)
             unit.update_action(Action.STOP)
             return None
 
-        # 목표 지점 가져오기
-        objective = self.get_objective(unit, command, current_time)
-        if not objective:
+        key = self._objective_key(unit, command, current_time)
+        if not key:
+            self.halt(unit, current_time)
+            self.trajectories.pop(unit.id, None)
             unit.update_action(Action.STOP)
             unit.update_objective(None)  # 목표 지점 초기화
             return None
 
-        # 목표 지점 업데이트 및 action을 MOVE로 변경
-        unit.update_objective(objective)
-        unit.update_action(Action.MOVE)
-
-        # 목표 지점까지의 방향 벡터 계산
-        dx = unit.objective[0] - unit.position[0]
-        dy = unit.objective[1] - unit.position[1]
-        distance = calculate_point_distance(unit.position, unit.objective)
-
-        # 목표 지점에 도달했는지 확인
-        if distance < self.MIN_DISTANCE_TO_OBJECTIVE:
-            if unit.unit_type == UnitType.DRONE:
-                # 드론의 경우 다음 패턴으로 즉시 이동
-                current_pattern = self.drone_positions.get(unit.id, 0)
-                next_pattern = (current_pattern + 1) % len(self.DRONE_PATTERN)
-                self.drone_positions[unit.id] = next_pattern
-                self.drone_last_objective_change[unit.id] = current_time
-                
-                # 새로운 목표 지점 계산
-                new_objective = self.calculate_drone_objective(unit, command, current_time)
-                if new_objective:
-                    unit.update_objective(new_objective)
-                    # 새로운 목표 지점으로의 이동 이벤트 생성
-                    dx = new_objective[0] - unit.position[0]
-                    dy = new_objective[1] - unit.position[1]
-                    distance = calculate_point_distance(unit.position, new_objective)
-                    if distance > 0:
-                        dx /= distance
-                        dy /= distance
-                    speed = self.get_unit_speed(unit, unit.position)
-                    next_x = unit.position[0] + dx * speed * 1 #time interval (simulation.py 에서 sim_speed와 같은 수치로 해야함함)
-                    next_y = unit.position[1] + dy * speed * 1 #time interval (simulation.py 에서 sim_speed와 같은 수치로 해야함함)
-                    return Event(
-                        event_type=EventType.MOVE,
-                        time=current_time + 1.0, #time interval
-                        source_id=unit.id,
-                        position=(next_x, next_y)
-                    )
-            else:
-                # 다른 유닛들은 기존대로 처리
+        trajectory = self.trajectories.get(unit.id)
+        if trajectory is not None and trajectory.key == key:
+            if trajectory.arrived:
                 unit.update_action(Action.STOP)
                 unit.update_objective(None)
                 return None
+            unit.update_objective(trajectory.goal)
+            unit.update_action(Action.MOVE)
+            if trajectory.moving:
+                return None
+            return self._plan(unit, command, trajectory.goal, key, current_time)
 
-        # 정규화된 방향 벡터
-        if distance > 0:
-            dx /= distance
-            dy /= distance
+        # 새 목표 지점 (지상 유닛은 목표가 다 겹치지 않도록 get_objective에서 오차를 더함)
+        self.halt(unit, current_time)
+        goal = key if unit.unit_type == UnitType.DRONE else self.get_objective(unit, command, current_time)
+        return self._plan(unit, command, goal, key, current_time)
 
-        # 다음 위치 계산 (지형 영향 포함)
-        speed = self.get_unit_speed(unit, unit.position)
-        next_x = unit.position[0] + dx * speed* 1 #time interval (simulation.py 에서 sim_speed와 같은 수치로 해야함함)
-        next_y = unit.position[1] + dy * speed* 1 #time interval (simulation.py 에서 sim_speed와 같은 수치로 해야함함)
+    def arrive(self, unit: Unit, command: Command, event: Event, current_time: float) -> Optional[Event]:
+        """구간 끝 MOVE 이벤트 처리: 구간 끝 위치에서 다음 구간을 계획하고 current_time 위치로 갱신
 
-        # 이동 이벤트 생성
-        return Event(
-            event_type=EventType.MOVE,
-            time=current_time + 1.0, #time interval (simulation.py 에서 sim_speed와 같은 수치로 해야함함)
-            source_id=unit.id,
-            position=(next_x, next_y)
-        )
+        tick보다 짧은 구간들은 이 안에서 이어서 처리하므로 current_time 이후의 이벤트만 반환한다.
+        """
+        trajectory = self.trajectories.get(unit.id)
+        if trajectory is None or not trajectory.moving or event.time != trajectory.end_time:
+            return None
+        while event is not None and event.time <= current_time:
+            unit.update_position(event.position)
+            event = self._plan(unit, command, trajectory.goal, trajectory.key, event.time)
+            trajectory = self.trajectories[unit.id]
+        unit.update_position(trajectory.position_at(current_time))
+        return event
@@ -0,0 +1,280 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from model.command import Command, Phase, parse_command_plan
+from model.config import Config
+from model.runner import run_replication
+from model.terrain import Terrain
+from model.unit import Team, UnitType
+
+# 작전단계별 기본 명령
+PHASE_COMMANDS = {
+    Phase.Deep_fires: Command.create_phase_1_command,
+    Phase.Degrade_enemy_forces: Command.create_phase_2_command,
+    Phase.CLOSE_COMBAT: Command.create_phase_3_command,
+}
+# fire_priority로 순위를 정하는 표적 유닛 타입
+PRIORITY_TYPES = [UnitType.RIFLE, UnitType.ANTI_TANK, UnitType.TANK, UnitType.ARTILLERY, UnitType.COMMAND_POST]
+PARAMETERS = ('TAI', 'fire_priority')
+OBJECTIVES = ('advantage', 'win_rate')
+
+
+@dataclass
+class OptimizeSettings:
+    """명령 파라미터 최적화(교차 엔트로피 방법) 설정 (config.yaml의 optimize 항목)
+
+    - team: 명령을 최적화할 팀
+    - phases: 최적화할 작전단계
+    - parameters: 최적화할 명령 필드 (TAI, fire_priority)
+    - objective: 후보 점수 (advantage: 팀과 적 팀의 최종 전투력 비율 차이 평균, win_rate: 승률)
+    - generations / population: 세대 수 / 세대별 후보 수
+    - elite_fraction: 다음 세대 분포를 추정할 상위 후보 비율
+    - smoothing: 분포 갱신 비율 (1이면 상위 후보의 평균/표준편차로 바로 바꿈)
+    - replications: 후보별 반복 실행 수 (모든 후보가 같은 시드 목록 사용)
+    - cache_file: 평가 결과 캐시 파일 (없으면 실행 중에만 캐시)
+    """
+    team: Team = Team.BLUE
+    phases: List[Phase] = field(default_factory=lambda: list(Phase))
+    parameters: List[str] = field(default_factory=lambda: list(PARAMETERS))
+    objective: str = 'advantage'
+    generations: int = 10
+    population: int = 16
+    elite_fraction: float = 0.25
+    smoothing: float = 0.7
+    replications: int = 8
+    cache_file: Optional[str] = None
+
+    def __post_init__(self):
+        unknown = set(self.parameters) - set(PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown optimize parameters: {sorted(unknown)} (expected {PARAMETERS})")
+        if self.objective not in OBJECTIVES:
+            raise ValueError(f"optimize objective must be one of {OBJECTIVES}, got {self.objective}")
+        if self.population < 2 or not 0 < self.elite_fraction <= 1 or not 0 < self.smoothing <= 1:
+            raise ValueError("optimize population must be >= 2, elite_fraction and smoothing in (0, 1]")
+        if self.replications < 1:
+            raise ValueError("optimize replications must be at least 1")
+
+    @property
+    def elite_count(self) -> int:
+        return max(2, int(round(self.population * self.elite_fraction)))
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'OptimizeSettings':
+        """config.yaml의 optimize 항목으로부터 생성"""
+        config = config or {}
+        return cls(
+            team=Team[config.get('team', 'BLUE')],
+            phases=[Phase[name] for name in config.get('phases', [phase.name for phase in Phase])],
+            parameters=list(config.get('parameters', PARAMETERS)),
+            objective=config.get('objective', 'advantage'),
+            generations=int(config.get('generations', 10)),
+            population=int(config.get('population', 16)),
+            elite_fraction=config.get('elite_fraction', 0.25),
+            smoothing=config.get('smoothing', 0.7),
+            replications=int(config.get('replications', 8)),
+            cache_file=config.get('cache_file')
+        )
+
+
+class CommandSpace:
+    """최적화할 명령 파라미터와 실수 벡터 사이의 변환
+
+    - TAI: 작전단계마다 (x, y) 두 차원, 지도 범위로 자르고 정수 픽셀로 반올림
+    - fire_priority: 작전단계마다 PRIORITY_TYPES별 점수 한 차원씩, 점수가 낮은 순서로 우선순위 1, 2, ... 부여
+    정수로 바꾼 뒤의 명령이 같은 후보는 같은 캐시 항목을 쓰므로 분포가 좁혀질수록 재평가가 줄어든다.
+    """
+
+    def __init__(self, config: Config, settings: OptimizeSettings):
+        self.config = config
+        self.settings = settings
+        self.team = settings.team
+        height, width = Terrain(config=config).dem_data.shape
+        self.width, self.height = width, height
+        self.base_plan = dict((config.get('commands') or {}).get(self.team.value) or {})
+        plan = parse_command_plan(self.base_plan)
+        self.dimensions: List[Tuple[Phase, str, int]] = []  # (작전단계, 필드, 필드 안의 위치)
+        mean, std = [], []
+        for phase in settings.phases:
+            command = PHASE_COMMANDS[phase](self.team).apply_plan(plan)
+            if 'TAI' in settings.parameters:
+                tai = command.TAI if command.TAI is not None else (width / 2, height / 2)
+                for axis, (value, extent) in enumerate(zip(tai, (width, height))):
+                    self.dimensions.append((phase, 'TAI', axis))
+                    mean.append(float(value))
+                    std.append(extent / 4)
+            if 'fire_priority' in settings.parameters:
+                for index, unit_type in enumerate(PRIORITY_TYPES):
+                    self.dimensions.append((phase, 'fire_priority', index))
+                    mean.append(float(command.fire_priority.get(unit_type, len(PRIORITY_TYPES))))
+                    std.append(1.5)
+        self.initial_mean = np.array(mean)
+        self.initial_std = np.array(std)
+
+    def decode(self, vector: np.ndarray) -> Dict[str, dict]:
+        """벡터를 작전단계별 명령 재정의(config.yaml의 commands.<TEAM> 형식)로 변환"""
+        values: Dict[Phase, Dict[str, list]] = {}
+        for value, (phase, name, _) in zip(vector.tolist(), self.dimensions):
+            values.setdefault(phase, {}).setdefault(name, []).append(value)
+        commands = {}
+        for phase, fields in values.items():
+            overrides = dict(self.base_plan.get(phase.name) or {})
+            if 'TAI' in fields:
+                x, y = fields['TAI']
+                overrides['TAI'] = [int(round(min(max(x, 0.0), self.width - 1))),
+                                    int(round(min(max(y, 0.0), self.height - 1)))]
+            if 'fire_priority' in fields:
+                order = np.argsort(fields['fire_priority'], kind='stable')
+                overrides['fire_priority'] = {PRIORITY_TYPES[index].name: rank + 1
+                                              for rank, index in enumerate(order.tolist())}
+            commands[phase.name] = overrides
+        return commands
+
+    def config_for(self, commands: Dict[str, dict]) -> Config:
+        return self.config.with_overrides({f'commands.{self.team.value}.{phase}': overrides
+                                           for phase, overrides in commands.items()})
+
+
+def candidate_key(config_data: dict, seeds: List[int], max_time: Optional[float]) -> str:
+    """후보 평가 캐시 키 (후보 명령을 적용한 전체 설정, 시드 목록, 최대 시간의 해시)"""
+    payload = json.dumps({'config': config_data, 'seeds': seeds, 'max_time': max_time}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class Candidate:
+    """평가한 명령 후보"""
+    commands: Dict[str, dict]  # 작전단계 이름별 명령 재정의 (config.yaml의 commands.<TEAM> 형식)
+    score: float
+    scores: List[float]  # 반복 실행별 점수 (시드 순서)
+
+
+@dataclass
+class GenerationSummary:
+    generation: int
+    best_score: float  # 지금까지의 최고 점수
+    elite_mean: float  # 이번 세대 상위 후보 평균 점수
+    evaluated: int  # 새로 실행한 후보 수
+    cached: int  # 캐시로 점수를 얻은 후보 수
+
+
+@dataclass
+class OptimizationResult:
+    baseline: Candidate  # 현재 설정의 명령
+    best: Candidate
+    history: List[GenerationSummary]
+    replications_run: int
+
+
+def _run_task(task: Tuple[str, dict, int, Optional[float], str]) -> Tuple[str, int, dict]:
+    """프로세스 풀 작업 단위 (캐시 키, 설정, 시드, 최대 시간, 팀) -> (캐시 키, 시드, 결과 지표)"""
+    key, config_data, seed, max_time, team_name = task
+    result = run_replication(config_data, seed, max_time)
+    team = Team[team_name]
+    enemy = Team.RED if team == Team.BLUE else Team.BLUE
+    return key, seed, {
+        'advantage': result.strength[team] - result.strength[enemy],
+        'win': 1.0 if result.winner == team else 0.0,
+    }
+
+
+class CommandOptimizer:
+    """교차 엔트로피 방법으로 팀의 작전단계별 TAI/fire_priority를 찾는 최적화기
+
+    세대마다 정규분포에서 후보를 뽑아 모든 후보를 같은 시드 목록(base_seed + 반복 번호)으로 실행하고
+    (공통 난수: 후보 간 차이가 난수 차이에 묻히지 않음), 상위 후보들의 평균/표준편차로 분포를 갱신한다.
+    후보 평가는 캐시 키(candidate_key)별로 한 번만 하며, 세대의 새 후보 x 시드 작업을 한꺼번에 프로세스 풀에 나눈다.
+    """
+
+    def __init__(self, base_config: Union[str, dict, Config], settings: Optional[OptimizeSettings] = None,
+                 workers: int = 1, base_seed: int = 0, max_time: Optional[float] = None):
+        self.config = Config.from_any(base_config)
+        self.settings = settings or OptimizeSettings.from_config(self.config.get('optimize'))
+        self.space = CommandSpace(self.config, self.settings)
+        self.workers = workers
+        self.base_seed = base_seed
+        self.max_time = max_time
+        self.seeds = [base_seed + replication for replication in range(self.settings.replications)]
+        self.cache: Dict[str, Dict[str, dict]] = self._load_cache()
+        self.replications_run = 0
+
+    def _load_cache(self) -> Dict[str, Dict[str, dict]]:
+        path = self.settings.cache_file
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_cache(self) -> None:
+        path = self.settings.cache_file
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.cache, f)
+        os.replace(path + '.tmp', path)
+
+    def _score(self, metrics: Dict[str, dict]) -> List[float]:
+        name = 'win' if self.settings.objective == 'win_rate' else 'advantage'
+        return [metrics[str(seed)][name] for seed in self.seeds]
+
+    def evaluate(self, candidates: List[Dict[str, dict]], executor=None) -> Tuple[List[Candidate], int]:
+        """후보들의 점수 (캐시에 없는 후보만 실행), (평가 결과, 새로 실행한 후보 수) 반환"""
+        keys, tasks = [], []
+        pending = set()
+        for commands in candidates:
+            config_data = self.space.config_for(commands).to_dict()
+            key = candidate_key(config_data, self.seeds, self.max_time)
+            keys.append(key)
+            if key not in self.cache and key not in pending:
+                pending.add(key)
+                tasks.extend((key, config_data, seed, self.max_time, self.settings.team.name) for seed in self.seeds)
+        if tasks:
+            outputs = executor.map(_run_task, tasks) if executor else map(_run_task, tasks)
+            for key, seed, metrics in outputs:
+                self.cache.setdefault(key, {})[str(seed)] = metrics
+            self.replications_run += len(tasks)
+            self._save_cache()
+        evaluated = []
+        for commands, key in zip(candidates, keys):
+            scores = self._score(self.cache[key])
+            evaluated.append(Candidate(commands=commands, score=sum(scores) / len(scores), scores=scores))
+        return evaluated, len(pending)
+
+    def run(self, seed: int = 0, progress=None) -> OptimizationResult:
+        """최적화 실행 (seed는 후보 추출용 난수 시드, progress(GenerationSummary)는 세대마다 호출)"""
+        settings = self.settings
+        rng = np.random.default_rng(seed)
+        mean, std = self.space.initial_mean.copy(), self.space.initial_std.copy()
+        history: List[GenerationSummary] = []
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            baseline = self.evaluate([self.space.decode(mean)], executor)[0][0]
+            best = baseline
+            for generation in range(settings.generations):
+                vectors = rng.normal(mean, std, size=(settings.population, len(mean)))
+                candidates, evaluated = self.evaluate([self.space.decode(vector) for vector in vectors], executor)
+                order = sorted(range(len(candidates)), key=lambda index: -candidates[index].score)
+                elite = order[:settings.elite_count]
+                if candidates[elite[0]].score > best.score:
+                    best = candidates[elite[0]]
+                mean = settings.smoothing * vectors[elite].mean(axis=0) + (1 - settings.smoothing) * mean
+                std = settings.smoothing * vectors[elite].std(axis=0) + (1 - settings.smoothing) * std
+                summary = GenerationSummary(
+                    generation=generation,
+                    best_score=best.score,
+                    elite_mean=sum(candidates[index].score for index in elite) / len(elite),
+                    evaluated=evaluated,
+                    cached=len(candidates) - evaluated
+                )
+                history.append(summary)
+                if progress:
+                    progress(summary)
+        finally:
+            if executor:
+                executor.shutdown()
+        return OptimizationResult(baseline=baseline, best=best, history=history, replications_run=self.replications_run)
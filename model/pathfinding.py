@@ -0,0 +1,141 @@
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import numpy as np
+from model.terrain import Terrain
+
+# 16방향 이웃 (행, 열 변화량, 칸 단위 이동 거리)
+# 8방향만 쓰면 격자 경로가 직선보다 최대 8% 길어져 감소율 0.8 지형을 우회할 이득이 묻히므로
+# 나이트 이동(1, 2)까지 넣어 오차를 3% 이내로 줄인다.
+NEIGHBORS = [(d_row, d_col, math.hypot(d_row, d_col))
+             for d_row in range(-2, 3) for d_col in range(-2, 3)
+             if (d_row, d_col) != (0, 0) and math.gcd(d_row, d_col) == 1]
+
+
+@dataclass
+class PathPlanningSettings:
+    """지형 경로 계획 설정 (config.yaml의 path_planning 항목)
+
+    - enabled: 지상 유닛이 maneuver_objective까지 비용장을 따라 이동 (False면 목표 방향으로 직진)
+    - cell_size: 비용장 격자 한 칸의 크기 (픽셀)
+    - lookahead: 경로상 몇 칸 앞의 격자 중심을 향할지 (클수록 경로가 매끄러움)
+    - final_approach: 목표까지 남은 이동 비용(픽셀)이 이 값 이하이면 각자의 목표로 직진
+    """
+    enabled: bool = False
+    cell_size: int = 4
+    lookahead: int = 3
+    final_approach: float = 100.0
+
+    def __post_init__(self):
+        if self.cell_size < 1 or self.lookahead < 1:
+            raise ValueError("path_planning cell_size and lookahead must be at least 1")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'PathPlanningSettings':
+        """config.yaml의 path_planning 항목으로부터 생성"""
+        config = config or {}
+        return cls(
+            enabled=config.get('enabled', False),
+            cell_size=int(config.get('cell_size', 4)),
+            lookahead=int(config.get('lookahead', 3)),
+            final_approach=config.get('final_approach', 100.0)
+        )
+
+
+class CostField:
+    """목표 지점까지의 이동 시간 비용장
+
+    DEM을 cell_size 픽셀 격자로 묶고, 칸마다 지상 유닛 이동속도 감소율의 평균으로
+    16방향 Dijkstra를 목표 칸에서 한 번 돌려 모든 칸의 남은 이동 비용(감소율 1.0 기준 픽셀)과
+    최단 경로상 lookahead 칸 앞의 경유점을 구해 둔다.
+    같은 목표를 가진 유닛들은 이 비용장을 공유하므로 유닛당 이동 한 번은 배열 조회 한 번이다.
+    """
+
+    def __init__(self, decay_rates: np.ndarray, goal: Tuple[float, float], cell_size: int, lookahead: int):
+        height, width = decay_rates.shape
+        self.cell_size = cell_size
+        self.goal = (float(goal[0]), float(goal[1]))
+        self.rows, self.cols = -(-height // cell_size), -(-width // cell_size)
+
+        # 칸별 평균 감소율 (격자 경계에 걸친 칸은 DEM 안의 픽셀만 평균)
+        padded = np.zeros((self.rows * cell_size, self.cols * cell_size))
+        padded[:height, :width] = decay_rates
+        inside = np.zeros_like(padded)
+        inside[:height, :width] = 1.0
+        block_sum = padded.reshape(self.rows, cell_size, self.cols, cell_size).sum(axis=(1, 3))
+        block_count = inside.reshape(self.rows, cell_size, self.cols, cell_size).sum(axis=(1, 3))
+        self.decay = block_sum / block_count
+
+        goal_row, goal_col = self._cell(self.goal)
+        cost, parent = self._dijkstra(goal_row * self.cols + goal_col)
+        self.cost = cost.reshape(self.rows, self.cols) * cell_size
+
+        # lookahead 칸 앞 경유점 (목표 칸에서는 목표 지점 자체)
+        waypoint = parent
+        for _ in range(lookahead - 1):
+            waypoint = parent[waypoint]
+        centers_x = (waypoint % self.cols + 0.5) * cell_size
+        centers_y = (waypoint // self.cols + 0.5) * cell_size
+        at_goal = waypoint == goal_row * self.cols + goal_col
+        centers_x[at_goal], centers_y[at_goal] = self.goal
+        self.waypoint_x = centers_x.reshape(self.rows, self.cols)
+        self.waypoint_y = centers_y.reshape(self.rows, self.cols)
+        for array in (self.decay, self.cost, self.waypoint_x, self.waypoint_y):
+            array.setflags(write=False)
+
+    def _cell(self, position: Tuple[float, float]) -> Tuple[int, int]:
+        """위치가 속한 칸 (격자 밖이면 가장 가까운 칸)"""
+        row = min(max(int(position[1] // self.cell_size), 0), self.rows - 1)
+        col = min(max(int(position[0] // self.cell_size), 0), self.cols - 1)
+        return row, col
+
+    def _dijkstra(self, goal_index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """목표 칸으로부터의 칸 단위 이동 비용과 목표 쪽 다음 칸(parent) 인덱스"""
+        rows, cols = self.rows, self.cols
+        slowness = (1.0 / self.decay).ravel().tolist()
+        cost = [math.inf] * (rows * cols)
+        parent = list(range(rows * cols))
+        cost[goal_index] = 0.0
+        heap = [(0.0, goal_index)]
+        while heap:
+            current_cost, index = heapq.heappop(heap)
+            if current_cost > cost[index]:
+                continue
+            row, col = divmod(index, cols)
+            for d_row, d_col, step in NEIGHBORS:
+                next_row, next_col = row + d_row, col + d_col
+                if not (0 <= next_row < rows and 0 <= next_col < cols):
+                    continue
+                neighbor = next_row * cols + next_col
+                # 두 칸 감소율의 평균 역수로 구간 이동 시간 근사
+                next_cost = current_cost + step * (slowness[index] + slowness[neighbor]) * 0.5
+                if next_cost < cost[neighbor]:
+                    cost[neighbor] = next_cost
+                    parent[neighbor] = index
+                    heapq.heappush(heap, (next_cost, neighbor))
+        return np.array(cost), np.array(parent)
+
+    def cost_to_go(self, position: Tuple[float, float]) -> float:
+        """위치에서 목표까지 남은 이동 비용 (감소율 1.0 기준 픽셀)"""
+        row, col = self._cell(position)
+        return self.cost.item(row, col)
+
+    def waypoint(self, position: Tuple[float, float]) -> Tuple[float, float]:
+        """위치에서 최단 경로를 따라 향할 경유점"""
+        row, col = self._cell(position)
+        return self.waypoint_x.item(row, col), self.waypoint_y.item(row, col)
+
+
+_cost_field_cache: Dict[tuple, CostField] = {}
+
+
+def load_cost_field(terrain: Terrain, goal: Tuple[float, float], settings: PathPlanningSettings) -> CostField:
+    """목표 지점의 비용장 (DEM/축척/감소율/격자 설정/목표당 한 번만 계산하여 공유)"""
+    key = (terrain.dem_file, terrain.pixel_to_meter_scale, tuple(sorted(terrain.terrain_decay_rates.items())),
+           settings.cell_size, settings.lookahead, (float(goal[0]), float(goal[1])))
+    field = _cost_field_cache.get(key)
+    if field is None:
+        field = CostField(terrain.decay_rate_grid(), goal, settings.cell_size, settings.lookahead)
+        _cost_field_cache[key] = field
+    return field
@@ -0,0 +1,188 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+from model.command import Phase
+from model.event import Event
+from model.unit import Team, UnitType, Status, Action
+
+
+class UnitView(NamedTuple):
+    """그리기용 유닛 상태 (읽기 전용 사본)
+
+    Visualizer가 읽는 속성 이름을 Unit과 동일하게 맞춰 draw 함수들을 그대로 쓸 수 있다.
+    """
+    id: int
+    team: Team
+    unit_type: UnitType
+    position: Tuple[float, float]
+    status: Status
+    action: Action
+    target_list: FrozenSet[int]
+    eligible_target_list: FrozenSet[int]
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """한 틱이 끝난 시점의 불변 스냅샷
+
+    모델 스레드가 만들어 큐에 넣고 렌더링 루프가 꺼내 그린다.
+    생성 이후 모델이 유닛을 갱신해도 스냅샷 내용은 바뀌지 않는다.
+    """
+    time: float
+    units: Tuple[UnitView, ...]
+    events: Tuple[Event, ...]  # 이 틱에 처리된 이벤트
+    phases: Dict[Team, Phase]
+
+    @classmethod
+    def capture(cls, current_time: float, units, events, commands) -> 'FrameSnapshot':
+        views = tuple(
+            UnitView(unit.id, unit.team, unit.unit_type, tuple(unit.position), unit.status, unit.action,
+                     frozenset(unit.target_list), frozenset(unit.eligible_target_list))
+            for unit in units
+        )
+        phases = {team: command.phase for team, command in commands.items()}
+        return cls(current_time, views, tuple(events), phases)
+
+
+_END = object()  # 모델 스레드 종료 표시
+
+
+class ModelProducer(threading.Thread):
+    """시뮬레이션을 진행하며 틱마다 FrameSnapshot을 크기 제한 큐에 넣는 모델 스레드
+
+    큐가 가득 차면(렌더링이 일시정지되었거나 배속이 낮으면) 자리가 날 때까지 기다리므로
+    모델이 화면보다 queue_size 틱 이상 앞서가지 않는다.
+    종료 조건을 만족하거나 max_time에 도달하면 reason을 기록하고 종료 표시를 넣는다.
+    """
+
+    def __init__(self, simulation, max_time: float, queue_size: int = 64):
+        super().__init__(name='model', daemon=True)
+        self.simulation = simulation
+        self.max_time = max_time
+        self.frames: 'queue.Queue' = queue.Queue(maxsize=queue_size)
+        self.stop_requested = threading.Event()
+        self.reason = 'max_time'
+        self.error: Optional[BaseException] = None
+
+    def _put(self, item) -> bool:
+        """정지 요청을 확인하면서 큐에 넣기, 정지되면 False"""
+        while not self.stop_requested.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        sim = self.simulation
+        try:
+            while sim.current_time < self.max_time and not self.stop_requested.is_set():
+                current_events = sim.step()
+                if sim.recorder:
+                    sim.recorder.record(sim.current_time, sim.units, sim.commands)
+                frame = FrameSnapshot.capture(sim.current_time, sim.units, current_events, sim.commands)
+                if not self._put(frame):
+                    break
+                termination_reason = sim.check_termination()
+                if termination_reason:
+                    self.reason = termination_reason
+                    break
+                sim.current_time += sim.sim_speed
+        except BaseException as error:  # 렌더링 스레드에서 다시 발생시킴
+            self.error = error
+        finally:
+            if self.stop_requested.is_set():
+                self.reason = 'quit'
+            else:
+                self._put(_END)
+
+    def stop(self):
+        self.stop_requested.set()
+
+
+# 배속 조절 키: 위/오른쪽 화살표 2배, 아래/왼쪽 화살표 1/2배, M 최대 속도 전환
+MIN_SPEED = 0.25
+MAX_SPEED = 1024.0
+
+
+def play(simulation, max_time: float, speed: float = 1.0, fps: int = 30, queue_size: int = 64) -> str:
+    """모델 스레드를 돌리면서 렌더링 루프를 fps로 실행, 종료 사유 반환
+
+    speed는 실제 1초당 진행할 모의 시간(초)이며, 최대 속도 모드에서는 큐에 쌓인 마지막 프레임만 그린다.
+    그리지 않고 건너뛴 프레임의 사격 이벤트도 사격선 표시에 모아 전달한다.
+    SPACE로 일시정지하면 큐가 차는 즉시 모델도 멈춘다.
+    창을 닫으면 모델 스레드를 멈추고 'quit'을 반환한다.
+    """
+    import pygame
+
+    visualizer = simulation.visualizer
+    producer = ModelProducer(simulation, max_time, queue_size)
+    clock = pygame.time.Clock()
+    max_speed = False
+    shown: Optional[FrameSnapshot] = None
+    display_time = simulation.current_time
+    finished = False
+
+    def update_caption():
+        label = 'max' if max_speed else f'x{speed:g}'
+        pygame.display.set_caption(f"War Game Simulation ({label})")
+
+    update_caption()
+    producer.start()
+    last_tick = time.perf_counter()
+    try:
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return 'quit'
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        visualizer.paused = not visualizer.paused
+                    elif event.key in (pygame.K_UP, pygame.K_RIGHT):
+                        speed = min(speed * 2, MAX_SPEED)
+                    elif event.key in (pygame.K_DOWN, pygame.K_LEFT):
+                        speed = max(speed / 2, MIN_SPEED)
+                    elif event.key == pygame.K_m:
+                        max_speed = not max_speed
+                    update_caption()
+
+            now = time.perf_counter()
+            elapsed, last_tick = now - last_tick, now
+            if visualizer.paused:
+                visualizer.show_pause_screen()
+                clock.tick(fps)
+                continue
+
+            # 이번 프레임까지 보여줄 모의 시간만큼 큐에서 꺼내기
+            display_time += elapsed * speed
+            events = []
+            latest = None
+            while max_speed or latest is None or latest.time < display_time:
+                try:
+                    item = producer.frames.get_nowait()
+                except queue.Empty:
+                    # 모델이 화면보다 느리면 표시 시간이 앞서 나가지 않도록 맞춤
+                    caught_up = latest or shown
+                    if caught_up is not None:
+                        display_time = min(display_time, caught_up.time)
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                latest = item
+                events.extend(item.events)
+            if latest is not None:
+                visualizer.draw_snapshot(latest, shown.time if shown else latest.time, events)
+                shown = latest
+            if finished:
+                break
+            clock.tick(fps)
+    finally:
+        producer.stop()
+        producer.join()
+    if producer.error is not None:
+        raise producer.error
+    return producer.reason
@@ -1,20 +1,101 @@
-import pandas as pd
-from typing import Dict, Tuple, Union
+import csv
+import numpy as np
+from typing import Dict, List, Sequence, Tuple, Union
 from model.unit import UnitType, Status
 
+
+class ProbabilityTable:
+    """CSV 확률 테이블 (pandas 없이 csv 모듈로 읽음)"""
+
+    def __init__(self, path: str):
+        with open(path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            self.columns: List[str] = next(reader)
+            self.rows: List[List[str]] = [row for row in reader if row]
+
+    def column(self, name: str) -> List[str]:
+        index = self.columns.index(name)
+        return [row[index] for row in self.rows]
+
+    def float_column(self, name: str) -> np.ndarray:
+        return np.array(self.column(name), dtype=float)
+
+
+# 직사화기 피해 상태 (batch_probabilities의 피해 확률 열 순서, 확률 테이블의 상태 순서와 같음)
+VEHICLE_TYPES = (UnitType.TANK, UnitType.ARTILLERY)
+VEHICLE_KILL_STATUSES = [Status.M_KILL, Status.F_KILL, Status.MF_KILL, Status.K_KILL]
+PERSONNEL_KILL_STATUSES = [Status.MINOR, Status.SERIOUS, Status.CRITICAL, Status.FATAL]
+
+
 class ProbabilitySystem:
-    # Load probability data
-    rifle_at_commander_hit = pd.read_csv('database/rifle_at_commander_hit.csv')
-    # 직사화기(라이플, 전차, 대전차, 지휘소)가 라이플, 대전차, 지휘소를 명중시킬 확률
+    # 확률 테이블 파일 (처음 사용할 때 읽음)
+    DATA_FILES = {
+        'rifle_at_commander_hit': 'database/rifle_at_commander_hit.csv',
+        # 직사화기(라이플, 전차, 대전차, 지휘소)가 라이플, 대전차, 지휘소를 명중시킬 확률
+        'rifle_at_commander_kh': 'database/rifle_at_commander_kh.csv',
+        # 직사화기(라이플, 전차, 대전차, 지휘소)가 라이플, 대전차, 지휘소를 명중시켰을 때 상태별 확률
+        'tank_artillery_hit': 'database/tank_artillery_hit.csv',
+        # 직사화기(라이플, 전차, 대전차, 지휘소)가 탱크, 포병을 명중시킬 확률
+        'tank_artillery_kh': 'database/tank_artillery_kh.csv',
+        # 직사화기(라이플, 전차, 대전차, 지휘소)가 탱크, 포병을 명중시켰을 때 상태별 확률
+    }
+    PROTECTION_STATES = ['ES', 'EM', 'DS', 'DM']
+    _tables: Dict[str, dict] = {}
+
+    @classmethod
+    def _table(cls, name: str) -> dict:
+        """보간용으로 전처리한 확률 테이블 반환 (처음 호출될 때 로드)"""
+        table = cls._tables.get(name)
+        if table is None:
+            table = cls._prepare_table(ProbabilityTable(cls.DATA_FILES[name]))
+            cls._tables[name] = table
+        return table
 
-    rifle_at_commander_kh = pd.read_csv('database/rifle_at_commander_kh.csv')
-    # 직사화기(라이플, 전차, 대전차, 지휘소)가 라이플, 대전차, 지휘소를 명중시켰을 때 상태별 확률
+    @classmethod
+    def preload(cls) -> None:
+        """모든 확률 테이블을 미리 로드 (fork 전에 호출하면 자식 프로세스가 테이블을 공유)"""
+        for name in cls.DATA_FILES:
+            cls._table(name)
+
+    @classmethod
+    def _prepare_table(cls, table: ProbabilityTable) -> dict:
+        """테이블 종류에 따라 방호상태별 보간 데이터 생성
+
+        - 'Kill Type' 테이블 (tank_artillery_kh): 방호상태별 {Status: 확률} (거리 무관)
+        - 'State' 테이블 (rifle_at_commander_kh): 방호상태별 (거리 배열, {Status: 확률 배열})
+        - 명중확률 테이블: 방호상태별 (행 번호 배열, 확률 배열) - pandas 기본 인덱스 기준 보간과 동일
+        """
+        if 'Kill Type' in table.columns:
+            kill_types = table.column('Kill Type')
+            prepared = {}
+            for state in cls.PROTECTION_STATES:
+                values = dict(zip(kill_types, table.float_column(state)))
+                mf_prob = values['MF-Kill']
+                # Kill Type을 Status로 변환
+                prepared[state] = {
+                    Status.M_KILL: mf_prob - values['F-Kill'],  # MF-kill 확률에서 F-kill 확률 제외
+                    Status.F_KILL: mf_prob - values['M-Kill'],  # MF-kill 확률에서 M-kill 확률 제외
+                    Status.MF_KILL: mf_prob,
+                    Status.K_KILL: values['K-Kill']
+                }
+            return {'kind': 'kill_type', 'states': prepared}
 
-    tank_artillery_hit = pd.read_csv('database/tank_artillery_hit.csv')
-    # 직사화기(라이플, 전차, 대전차, 지휘소)가 탱크, 포병을 명중시킬 확률
+        if 'State' in table.columns:
+            distances = table.float_column('Distance (m)')
+            states = np.array(table.column('State'))
+            columns = {Status.MINOR: 'Minor', Status.SERIOUS: 'Serious', Status.CRITICAL: 'Critical', Status.FATAL: 'Fetal'}
+            prepared = {}
+            for state in cls.PROTECTION_STATES:
+                mask = states == state
+                order = np.argsort(distances[mask], kind='stable')
+                prepared[state] = (
+                    distances[mask][order],
+                    {status: table.float_column(column)[mask][order] for status, column in columns.items()}
+                )
+            return {'kind': 'state', 'states': prepared}
 
-    tank_artillery_kh = pd.read_csv('database/tank_artillery_kh.csv')
-    # 직사화기(라이플, 전차, 대전차, 지휘소)가 탱크, 포병을 명중시켰을 때 상태별 확률
+        index = np.arange(len(table.rows), dtype=float)
+        return {'kind': 'hit', 'states': {state: (index, table.float_column(state)) for state in cls.PROTECTION_STATES}}
 
     @classmethod
     def get_hit_probability(cls, attacker_type: UnitType, target_type: UnitType, 
@@ -34,9 +115,9 @@ class ProbabilitySystem:
         if attacker_type in [UnitType.RIFLE, UnitType.TANK, UnitType.ANTI_TANK, UnitType.COMMAND_POST]:
             # 표적 타입에 따라 적절한 테이블 선택
             if target_type in [UnitType.RIFLE, UnitType.ANTI_TANK, UnitType.COMMAND_POST]:
-                table = cls.rifle_at_commander_hit
+                table = cls._table('rifle_at_commander_hit')
             else:  # TANK, ARTILLERY
-                table = cls.tank_artillery_hit
+                table = cls._table('tank_artillery_hit')
 
             # 거리에 따른 보간
             return cls._interpolate_probability(table, distance, protection_state)
@@ -63,20 +144,58 @@ class ProbabilitySystem:
 
         # 표적 타입에 따라 적절한 테이블 선택
         if target_type in [UnitType.RIFLE, UnitType.ANTI_TANK, UnitType.COMMAND_POST]:
-            table = cls.rifle_at_commander_kh
+            table = cls._table('rifle_at_commander_kh')
         else:  # TANK, ARTILLERY
-            table = cls.tank_artillery_kh
+            table = cls._table('tank_artillery_kh')
 
         # 모든 상태의 확률을 한번에 계산
         return cls._interpolate_probability(table, distance, protection_state)
 
     @classmethod
-    def _interpolate_probability(cls, table: pd.DataFrame, distance: float, 
+    def batch_probabilities(cls, target_types: Sequence[UnitType], distances: np.ndarray,
+                            protection_states: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """직사화기 사격 묶음의 명중확률과 피해 상태별 확률
+
+        사격마다 get_hit_probability / get_kill_probability를 부른 것과 같은 값을
+        (표적 종류, 방호상태) 조합별로 한 번씩 보간하여 구한다.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 명중확률 (n,), 피해 상태별 확률 (n, 4)
+            - 피해 확률 열 순서: 표적이 차량(TANK, ARTILLERY)이면 VEHICLE_KILL_STATUSES, 아니면 PERSONNEL_KILL_STATUSES
+        """
+        size = len(distances)
+        hit = np.empty(size)
+        kill = np.empty((size, 4))
+        vehicle = np.array([target_type in VEHICLE_TYPES for target_type in target_types], dtype=bool)
+        states = np.array(protection_states)
+        for is_vehicle, hit_name, kill_name in [(False, 'rifle_at_commander_hit', 'rifle_at_commander_kh'),
+                                                (True, 'tank_artillery_hit', 'tank_artillery_kh')]:
+            kind_mask = vehicle == is_vehicle
+            if not kind_mask.any():
+                continue
+            hit_table, kill_table = cls._table(hit_name), cls._table(kill_name)
+            for state in cls.PROTECTION_STATES:
+                rows = np.flatnonzero(kind_mask & (states == state))
+                if len(rows) == 0:
+                    continue
+                row_distances = distances[rows]
+                index, values = hit_table['states'][state]
+                hit[rows] = np.interp(row_distances, index, values)
+                if kill_table['kind'] == 'kill_type':
+                    kill[rows] = list(kill_table['states'][state].values())
+                else:
+                    table_distances, columns = kill_table['states'][state]
+                    for column, column_values in enumerate(columns.values()):
+                        kill[rows, column] = np.interp(row_distances, table_distances, column_values)
+        return hit, kill
+
+    @classmethod
+    def _interpolate_probability(cls, table: dict, distance: float, 
                                protection_state: str, state: Status = None) -> Union[float, Dict[Status, float]]:
-        """거리와 방호상태에 따른 확률 보간
+        """거리와 방호상태에 따른 확률 보간 (범위를 벗어나면 양 끝 값 사용)
         
         Args:
-            table: 확률 테이블
+            table: _prepare_table로 전처리한 확률 테이블
             distance: 거리
             protection_state: 방호상태 (ES, EM, DS, DM)
             state: 살상확률을 구할 때만 사용되는 상태
@@ -86,100 +205,18 @@ class ProbabilitySystem:
             - hit probability의 경우 float 반환
             - kill probability의 경우 Dict[Status, float] 반환
         """
-        # tank_artillery_kh.csv의 경우 특별 처리
-        if 'Kill Type' in table.columns:
-            # 모든 살상 유형의 확률을 반환
-            probabilities = {}
-            mf_prob = table.loc[table['Kill Type'] == 'MF-Kill', protection_state].iloc[0]
-            m_kill_prob = table.loc[table['Kill Type'] == 'M-Kill', protection_state].iloc[0]
-            f_kill_prob = table.loc[table['Kill Type'] == 'F-Kill', protection_state].iloc[0]
-            
-            # Kill Type을 Status로 변환
-            probabilities[Status.M_KILL] = mf_prob - f_kill_prob  # MF-kill 확률에서 F-kill 확률 제외
-            probabilities[Status.F_KILL] = mf_prob - m_kill_prob  # MF-kill 확률에서 M-kill 확률 제외
-            probabilities[Status.MF_KILL] = mf_prob
-            probabilities[Status.K_KILL] = table.loc[table['Kill Type'] == 'K-Kill', protection_state].iloc[0]
-            return probabilities
-
-        # rifle_at_commander_kh.csv의 경우 특별 처리
-        if 'State' in table.columns:
-            # 거리가 테이블 범위를 벗어나는 경우
-            distances = table['Distance (m)'].unique()
-            if distance <= min(distances):
-                closest_dist = min(distances)
-                row = table[(table['Distance (m)'] == closest_dist) & (table['State'] == protection_state)]
-                return {
-                    Status.MINOR: row['Minor'].iloc[0],
-                    Status.SERIOUS: row['Serious'].iloc[0],
-                    Status.CRITICAL: row['Critical'].iloc[0],
-                    Status.FATAL: row['Fetal'].iloc[0]
-                }
-            if distance >= max(distances):
-                closest_dist = max(distances)
-                row = table[(table['Distance (m)'] == closest_dist) & (table['State'] == protection_state)]
-                return {
-                    Status.MINOR: row['Minor'].iloc[0],
-                    Status.SERIOUS: row['Serious'].iloc[0],
-                    Status.CRITICAL: row['Critical'].iloc[0],
-                    Status.FATAL: row['Fetal'].iloc[0]
-                }
+        # tank_artillery_kh.csv의 경우 모든 살상 유형의 확률을 반환
+        if table['kind'] == 'kill_type':
+            return dict(table['states'][protection_state])
 
-            # 거리에 따른 보간
-            lower_dist = max(d for d in distances if d <= distance)
-            upper_dist = min(d for d in distances if d >= distance)
-            
-            if lower_dist == upper_dist:
-                row = table[(table['Distance (m)'] == lower_dist) & (table['State'] == protection_state)]
-                return {
-                    Status.MINOR: row['Minor'].iloc[0],
-                    Status.SERIOUS: row['Serious'].iloc[0],
-                    Status.CRITICAL: row['Critical'].iloc[0],
-                    Status.FATAL: row['Fetal'].iloc[0]
-                }
-            
-            # 선형 보간
-            lower_row = table[(table['Distance (m)'] == lower_dist) & (table['State'] == protection_state)]
-            upper_row = table[(table['Distance (m)'] == upper_dist) & (table['State'] == protection_state)]
-            
-            # 각 상태별로 보간
-            return {
-                Status.MINOR: cls._linear_interpolate(
-                    distance, lower_dist, upper_dist,
-                    lower_row['Minor'].iloc[0], upper_row['Minor'].iloc[0]
-                ),
-                Status.SERIOUS: cls._linear_interpolate(
-                    distance, lower_dist, upper_dist,
-                    lower_row['Serious'].iloc[0], upper_row['Serious'].iloc[0]
-                ),
-                Status.CRITICAL: cls._linear_interpolate(
-                    distance, lower_dist, upper_dist,
-                    lower_row['Critical'].iloc[0], upper_row['Critical'].iloc[0]
-                ),
-                Status.FATAL: cls._linear_interpolate(
-                    distance, lower_dist, upper_dist,
-                    lower_row['Fetal'].iloc[0], upper_row['Fetal'].iloc[0]
-                )
-            }
+        # rifle_at_commander_kh.csv의 경우 상태별로 보간
+        if table['kind'] == 'state':
+            distances, columns = table['states'][protection_state]
+            return {status: np.interp(distance, distances, values) for status, values in columns.items()}
 
         # 일반적인 hit probability 테이블 처리
-        # 거리가 테이블 범위를 벗어나는 경우
-        if distance <= table.index[0]:
-            return table.loc[table.index[0], protection_state]
-        if distance >= table.index[-1]:
-            return table.loc[table.index[-1], protection_state]
-
-        # 거리에 따른 보간
-        lower_dist = table.index[table.index <= distance][-1]
-        upper_dist = table.index[table.index >= distance][0]
-        
-        if lower_dist == upper_dist:
-            return table.loc[lower_dist, protection_state]
-            
-        # 선형 보간
-        lower_prob = table.loc[lower_dist, protection_state]
-        upper_prob = table.loc[upper_dist, protection_state]
-        
-        return cls._linear_interpolate(distance, lower_dist, upper_dist, lower_prob, upper_prob)
+        index, values = table['states'][protection_state]
+        return np.interp(distance, index, values)
 
     @staticmethod
     def _linear_interpolate(x: float, x0: float, x1: float, y0: float, y1: float) -> float:
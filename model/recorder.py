@@ -0,0 +1,166 @@
+import json
+import os
+import numpy as np
+from typing import Dict, Iterator, List, Optional
+from model.unit import Unit, Team, UnitType, Status, Action
+from model.command import Command, Phase
+
+# 기록 컬럼 (이름, dtype) - enum 값은 목록에서의 순서(code)로 저장
+COLUMNS = [
+    ('time', np.float32),
+    ('unit_id', np.int32),
+    ('team', np.int8),
+    ('unit_type', np.int8),
+    ('x', np.float32),
+    ('y', np.float32),
+    ('status', np.int8),
+    ('action', np.int8),
+    ('target', np.int32),  # 사격 대상이 없으면 -1
+    ('phase', np.int8),  # 유닛 소속 팀의 작전단계
+]
+ENUM_CODES = {
+    'team': [team.name for team in Team],
+    'unit_type': [unit_type.name for unit_type in UnitType],
+    'status': [status.name for status in Status],
+    'action': [action.name for action in Action],
+    'phase': [phase.name for phase in Phase],
+}
+MANIFEST_FILE = 'manifest.json'
+
+
+class SnapshotRecorder:
+    """틱별 유닛 상태 스냅샷을 컬럼형 청크 파일로 기록
+
+    chunk_rows 행 크기의 버퍼가 가득 차면 청크 하나를 디스크에 쓰므로 메모리 사용량은 버퍼 크기로 제한된다.
+    - compress=False: 청크마다 디렉토리(chunk_00000/)에 컬럼별 .npy 파일 저장 (np.load(mmap_mode='r')로 메모리 매핑 가능)
+    - compress=True: 청크마다 컬럼별 배열을 담은 압축 .npz 파일 저장
+    close() 시 컬럼 정보와 enum 코드표를 manifest.json에 기록한다.
+    continue_existing()을 호출하면 output_dir의 기존 기록(체크포인트 이전 구간) 뒤에 청크 번호를 이어서 기록한다.
+    """
+
+    def __init__(self, output_dir: str, chunk_rows: int = 65536, compress: bool = False, interval: float = 1.0):
+        self.output_dir = output_dir
+        self.chunk_rows = chunk_rows
+        self.compress = compress
+        self.interval = interval
+        self.buffer = {name: np.empty(chunk_rows, dtype=dtype) for name, dtype in COLUMNS}
+        self.size = 0
+        self.chunks: List[str] = []
+        self.rows_written = 0
+        self.last_record_time: Optional[float] = None
+        self._codes = {
+            'team': {team: code for code, team in enumerate(Team)},
+            'unit_type': {unit_type: code for code, unit_type in enumerate(UnitType)},
+            'status': {status: code for code, status in enumerate(Status)},
+            'action': {action: code for code, action in enumerate(Action)},
+            'phase': {phase: code for code, phase in enumerate(Phase)},
+        }
+        os.makedirs(output_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> Optional['SnapshotRecorder']:
+        """config.yaml의 recorder 항목으로부터 생성 (비활성화된 경우 None)"""
+        if not config or not config.get('enabled', False):
+            return None
+        return cls(
+            output_dir=config.get('output_dir', 'results/recording'),
+            chunk_rows=config.get('chunk_rows', 65536),
+            compress=config.get('compress', False),
+            interval=config.get('interval', 1.0)
+        )
+
+    def continue_existing(self) -> None:
+        """output_dir에 manifest.json이 있으면 그 청크 목록/행 수/마지막 기록 시간에서 이어서 기록 (simulation.py --resume)"""
+        path = os.path.join(self.output_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        self.chunks = list(manifest['chunks'])
+        self.rows_written = manifest['rows']
+        self.last_record_time = manifest.get('last_time')  # 체크포인트 시점의 틱을 다시 기록하지 않음
+
+    def record(self, current_time: float, units: List[Unit], commands: Dict[Team, Command]) -> None:
+        """현재 시간의 모든 유닛 상태 기록 (interval 간격으로만)"""
+        if self.last_record_time is not None and current_time - self.last_record_time < self.interval:
+            return
+        self.last_record_time = current_time
+
+        codes = self._codes
+        phase_codes = {team: codes['phase'][command.phase] for team, command in commands.items()}
+        for unit in units:
+            if self.size == self.chunk_rows:
+                self.flush()
+            row = self.size
+            buffer = self.buffer
+            buffer['time'][row] = current_time
+            buffer['unit_id'][row] = unit.id
+            buffer['team'][row] = codes['team'][unit.team]
+            buffer['unit_type'][row] = codes['unit_type'][unit.unit_type]
+            buffer['x'][row] = unit.position[0]
+            buffer['y'][row] = unit.position[1]
+            buffer['status'][row] = codes['status'][unit.status]
+            buffer['action'][row] = codes['action'][unit.action]
+            buffer['target'][row] = unit.target if unit.target is not None else -1
+            buffer['phase'][row] = phase_codes.get(unit.team, -1)
+            self.size += 1
+
+    def flush(self) -> None:
+        """버퍼의 내용을 청크 파일로 기록"""
+        if self.size == 0:
+            return
+        name = f"chunk_{len(self.chunks):05d}"
+        columns = {column: self.buffer[column][:self.size] for column, _ in COLUMNS}
+        if self.compress:
+            name += '.npz'
+            np.savez_compressed(os.path.join(self.output_dir, name), **columns)
+        else:
+            chunk_dir = os.path.join(self.output_dir, name)
+            os.makedirs(chunk_dir, exist_ok=True)
+            for column, values in columns.items():
+                np.save(os.path.join(chunk_dir, f"{column}.npy"), values)
+        self.chunks.append(name)
+        self.rows_written += self.size
+        self.size = 0
+
+    def close(self) -> None:
+        """남은 버퍼를 기록하고 manifest.json 저장"""
+        self.flush()
+        manifest = {
+            'columns': [[name, np.dtype(dtype).str] for name, dtype in COLUMNS],
+            'enum_codes': ENUM_CODES,
+            'chunks': self.chunks,
+            'rows': self.rows_written,
+            'last_time': self.last_record_time,
+        }
+        with open(os.path.join(self.output_dir, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def iter_chunks(output_dir: str, columns: Optional[List[str]] = None,
+                mmap_mode: Optional[str] = 'r') -> Iterator[Dict[str, np.ndarray]]:
+    """기록된 청크를 순서대로 {컬럼: 배열} 형태로 반환
+
+    비압축 청크는 mmap_mode로 메모리 매핑하여 필요한 컬럼만 읽는다.
+    """
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'r') as f:
+        manifest = json.load(f)
+    columns = columns or [name for name, _ in manifest['columns']]
+    for chunk in manifest['chunks']:
+        path = os.path.join(output_dir, chunk)
+        if chunk.endswith('.npz'):
+            with np.load(path) as data:
+                yield {column: data[column] for column in columns}
+        else:
+            yield {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode=mmap_mode) for column in columns}
+
+
+def load_column(output_dir: str, column: str) -> np.ndarray:
+    """모든 청크의 컬럼 하나를 이어붙여 반환"""
+    return np.concatenate([chunk[column] for chunk in iter_chunks(output_dir, [column])])
+
+
+def load_enum_codes(output_dir: str) -> Dict[str, List[str]]:
+    """enum 컬럼의 코드표 (코드 -> 이름 목록) 반환"""
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'r') as f:
+        return json.load(f)['enum_codes']
@@ -0,0 +1,136 @@
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Dict, List, Optional
+from model.command import Phase
+from model.termination import SimulationResult
+from model.unit import Team, UnitType
+
+WINNER_NAMES = ['RED', 'BLUE', 'DRAW']
+
+
+class RunningMoments:
+    """Welford 방식으로 값을 하나씩 더하며 평균/표본분산을 누적 (값을 보관하지 않음)"""
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # 평균과의 차이 제곱합
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def ci_width(self, z: float) -> float:
+        """평균의 정규 근사 신뢰구간 폭 (2 x z x 표준오차, 값이 2개 미만이면 무한대)"""
+        if self.count < 2:
+            return math.inf
+        return 2 * z * self.std / math.sqrt(self.count)
+
+
+class OutcomeAggregator:
+    """반복 실행 결과(SimulationResult)를 하나씩 받아 누적하는 집계기
+
+    승리 팀별 지시값(승률), 팀별 전투력 비율, 종료 시간, 팀/유닛 타입별 생존 유닛 수는 RunningMoments로,
+    팀별 도달 작전단계와 종료 사유는 횟수로 누적하므로 메모리 사용량은 실행 횟수와 관계없다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.wins = {name: RunningMoments() for name in WINNER_NAMES}
+        self.strength = {team: RunningMoments() for team in Team}
+        self.end_time = RunningMoments()
+        self.surviving = {team: {unit_type: RunningMoments() for unit_type in UnitType} for team in Team}
+        self.phases: Dict[Team, Dict[Phase, int]] = {team: {phase: 0 for phase in Phase} for team in Team}
+        self.reasons: Dict[str, int] = {}
+
+    def add(self, result: SimulationResult) -> None:
+        self.count += 1
+        winner = result.winner.value if result.winner else 'DRAW'
+        for name, moments in self.wins.items():
+            moments.add(1.0 if name == winner else 0.0)
+        for team in Team:
+            self.strength[team].add(result.strength[team])
+            for unit_type in UnitType:
+                self.surviving[team][unit_type].add(result.surviving[team][unit_type])
+        self.end_time.add(result.end_time)
+        for team, phase in result.phases.items():
+            self.phases[team][phase] += 1
+        self.reasons[result.reason] = self.reasons.get(result.reason, 0) + 1
+
+    def metric(self, name: str) -> RunningMoments:
+        """이름으로 지표 조회: win_rate.<RED|BLUE|DRAW>, strength.<TEAM>, end_time, surviving.<TEAM>.<UNIT_TYPE>"""
+        parts = name.split('.')
+        if parts[0] == 'win_rate' and len(parts) == 2 and parts[1] in self.wins:
+            return self.wins[parts[1]]
+        if parts[0] == 'strength' and len(parts) == 2:
+            return self.strength[Team[parts[1]]]
+        if parts == ['end_time']:
+            return self.end_time
+        if parts[0] == 'surviving' and len(parts) == 3:
+            return self.surviving[Team[parts[1]]][UnitType[parts[2]]]
+        raise ValueError(f"Unknown metric: {name}")
+
+
+@dataclass
+class StoppingRule:
+    """신뢰구간 폭 기준 순차 종료 규칙 (config.yaml의 replication 항목)
+
+    min_replications 이상 실행한 뒤 metrics의 모든 지표의 신뢰구간 폭이 ci_width 이하이면,
+    또는 max_replications에 도달하면 종료한다. batch_size(0이면 작업자 수)만큼 실행할 때마다 판정한다.
+    승률처럼 처음 몇 번이 모두 같은 값이면 폭이 0이 되므로 min_replications로 너무 이른 종료를 막는다.
+    """
+    ci_width: float = 0.1
+    confidence: float = 0.95
+    metrics: List[str] = field(default_factory=lambda: ['win_rate.BLUE', 'strength.RED', 'strength.BLUE'])
+    min_replications: int = 10
+    max_replications: int = 200
+    batch_size: int = 0
+
+    def __post_init__(self):
+        if self.ci_width <= 0 or not 0 < self.confidence < 1:
+            raise ValueError("replication ci_width must be positive and confidence in (0, 1)")
+        if not 2 <= self.min_replications <= self.max_replications:
+            raise ValueError("replication requires 2 <= min_replications <= max_replications")
+        probe = OutcomeAggregator()
+        for name in self.metrics:
+            probe.metric(name)
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'StoppingRule':
+        """config.yaml의 replication 항목으로부터 생성"""
+        config = config or {}
+        return cls(
+            ci_width=config.get('ci_width', 0.1),
+            confidence=config.get('confidence', 0.95),
+            metrics=list(config.get('metrics', ['win_rate.BLUE', 'strength.RED', 'strength.BLUE'])),
+            min_replications=int(config.get('min_replications', 10)),
+            max_replications=int(config.get('max_replications', 200)),
+            batch_size=int(config.get('batch_size', 0))
+        )
+
+    @property
+    def z(self) -> float:
+        return NormalDist().inv_cdf((1 + self.confidence) / 2)
+
+    def widths(self, aggregator: OutcomeAggregator) -> Dict[str, float]:
+        z = self.z
+        return {name: aggregator.metric(name).ci_width(z) for name in self.metrics}
+
+    def done(self, aggregator: OutcomeAggregator) -> bool:
+        if aggregator.count >= self.max_replications:
+            return True
+        if aggregator.count < self.min_replications:
+            return False
+        return all(width <= self.ci_width for width in self.widths(aggregator).values())
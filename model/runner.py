@@ -0,0 +1,217 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from model.checkpoint import SimulationState, load_checkpoint
+from model.command import Phase
+from model.config import Config
+from model.replication import OutcomeAggregator, StoppingRule
+from model.termination import SimulationResult
+from model.unit import Team, UnitType
+
+
+def run_replication(config: Union[dict, Config], seed: int, max_time: Optional[float] = None,
+                    checkpoint: Optional[str] = None) -> SimulationResult:
+    """헤드리스 시뮬레이션 1회 실행
+
+    checkpoint가 주어지면 체크포인트 상태에서 시작(warm start)하고, 복원 후 seed로 난수(용도별 흐름 포함)를 다시 설정한다.
+    스냅샷 기록(recorder.enabled)을 켜면 실행마다 recording_dir(config, seed)에 따로 기록한다.
+    """
+    from simulation import Simulation  # 최상위 모듈이므로 실행 시점에 불러옴
+
+    config = Config.from_any(config)
+    if config.get_path('recorder.enabled', False):
+        config = config.with_overrides({'recorder.output_dir': recording_dir(config, seed)})
+    random.seed(seed)
+    simulation = Simulation(config, headless=True, verbose=False)
+    if checkpoint:
+        simulation.restore(_load_checkpoint_cached(checkpoint))
+        simulation.reseed(seed)
+    return simulation.run_simulation(max_time)
+
+
+def recording_dir(config: Config, seed: int) -> str:
+    """반복 실행의 스냅샷 기록 디렉토리 (recorder.output_dir/run_<설정 해시>_seed_<시드>)
+
+    스윕 셀/최적화 후보/실험계획 설계점은 설정이, 반복은 시드가 다르므로 병렬 작업자가 같은 디렉토리의
+    청크와 manifest.json을 덮어쓰지 않는다.
+    """
+    payload = json.dumps(config.data, sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:12]
+    return os.path.join(config.get_path('recorder.output_dir', 'results/recording'), f"run_{digest}_seed_{seed}")
+
+
+_checkpoint_cache: Dict[str, SimulationState] = {}
+
+
+def _load_checkpoint_cached(path: str) -> SimulationState:
+    """작업자 프로세스마다 체크포인트 파일을 한 번만 읽음 (복원 시 상태를 복사하므로 공유해도 안전)"""
+    if path not in _checkpoint_cache:
+        _checkpoint_cache[path] = load_checkpoint(path)
+    return _checkpoint_cache[path]
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """파라미터 격자를 모든 조합의 목록으로 확장
+
+    예) {'simulation.lethal_radius': [30, 40], 'num_tank_red': [2, 4]} -> 4개 조합
+    """
+    keys = list(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+@dataclass
+class CellSummary:
+    """파라미터 조합(격자 셀) 하나에 대한 반복 실행 결과 집계"""
+    params: Dict[str, Any]
+    replications: int
+    win_rate: Dict[str, float]  # RED / BLUE / DRAW
+    mean_strength: Dict[Team, float]
+    std_strength: Dict[Team, float]
+    mean_end_time: float
+    mean_surviving: Dict[Team, Dict[UnitType, float]]
+    reasons: Dict[str, int] = field(default_factory=dict)
+    phase_reached: Dict[Team, Dict[Phase, float]] = field(default_factory=dict)  # 종료 시 작전단계별 비율
+    ci_widths: Dict[str, float] = field(default_factory=dict)  # 순차 종료 규칙 지표별 신뢰구간 폭
+
+    @classmethod
+    def from_results(cls, params: Dict[str, Any], results: List[SimulationResult]) -> 'CellSummary':
+        aggregator = OutcomeAggregator()
+        for result in results:
+            aggregator.add(result)
+        return cls.from_aggregator(params, aggregator)
+
+    @classmethod
+    def from_aggregator(cls, params: Dict[str, Any], aggregator: OutcomeAggregator,
+                        stopping: Optional[StoppingRule] = None) -> 'CellSummary':
+        count = aggregator.count
+        return cls(
+            params=params,
+            replications=count,
+            win_rate={name: moments.mean for name, moments in aggregator.wins.items()},
+            mean_strength={team: aggregator.strength[team].mean for team in Team},
+            std_strength={team: aggregator.strength[team].std for team in Team},
+            mean_end_time=aggregator.end_time.mean,
+            mean_surviving={
+                team: {unit_type: aggregator.surviving[team][unit_type].mean for unit_type in UnitType}
+                for team in Team
+            },
+            reasons=dict(aggregator.reasons),
+            phase_reached={team: {phase: reached / count for phase, reached in aggregator.phases[team].items()}
+                           for team in Team} if count else {},
+            ci_widths=stopping.widths(aggregator) if stopping else {}
+        )
+
+    def to_row(self) -> Dict[str, Any]:
+        """CSV 출력을 위한 평탄화된 행"""
+        row = dict(self.params)
+        row['replications'] = self.replications
+        for name, rate in self.win_rate.items():
+            row[f'win_rate_{name}'] = rate
+        for team in Team:
+            row[f'strength_{team.value}_mean'] = self.mean_strength[team]
+            row[f'strength_{team.value}_std'] = self.std_strength[team]
+        row['end_time_mean'] = self.mean_end_time
+        for team in Team:
+            for unit_type in UnitType:
+                row[f'surviving_{team.value}_{unit_type.value}'] = self.mean_surviving[team][unit_type]
+        for team, fractions in self.phase_reached.items():
+            for phase, fraction in fractions.items():
+                row[f'phase_{team.value}_{phase.name}'] = fraction
+        for name, width in self.ci_widths.items():
+            row[f'ci_width_{name}'] = width
+        row['reasons'] = ';'.join(f'{reason}:{count}' for reason, count in sorted(self.reasons.items()))
+        return row
+
+
+def _run_task(task: Tuple[int, dict, int, Optional[float], Optional[str]]) -> Tuple[int, SimulationResult]:
+    """프로세스 풀 작업 단위 (셀 번호, 설정, 시드, 최대 시간, 체크포인트)"""
+    cell_index, config_data, seed, max_time, checkpoint = task
+    return cell_index, run_replication(config_data, seed, max_time, checkpoint)
+
+
+def _stream_results(executor: Optional[ProcessPoolExecutor], tasks: Iterable[tuple],
+                    window: int) -> Iterator[Tuple[int, SimulationResult]]:
+    """작업을 window개까지만 제출해 두고 제출 순서대로 결과를 내보냄 (작업/결과를 한꺼번에 보관하지 않음)"""
+    if executor is None:
+        for task in tasks:
+            yield _run_task(task)
+        return
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(_run_task, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def run_sweep(base_config: Union[str, dict, Config], grid: Dict[str, List[Any]], replications: int = 1,
+              workers: int = 1, base_seed: int = 0, max_time: Optional[float] = None,
+              checkpoint: Optional[str] = None, stopping: Optional[StoppingRule] = None,
+              antithetic: bool = False) -> List[CellSummary]:
+    """파라미터 격자의 모든 조합을 반복 실행하고 셀별로 집계
+
+    모든 셀이 같은 시드 목록(base_seed + 반복 번호)을 사용하므로 셀 간 비교 시 난수 조건이 같다.
+    workers > 1이면 프로세스 풀에서 병렬로 실행한다.
+    checkpoint가 주어지면 모든 반복 실행이 체크포인트 상태에서 시작한다.
+    stopping이 주어지면 replications 대신 셀마다 순차 종료 규칙을 만족할 때까지 묶음 단위로 반복한다.
+    결과는 도착하는 대로 셀별 OutcomeAggregator에 누적하므로 메모리 사용량은 반복 횟수와 관계없다.
+    antithetic=True면 용도별 난수 흐름(model/streams.py)을 켜고 반복 2k, 2k+1을 시드 base_seed + k의
+    일반/대조(antithetic) 실행 쌍으로 만든다 (신뢰구간은 각 실행을 독립으로 보고 계산하므로 보수적).
+    짝이 없는 실행이 남지 않도록 이때 replications(stopping이 있으면 max_replications)는 짝수여야 한다.
+    """
+    if antithetic and (stopping.max_replications if stopping else replications) % 2:
+        raise ValueError("antithetic sweeps need an even replications / max_replications (plain/antithetic pairs)")
+    base_config = Config.from_any(base_config)
+    cells = expand_grid(grid)
+    if antithetic:
+        configs = [[base_config.with_overrides({**params, 'rng.streams': True, 'rng.antithetic': flag}).to_dict()
+                    for flag in (False, True)] for params in cells]
+    else:
+        configs = [base_config.with_overrides(params).to_dict() for params in cells]
+
+    def task(cell_index: int, replication: int) -> tuple:
+        if antithetic:
+            config_data, seed = configs[cell_index][replication % 2], base_seed + replication // 2
+        else:
+            config_data, seed = configs[cell_index], base_seed + replication
+        return cell_index, config_data, seed, max_time, checkpoint
+
+    aggregators = [OutcomeAggregator() for _ in cells]
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    window = 4 * max(workers, 1)
+    try:
+        if stopping is None:
+            tasks = (task(cell_index, replication)
+                     for cell_index in range(len(cells))
+                     for replication in range(replications))
+            for cell_index, result in _stream_results(executor, tasks, window):
+                aggregators[cell_index].add(result)
+        else:
+            # 판정 시점이 실행 환경에 따라 바뀌지 않도록 묶음 크기는 batch_size(0이면 작업자 수)로 고정
+            batch_size = stopping.batch_size or max(workers, 1)
+            active = list(range(len(cells)))
+            while active:
+                tasks = []
+                for cell_index in active:
+                    done = aggregators[cell_index].count
+                    target = max(done + batch_size, stopping.min_replications)
+                    if antithetic:
+                        target += target % 2  # 짝을 나누지 않음
+                    target = min(target, stopping.max_replications)
+                    tasks.extend(task(cell_index, replication) for replication in range(done, target))
+                for cell_index, result in _stream_results(executor, tasks, window):
+                    aggregators[cell_index].add(result)
+                active = [cell_index for cell_index in active if not stopping.done(aggregators[cell_index])]
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return [CellSummary.from_aggregator(params, aggregators[cell_index], stopping)
+            for cell_index, params in enumerate(cells)]
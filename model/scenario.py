@@ -0,0 +1,192 @@
+import csv
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from model.config import Config
+from model.terrain import Terrain
+from model.unit import Team, UnitType, UnitList, build_units
+
+# config.yaml의 유닛 수 키 (num_<key>_<team>) 와 유닛 생성 순서
+CONFIG_UNIT_ORDER = [
+    (UnitType.ARTILLERY, 'artillery'),
+    (UnitType.DRONE, 'drone'),
+    (UnitType.TANK, 'tank'),
+    (UnitType.ANTI_TANK, 'at'),
+    (UnitType.RIFLE, 'infantry'),
+    (UnitType.COMMAND_POST, 'cp'),
+]
+TEAMS = list(Team)
+UNIT_TYPES = list(UnitType)
+CSV_COLUMNS = ['team', 'unit_type', 'x', 'y']
+
+
+@dataclass
+class Formation:
+    """절차적 배치 단위: center 중심의 size(폭, 높이) 사각형 안 유효 지형 칸에 count개 유닛을 무작위 배치"""
+    team: Team
+    unit_type: UnitType
+    count: int
+    center: Tuple[float, float]
+    size: Tuple[float, float] = (50.0, 50.0)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Formation':
+        return cls(Team[data['team']], UnitType[data['unit_type']], int(data['count']),
+                   tuple(data['center']), tuple(data.get('size', (50.0, 50.0))))
+
+
+@dataclass
+class Scenario:
+    """유닛 초기 배치 (유닛 하나가 한 행인 컬럼형 배열, 유닛 id는 행 순서)
+
+    - team, unit_type: list(Team), list(UnitType)에서의 순서(code, int8)
+    - x, y: 정수 픽셀 좌표 (int32)
+    .npz(압축 이진) 또는 .csv(team,unit_type,x,y 이름/좌표)로 저장하고 불러온다.
+    """
+    team: np.ndarray
+    unit_type: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+
+    def __post_init__(self):
+        self.team = np.asarray(self.team, dtype=np.int8)
+        self.unit_type = np.asarray(self.unit_type, dtype=np.int8)
+        self.x = np.asarray(self.x, dtype=np.int32)
+        self.y = np.asarray(self.y, dtype=np.int32)
+        size = len(self.team)
+        if not (len(self.unit_type) == len(self.x) == len(self.y) == size):
+            raise ValueError("Scenario columns must have the same length")
+        if size and (self.team.min() < 0 or self.team.max() >= len(TEAMS)
+                     or self.unit_type.min() < 0 or self.unit_type.max() >= len(UNIT_TYPES)):
+            raise ValueError("Scenario has an unknown team or unit type code")
+
+    def __len__(self) -> int:
+        return len(self.team)
+
+    @classmethod
+    def empty(cls) -> 'Scenario':
+        return cls([], [], [], [])
+
+    @classmethod
+    def concat(cls, scenarios: Sequence['Scenario']) -> 'Scenario':
+        if not scenarios:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(scenario, name) for scenario in scenarios])
+                     for name in ['team', 'unit_type', 'x', 'y']))
+
+    @classmethod
+    def from_config(cls, config: Config, log: Optional[Callable[[str], None]] = None) -> 'Scenario':
+        """config.yaml의 initial_positions와 num_* 유닛 수로 구성 (위치가 모자라면 있는 만큼만 배치)"""
+        team_codes, type_codes, positions = [], [], []
+        for team in [Team.RED, Team.BLUE]:
+            for unit_type, key in CONFIG_UNIT_ORDER:
+                requested = config.get(f"num_{key}_{team.value.lower()}", 0)
+                available = config['initial_positions'][team.value].get(unit_type.value) or []
+                if len(available) < requested and log:
+                    log(f"Warning: Not enough positions for {team.value} {unit_type.value}. Requested {requested}, but only {len(available)} positions available.")
+                placed = available[:requested]
+                team_codes += [TEAMS.index(team)] * len(placed)
+                type_codes += [UNIT_TYPES.index(unit_type)] * len(placed)
+                positions += [(int(pos[0]), int(pos[1])) for pos in placed]
+        xy = np.array(positions, dtype=np.int32).reshape(-1, 2)
+        return cls(team_codes, type_codes, xy[:, 0], xy[:, 1])
+
+    def counts(self) -> Dict[Tuple[Team, UnitType], int]:
+        """(팀, 유닛 타입)별 유닛 수"""
+        pairs, counts = np.unique(self.team.astype(np.int32) * len(UNIT_TYPES) + self.unit_type, return_counts=True)
+        return {(TEAMS[pair // len(UNIT_TYPES)], UNIT_TYPES[pair % len(UNIT_TYPES)]): int(count)
+                for pair, count in zip(pairs.tolist(), counts.tolist())}
+
+    def build_units(self, pixel_to_meter_scale: float, first_id: int = 0) -> UnitList:
+        """배치대로 유닛 목록을 한 번에 생성"""
+        teams = [TEAMS[code] for code in self.team.tolist()]
+        unit_types = [UNIT_TYPES[code] for code in self.unit_type.tolist()]
+        positions = list(zip(self.x.tolist(), self.y.tolist()))
+        return build_units(teams, unit_types, positions, pixel_to_meter_scale, first_id)
+
+    def save(self, path: str) -> None:
+        """.csv면 텍스트, 그 외에는 압축 .npz로 저장"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if path.endswith('.csv'):
+            team_names = np.array([team.name for team in TEAMS])[self.team]
+            type_names = np.array([unit_type.name for unit_type in UNIT_TYPES])[self.unit_type]
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_COLUMNS)
+                writer.writerows(zip(team_names.tolist(), type_names.tolist(), self.x.tolist(), self.y.tolist()))
+        else:
+            with open(path, 'wb') as f:
+                np.savez_compressed(f, team=self.team, unit_type=self.unit_type, x=self.x, y=self.y,
+                                    team_names=[team.name for team in TEAMS],
+                                    unit_type_names=[unit_type.name for unit_type in UNIT_TYPES])
+
+    @classmethod
+    def load(cls, path: str) -> 'Scenario':
+        """save()로 저장한 .npz 또는 .csv 파일 불러오기"""
+        if path.endswith('.csv'):
+            team_index = {team.name: code for code, team in enumerate(TEAMS)}
+            type_index = {unit_type.name: code for code, unit_type in enumerate(UNIT_TYPES)}
+            with open(path, newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                if header != CSV_COLUMNS:
+                    raise ValueError(f"Scenario CSV header must be {','.join(CSV_COLUMNS)}, got {','.join(header)}")
+                rows = list(reader)
+            if not rows:
+                return cls.empty()
+            teams, unit_types, xs, ys = zip(*rows)
+            return cls([team_index[name] for name in teams], [type_index[name] for name in unit_types],
+                       np.array(xs, dtype=np.int32), np.array(ys, dtype=np.int32))
+        with np.load(path) as data:
+            # 저장 시점의 enum 순서를 현재 순서로 다시 매핑
+            team_map = np.array([TEAMS.index(Team[name]) for name in data['team_names']])
+            type_map = np.array([UNIT_TYPES.index(UnitType[name]) for name in data['unit_type_names']])
+            return cls(team_map[data['team']], type_map[data['unit_type']], data['x'], data['y'])
+
+
+def generate(terrain: Terrain, formations: List[Formation], seed: Optional[int] = None,
+             avoid: Sequence[str] = ('river',)) -> Scenario:
+    """지형 분류(Terrain.terrain_type_mask)로 avoid 지형을 피해 편성별로 유닛을 배치한 시나리오 생성
+
+    편성 사각형 안의 유효 칸 수가 count 이상이면 서로 다른 칸에, 모자라면 칸을 중복해서 배치한다.
+    유효 칸이 하나도 없으면 ValueError.
+    """
+    rng = np.random.default_rng(seed)
+    height, width = terrain.dem_data.shape
+    valid = ~terrain.terrain_type_mask(avoid)
+    parts = []
+    for formation in formations:
+        cx, cy = formation.center
+        half_width, half_height = formation.size[0] / 2, formation.size[1] / 2
+        x0, x1 = max(int(cx - half_width), 0), min(int(cx + half_width) + 1, width)
+        y0, y1 = max(int(cy - half_height), 0), min(int(cy + half_height) + 1, height)
+        cell_y, cell_x = np.nonzero(valid[y0:max(y1, y0), x0:max(x1, x0)])
+        if len(cell_x) == 0:
+            raise ValueError(f"No valid terrain for {formation.team.value} {formation.unit_type.value} "
+                             f"formation at {formation.center} (size {formation.size})")
+        chosen = rng.choice(len(cell_x), size=formation.count, replace=formation.count > len(cell_x))
+        parts.append(Scenario(np.full(formation.count, TEAMS.index(formation.team)),
+                              np.full(formation.count, UNIT_TYPES.index(formation.unit_type)),
+                              cell_x[chosen] + x0, cell_y[chosen] + y0))
+    return Scenario.concat(parts)
+
+
+def scaled_formations(config: Config, multiplier: float, margin: float = 20.0) -> List[Formation]:
+    """config.yaml의 초기 배치를 유닛 수 multiplier배로 키운 편성 (부하 시험용)
+
+    (팀, 유닛 타입)별로 초기 위치들의 경계 사각형(+margin)을 편성 영역으로 쓰고,
+    영역 넓이도 유닛 수에 비례하도록 변마다 sqrt(multiplier)배로 넓힌다.
+    """
+    formations = []
+    for team in [Team.RED, Team.BLUE]:
+        for unit_type, key in CONFIG_UNIT_ORDER:
+            requested = config.get(f"num_{key}_{team.value.lower()}", 0)
+            positions = np.array(config['initial_positions'][team.value].get(unit_type.value) or [], dtype=float)
+            count = int(round(requested * multiplier))
+            if count == 0 or len(positions) == 0:
+                continue
+            low, high = positions.min(axis=0), positions.max(axis=0)
+            size = (high - low + 2 * margin) * np.sqrt(max(multiplier, 1.0))
+            formations.append(Formation(team, unit_type, count, tuple((low + high) / 2), tuple(size)))
+    return formations
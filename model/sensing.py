@@ -0,0 +1,149 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from model.config import Config
+from model.detect import DETECTABLE_STATUSES
+from model.function import calculate_distances
+from model.unit import Unit, Team, UnitType
+
+# LOS를 확인하는 직사화기 유닛 타입 (Fire.update_eligible_targets와 같음)
+DIRECT_FIRE_TYPES = [UnitType.RIFLE, UnitType.TANK, UnitType.ANTI_TANK, UnitType.COMMAND_POST]
+
+
+@dataclass
+class ParallelSettings:
+    """관측 유닛 묶음 병렬 처리 설정 (config.yaml의 parallel 항목)
+
+    - workers: 탐지/사격 가능 타겟 계산 스레드 수 (0이면 사용하지 않고 유닛별로 차례로 처리, 'auto'면 CPU 코어 수)
+    - block_size: 스레드 하나가 한 번에 처리하는 관측 유닛 수
+    - min_units: 유닛이 이보다 적으면 NumPy 준비 비용이 더 커서 유닛별로 차례로 처리
+    """
+    workers: int = 0
+    block_size: int = 32
+    min_units: int = 200
+
+    def __post_init__(self):
+        if self.workers < 0 or self.block_size < 1:
+            raise ValueError("parallel workers must be >= 0 and block_size >= 1")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'ParallelSettings':
+        """config.yaml의 parallel 항목으로부터 생성"""
+        config = config or {}
+        workers = config.get('workers', 0)
+        if workers == 'auto':
+            workers = os.cpu_count() or 1
+        return cls(workers=int(workers), block_size=int(config.get('block_size', 32)),
+                   min_units=int(config.get('min_units', 200)))
+
+
+class UnitArrays:
+    """한 틱의 탐색/사격 가능 타겟 계산에 쓰는 유닛 위치/상태 배열 (유닛 목록 순서)"""
+
+    def __init__(self, units: List[Unit]):
+        self.units = units
+        self.xs = np.array([unit.position[0] for unit in units], dtype=float)
+        self.ys = np.array([unit.position[1] for unit in units], dtype=float)
+        self.detectability = np.array([unit.detectability for unit in units], dtype=float)
+        self.unit_types = [unit.unit_type for unit in units]
+        self.is_tank = np.array([unit_type == UnitType.TANK for unit_type in self.unit_types], dtype=bool)
+        self.detectable = np.array([unit.status in DETECTABLE_STATUSES for unit in units], dtype=bool)
+        teams = np.array([unit.team == Team.RED for unit in units], dtype=bool)
+        # 관측 팀별 탐지 대상(적 팀이고 탐지 대상 상태인 유닛)
+        self.enemies = {Team.RED: self.detectable & ~teams, Team.BLUE: self.detectable & teams}
+        # 유닛 id가 목록 순서와 같으면(시나리오로 만든 유닛) id를 그대로 인덱스로 사용
+        self.indexes = None
+        if any(unit.id != index for index, unit in enumerate(units)):
+            self.indexes = {unit.id: index for index, unit in enumerate(units)}
+
+    def lookup(self, unit_ids: List[int]) -> np.ndarray:
+        """유닛 id들의 목록 내 인덱스 (없는 id는 제외)"""
+        if self.indexes is None:
+            indexes = np.fromiter(unit_ids, dtype=int, count=len(unit_ids))
+            return indexes[(indexes >= 0) & (indexes < len(self.units))]
+        return np.array([self.indexes[unit_id] for unit_id in unit_ids if unit_id in self.indexes], dtype=int)
+
+
+class ParallelSensing:
+    """관측 유닛을 묶음으로 나누어 탐색과 사격 가능 타겟의 거리/LOS 계산을 스레드 풀에서 실행
+
+    묶음별 계산은 난수를 쓰지 않는 NumPy 연산(거리 필터, Detect.check_los_many)이고 Python 계산과 같은 값을 내며,
+    지형 탐지 확률 난수, 추적/탐지 목록/표적 후보 색인 갱신은 계산이 끝난 뒤 관측 유닛 순서대로 한 스레드에서 합친다.
+    따라서 결과는 스레드 수와 관계없이 유닛별로 차례로 처리한 것과 같다.
+    """
+
+    def __init__(self, config: Config, detect, fire):
+        self.config = Config.from_any(config)
+        self.settings = ParallelSettings.from_config(self.config.get('parallel'))
+        self.detect = detect
+        self.fire = fire
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    def enabled(self, units: List[Unit]) -> bool:
+        """units 규모에서 묶음 처리를 쓸지"""
+        return self.settings.workers > 0 and len(units) >= self.settings.min_units
+
+    def _map(self, function: Callable, items: list) -> list:
+        """items를 block_size 묶음으로 나누어 function(묶음)을 실행하고 결과를 items 순서로 이어 붙임"""
+        size = self.settings.block_size
+        blocks = [items[start:start + size] for start in range(0, len(items), size)]
+        if self.settings.workers == 1 or len(blocks) <= 1:
+            results = [function(block) for block in blocks]
+        else:
+            # os.fork로 만든 자식 프로세스에는 부모의 스레드가 없으므로 풀을 새로 만듦
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(self.settings.workers, thread_name_prefix='sensing')
+                self._executor_pid = os.getpid()
+            results = list(self._executor.map(function, blocks))
+        return [result for block_results in results for result in block_results]
+
+    def _visible_enemies(self, observer: Unit, arrays: UnitArrays) -> np.ndarray:
+        """관측 유닛의 탐지 거리 안에 있고 LOS가 확보된 표적의 유닛 인덱스 (Detect.detect_target의 1~3단계)"""
+        distances = calculate_distances(observer.position, arrays.xs, arrays.ys)
+        in_range = arrays.enemies[observer.team] & (distances <= observer.detect_range * arrays.detectability)
+        candidates = np.flatnonzero(in_range)
+        return candidates[self.detect.check_los_many(observer, arrays.xs[candidates], arrays.ys[candidates])]
+
+    def scan(self, observers: List[Unit], units: List[Unit], current_time: float) -> None:
+        """observers의 탐색 1회씩 (Detect.update_detection을 observers 순서로 호출한 것과 같은 결과)"""
+        if not observers:
+            return
+        arrays = UnitArrays(units)
+        visible = self._map(lambda block: [self._visible_enemies(observer, arrays) for observer in block], observers)
+        for observer, candidates in zip(observers, visible):
+            self.detect.record_detections(observer, [units[index] for index in candidates.tolist()], current_time)
+
+    def _eligible_targets(self, unit: Unit, arrays: UnitArrays) -> List[Tuple[int, UnitType, float]]:
+        """Fire.update_eligible_targets와 같은 조건(상태, 소총의 전차 제외, 사거리, 직사화기 LOS)의 (표적 id, 유닛 타입, 거리)"""
+        if not unit.target_list:
+            return []
+        indexes = arrays.lookup(list(unit.target_list))  # target_list 순회 순서 유지
+        distances = calculate_distances(unit.position, arrays.xs[indexes], arrays.ys[indexes])
+        eligible = arrays.detectable[indexes] & (distances <= unit.weapon_range)
+        if unit.unit_type == UnitType.RIFLE:
+            eligible &= ~arrays.is_tank[indexes]
+        if unit.unit_type in DIRECT_FIRE_TYPES:
+            selected = np.flatnonzero(eligible)
+            eligible[selected] = self.detect.check_los_many(unit, arrays.xs[indexes[selected]],
+                                                            arrays.ys[indexes[selected]])
+        selected = np.flatnonzero(eligible)
+        return [(arrays.units[index].id, arrays.unit_types[index], distance)
+                for index, distance in zip(indexes[selected].tolist(), distances[selected].tolist())]
+
+    def update_eligible_targets(self, units_to_update: List[Unit], units: List[Unit]) -> None:
+        """units_to_update의 사격 가능 타겟 갱신 (Fire.update_eligible_targets를 차례로 호출한 것과 같은 결과)"""
+        if not units_to_update:
+            return
+        arrays = UnitArrays(units)
+        eligible = self._map(lambda block: [self._eligible_targets(unit, arrays) for unit in block],
+                             list(units_to_update))
+        for unit, targets in zip(units_to_update, eligible):
+            self.fire.set_eligible_targets(unit, targets)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
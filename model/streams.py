@@ -0,0 +1,132 @@
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+# 용도별 난수 흐름
+# - fire_interval: 사격 소요시간 (Unit.get_fire_interval)
+# - impact: 곡사화기 탄착 오차 (Fire.calculate_impact_point)
+# - hit: 직사화기 명중 판정 (사격 유닛별)
+# - kill: 직사화기 피해 상태 판정 (사격 유닛별)
+# - artillery_damage: 곡사화기 피해 여부/피해 상태 판정 (피격 유닛별)
+# - detection: 산악 지형 탐지 확률 판정
+# - target: 포병 우선순위 표적 선택 (TargetIndex.priority_target)
+# - objective: 지상 유닛 기동 목표 오차 (Movement.get_objective)
+STREAM_PURPOSES = ('fire_interval', 'impact', 'hit', 'kill', 'artillery_damage', 'detection', 'target', 'objective')
+# 대조 변량(antithetic)을 적용하는 균등분포 판정 흐름 (Fire.fire, Fire.apply_artillery_damage)
+ANTITHETIC_PURPOSES = ('hit', 'kill', 'artillery_damage')
+
+_MASK64 = (1 << 64) - 1
+
+
+@dataclass
+class StreamSettings:
+    """용도별 난수 흐름 설정 (config.yaml의 rng 항목)
+
+    - streams: 사격 소요시간/탄착/명중/피해/탐지 판정, 포병 표적 선택, 기동 목표 오차에 (용도, 유닛)별 난수 흐름을 사용
+      (False면 모두 전역 random 모듈을 사용하며 이전 결과와 같음)
+    - antithetic: hit/kill 흐름의 균등난수 u 대신 1 - u 사용 (같은 시드의 일반 실행과 짝을 이루는 실행)
+    """
+    streams: bool = False
+    antithetic: bool = False
+
+    def __post_init__(self):
+        if self.antithetic and not self.streams:
+            raise ValueError("rng antithetic requires rng streams")
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'StreamSettings':
+        """config.yaml의 rng 항목으로부터 생성"""
+        config = config or {}
+        return cls(streams=config.get('streams', False), antithetic=config.get('antithetic', False))
+
+
+class Substream:
+    """카운터 기반 난수 흐름 하나 (splitmix64(흐름 키 + 카운터))
+
+    Mersenne Twister(약 2.5KB)와 달리 상태가 카운터 하나뿐이므로 유닛마다 흐름을 두어도 메모리가 거의 들지 않는다.
+    uniform/triangular/gauss는 random.Random의 구현을 그대로 쓰므로 random()만 바꾸면 분포가 같이 바뀐다.
+    """
+    __slots__ = ('key', 'counter', 'antithetic', 'gauss_next')
+
+    def __init__(self, key: int, antithetic: bool = False):
+        self.key = key
+        self.counter = 0
+        self.antithetic = antithetic
+        self.gauss_next = None  # random.Random.gauss가 두 번째 표본을 보관하는 속성
+
+    # random()을 쓰는 random.Random의 분포 구현 (random() 정의보다 앞에 두어야 random 모듈을 가리킴)
+    uniform = random.Random.uniform
+    triangular = random.Random.triangular
+    gauss = random.Random.gauss
+
+    def random(self) -> float:
+        self.counter += 1
+        z = (self.key + self.counter * 0x9E3779B97F4A7C15) & _MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        u = ((z ^ (z >> 31)) >> 11) * (1.0 / (1 << 53))
+        return 1.0 - u if self.antithetic else u
+
+    def choice(self, seq):
+        """seq에서 하나 선택 (random.Random.choice는 getrandbits를 쓰므로 random()으로 색인)"""
+        return seq[min(int(self.random() * len(seq)), len(seq) - 1)]
+
+
+class RandomStreams:
+    """(용도, 유닛)별 난수 흐름 (공통 난수: 같은 시드의 두 설정에서 같은 유닛의 같은 용도 k번째 난수가 같음)
+
+    설정이 바뀌어 어떤 유닛/용도의 난수를 더 많이/적게 뽑아도 다른 흐름은 어긋나지 않으므로,
+    설정 간 비교(예: lethal_radius 30 vs 40)의 차이 추정 분산이 줄어든다.
+    streams가 꺼져 있으면 get()은 전역 random 모듈을 반환한다.
+    """
+
+    def __init__(self, settings: Optional[StreamSettings] = None):
+        self.settings = settings or StreamSettings()
+        self._seed = 0
+        self._streams: Dict[Tuple[str, Hashable], Substream] = {}
+        self.seed_from_global()
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'RandomStreams':
+        return cls(StreamSettings.from_config(config))
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.streams
+
+    def get(self, purpose: str, key: Hashable = None):
+        """purpose 용도의 key(유닛 id 등) 흐름 (흐름을 쓰지 않으면 random 모듈)"""
+        if not self.enabled:
+            return random
+        stream = self._streams.get((purpose, key))
+        if stream is None:
+            digest = hashlib.blake2b(f"{self._seed}:{purpose}:{key}".encode(), digest_size=8).digest()
+            stream = Substream(int.from_bytes(digest, 'little'),
+                               self.settings.antithetic and purpose in ANTITHETIC_PURPOSES)
+            self._streams[(purpose, key)] = stream
+        return stream
+
+    def seed(self, seed: int) -> None:
+        """모든 흐름을 seed로 다시 시작"""
+        self._seed = seed
+        self._streams = {}
+
+    def seed_from_global(self) -> None:
+        """전역 random에서 뽑은 값으로 시드 (random.seed 후 호출하면 그 시드로 재현됨, 흐름을 쓰지 않으면 난수를 뽑지 않음)"""
+        if self.enabled:
+            self.seed(random.getrandbits(64))
+
+    def get_state(self) -> Optional[tuple]:
+        if not self.enabled:
+            return None
+        return self._seed, {key: (stream.counter, stream.gauss_next) for key, stream in self._streams.items()}
+
+    def set_state(self, state: Optional[tuple]) -> None:
+        if not self.enabled or state is None:
+            return
+        seed, counters = state
+        self.seed(seed)
+        for (purpose, key), (counter, gauss_next) in counters.items():
+            stream = self.get(purpose, key)
+            stream.counter, stream.gauss_next = counter, gauss_next
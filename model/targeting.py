@@ -0,0 +1,101 @@
+import heapq
+import random
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+from model.unit import UnitType
+
+
+class TargetIndex:
+    """유닛 하나의 사격 가능 표적 후보
+
+    Fire.set_eligible_targets에서 사격 가능 표적 목록이 바뀔 때마다 바뀐 표적만 추가/제거/거리 갱신하며,
+    - by_priority: fire_priority 값별 표적 id 정렬 목록 (포병의 우선순위 표적 선정용)
+    - nearest: (거리, 표적 id) 최소 힙 (직사화기의 최근접 표적 선정용, 제거/거리 변경된 항목은 꺼낼 때 버림)
+    을 유지하므로 표적 선정은 맨 앞 항목 확인으로 끝난다.
+    fire_priority는 작전단계 변경이나 명령 재정의 때만 바뀌므로 by_priority는 선정 시점의 fire_priority가
+    마지막으로 나눈 기준과 다를 때만 다시 나눈다.
+    """
+    __slots__ = ('types', 'distances', 'nearest', 'by_priority', 'fire_priority')
+
+    def __init__(self):
+        self.types: Dict[int, UnitType] = {}  # 표적 id별 유닛 타입
+        self.distances: Dict[int, float] = {}  # 표적 id별 현재 거리 (nearest의 유효 항목 판별)
+        self.nearest: List[Tuple[float, int]] = []
+        self.by_priority: Dict[int, List[int]] = {}
+        self.fire_priority: Optional[Dict[UnitType, int]] = None  # by_priority를 나눈 기준 (None이면 아직 나누지 않음)
+
+    @classmethod
+    def from_candidates(cls, candidates: List[Tuple[int, UnitType, float]]) -> 'TargetIndex':
+        """(표적 id, 유닛 타입, 거리) 목록으로 한 번에 생성 (add를 차례로 호출한 것과 같은 선정 결과)"""
+        index = cls()
+        index.update(candidates)
+        return index
+
+    def _priority(self, unit_type: UnitType) -> int:
+        return self.fire_priority.get(unit_type, 0)
+
+    def add(self, target_id: int, unit_type: UnitType, distance: float) -> None:
+        """표적 후보 추가 (이미 있으면 거리만 갱신)"""
+        if target_id in self.types:
+            self.move(target_id, distance)
+            return
+        self.types[target_id] = unit_type
+        self.distances[target_id] = distance
+        heapq.heappush(self.nearest, (distance, target_id))
+        if self.fire_priority is not None:
+            insort(self.by_priority.setdefault(self._priority(unit_type), []), target_id)
+
+    def remove(self, target_id: int) -> None:
+        """표적 후보 제거 (힙 항목은 nearest_target에서 버림)"""
+        unit_type = self.types.pop(target_id, None)
+        if unit_type is None:
+            return
+        del self.distances[target_id]
+        if self.fire_priority is not None:
+            priority = self._priority(unit_type)
+            bucket = self.by_priority[priority]
+            del bucket[bisect_left(bucket, target_id)]
+            if not bucket:
+                del self.by_priority[priority]
+
+    def move(self, target_id: int, distance: float) -> None:
+        """표적 후보의 거리 갱신 (이전 힙 항목은 nearest_target에서 버림)"""
+        if self.distances[target_id] != distance:
+            self.distances[target_id] = distance
+            heapq.heappush(self.nearest, (distance, target_id))
+
+    def update(self, candidates: List[Tuple[int, UnitType, float]]) -> None:
+        """사격 가능 표적을 candidates((표적 id, 유닛 타입, 거리) 목록)로 맞춤 (바뀐 표적만 추가/제거/거리 갱신)"""
+        current = {target_id for target_id, _, _ in candidates}
+        for target_id in [target_id for target_id in self.types if target_id not in current]:
+            self.remove(target_id)
+        for target_id, unit_type, distance in candidates:
+            self.add(target_id, unit_type, distance)
+        # 버릴 항목이 유효 항목보다 많아지면 힙을 다시 만들어 크기를 제한
+        if len(self.nearest) > 2 * len(self.distances) + 16:
+            self.nearest = [(distance, target_id) for target_id, distance in self.distances.items()]
+            heapq.heapify(self.nearest)
+
+    def __bool__(self) -> bool:
+        return bool(self.types)
+
+    def nearest_target(self) -> Optional[int]:
+        """가장 가까운 표적 id"""
+        nearest, distances = self.nearest, self.distances
+        while nearest and distances.get(nearest[0][1]) != nearest[0][0]:
+            heapq.heappop(nearest)
+        return nearest[0][1] if nearest else None
+
+    def priority_target(self, fire_priority: Dict[UnitType, int], rng=None) -> Optional[int]:
+        """fire_priority 값이 가장 낮은(우선순위가 가장 높은) 유닛 타입들의 표적 중 무작위 선택 (rng: 기본값 random 모듈)"""
+        if not self.types:
+            return None
+        if fire_priority != self.fire_priority:
+            self.fire_priority = dict(fire_priority)
+            self.by_priority = {}
+            for target_id, unit_type in self.types.items():
+                self.by_priority.setdefault(self._priority(unit_type), []).append(target_id)
+            for bucket in self.by_priority.values():
+                bucket.sort()
+        # 후보는 id 순으로 정렬되어 있으므로 표적 집합(set)의 순회 순서와 무관하게 같은 선택 (체크포인트 복원 후에도 같음)
+        return (rng or random).choice(self.by_priority[min(self.by_priority)])
@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from model.unit import Unit, Team, UnitType
+from model.command import Command, Phase
+
+
+def team_strength(units: List[Unit], team: Team) -> float:
+    """팀의 전투력 비율 (사격 가능한 유닛 수 / 전체 유닛 수)"""
+    team_units = [unit for unit in units if unit.team == team]
+    if not team_units:
+        return 0.0
+    return sum(1 for unit in team_units if unit.can_fire()) / len(team_units)
+
+
+def surviving_units(units: List[Unit]) -> Dict[Team, Dict[UnitType, int]]:
+    """팀/유닛 타입별 사격 가능한 유닛 수"""
+    counts = {team: {unit_type: 0 for unit_type in UnitType} for team in Team}
+    for unit in units:
+        if unit.can_fire():
+            counts[unit.team][unit.unit_type] += 1
+    return counts
+
+
+@dataclass
+class TerminationCriteria:
+    """시뮬레이션 조기 종료 조건
+
+    각 조건은 설정된 경우에만 검사하며, 하나라도 만족하면 종료한다.
+    - strength_threshold: 어느 한 팀의 전투력 비율이 이 값 미만이면 종료 (0~1)
+    - command_posts_neutralized: 'both'면 양 팀 지휘소가 모두, 'any'면 한 팀 지휘소라도 무력화되면 종료
+    - phase: 어느 한 팀이 이 작전단계에 도달하면 종료
+    - no_pending_events: 대기 중인 이벤트(반복되는 탐색 제외)가 없으면 종료
+    """
+    strength_threshold: Optional[float] = None
+    command_posts_neutralized: Optional[str] = None
+    phase: Optional[Phase] = None
+    no_pending_events: bool = False
+
+    def __post_init__(self):
+        if self.command_posts_neutralized not in (None, 'both', 'any'):
+            raise ValueError(f"command_posts_neutralized must be 'both' or 'any', got {self.command_posts_neutralized}")
+        if isinstance(self.phase, str):
+            self.phase = Phase[self.phase]
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> 'TerminationCriteria':
+        """config.yaml의 termination 항목으로부터 생성"""
+        config = config or {}
+        return cls(
+            strength_threshold=config.get('strength_threshold'),
+            command_posts_neutralized=config.get('command_posts_neutralized'),
+            phase=config.get('phase'),
+            no_pending_events=config.get('no_pending_events', False)
+        )
+
+    def check(self, units: List[Unit], commands: Dict[Team, Command], pending_events: int) -> Optional[str]:
+        """종료 조건 검사, 만족한 조건 이름 반환 (없으면 None)"""
+        if self.strength_threshold is not None:
+            if any(team_strength(units, team) < self.strength_threshold for team in Team):
+                return 'strength_threshold'
+
+        if self.command_posts_neutralized is not None:
+            neutralized = []
+            for team in Team:
+                command_posts = [unit for unit in units if unit.team == team and unit.unit_type == UnitType.COMMAND_POST]
+                neutralized.append(bool(command_posts) and not any(unit.can_fire() for unit in command_posts))
+            if (all(neutralized) if self.command_posts_neutralized == 'both' else any(neutralized)):
+                return 'command_posts_neutralized'
+
+        if self.phase is not None:
+            if any(command.phase.value >= self.phase.value for command in commands.values()):
+                return 'phase'
+
+        if self.no_pending_events and pending_events == 0:
+            return 'no_pending_events'
+
+        return None
+
+
+@dataclass
+class SimulationResult:
+    """시뮬레이션 실행 결과"""
+    end_time: float
+    reason: str  # 종료 사유 (max_time, quit 또는 TerminationCriteria 조건 이름)
+    winner: Optional[Team]
+    strength: Dict[Team, float]
+    surviving: Dict[Team, Dict[UnitType, int]]
+    phases: Dict[Team, Phase]
+    event_metrics: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_simulation(cls, units: List[Unit], commands: Dict[Team, Command], end_time: float,
+                        reason: str, event_metrics: Optional[Dict[str, int]] = None) -> 'SimulationResult':
+        """종료 시점의 유닛/명령 상태로부터 결과 생성 (전투력 비율이 높은 팀을 승자로 판정)"""
+        strength = {team: team_strength(units, team) for team in Team}
+        if strength[Team.RED] > strength[Team.BLUE]:
+            winner = Team.RED
+        elif strength[Team.BLUE] > strength[Team.RED]:
+            winner = Team.BLUE
+        else:
+            winner = None
+        return cls(
+            end_time=end_time,
+            reason=reason,
+            winner=winner,
+            strength=strength,
+            surviving=surviving_units(units),
+            phases={team: command.phase for team, command in commands.items()},
+            event_metrics=event_metrics or {}
+        )
+
+    def summary(self) -> str:
+        """결과 요약 문자열"""
+        winner = self.winner.value if self.winner else 'DRAW'
+        strength = ', '.join(f"{team.value} {value:.2f}" for team, value in self.strength.items())
+        phases = ', '.join(f"{team.value} {phase.name}" for team, phase in self.phases.items())
+        return f"t={self.end_time:.1f} reason={self.reason} winner={winner} strength=({strength}) phase=({phases})"
@@ -1,22 +1,94 @@
-import pandas as pd
 import numpy as np
 from typing import Tuple, Dict
 from model.unit import UnitType, Unit
-import yaml
+from model.config import Config
 
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
+_dem_cache: Dict[str, np.ndarray] = {}
 
-PIXEL_TO_METER_SCALE = config['simulation']['pixel_to_meter_scale']
+def load_dem(dem_file: str) -> np.ndarray:
+    """DEM CSV 로드 (프로세스 내에서 파일당 한 번만 읽고 읽기 전용으로 공유)"""
+    dem_data = _dem_cache.get(dem_file)
+    if dem_data is None:
+        dem_data = np.loadtxt(dem_file, delimiter=',')
+        dem_data.setflags(write=False)
+        _dem_cache[dem_file] = dem_data
+    return dem_data
+
+class ElevationPyramid:
+    """DEM 최대/최소 고도 피라미드 (mipmap)
+
+    level k의 셀 하나는 원본 DEM의 2^k x 2^k 셀 블록의 최대/최소 고도를 담는다.
+    임의의 사각 영역은 해당 영역을 덮는 가장 거친 level의 2x2 셀 이하로 조회하므로
+    조회 결과는 실제 최대값 이상 / 실제 최소값 이하(보수적)이다.
+    """
+
+    def __init__(self, elevation: np.ndarray):
+        self.height, self.width = elevation.shape
+        self.max_levels = [elevation]
+        self.min_levels = [elevation]
+        while max(self.max_levels[-1].shape) > 1:
+            self.max_levels.append(self._reduce(self.max_levels[-1], np.maximum, -np.inf))
+            self.min_levels.append(self._reduce(self.min_levels[-1], np.minimum, np.inf))
+        for level in self.max_levels + self.min_levels:
+            level.setflags(write=False)
+
+    @staticmethod
+    def _reduce(level: np.ndarray, op, fill: float) -> np.ndarray:
+        """2x2 블록 단위로 축소 (홀수 크기는 fill로 채움)"""
+        rows, cols = level.shape
+        padded = np.full((rows + rows % 2, cols + cols % 2), fill)
+        padded[:rows, :cols] = level
+        return op(op(padded[0::2, 0::2], padded[1::2, 0::2]), op(padded[0::2, 1::2], padded[1::2, 1::2]))
+
+    def bounds(self, x0: int, y0: int, x1: int, y1: int) -> Tuple[float, float]:
+        """셀 영역 [x0, x1] x [y0, y1]의 (최소 고도 하한, 최대 고도 상한)
+
+        DEM 밖의 셀은 Terrain.get_elevation과 같이 고도 0으로 본다.
+        """
+        outside = x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width - 1), min(y1, self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return 0.0, 0.0
+        level = 0
+        while (x1 >> level) - (x0 >> level) > 1 or (y1 >> level) - (y0 >> level) > 1:
+            level += 1
+        # 최대 2x2 셀이므로 슬라이싱 대신 원소 단위로 조회
+        rows = {y0 >> level, y1 >> level}
+        cols = {x0 >> level, x1 >> level}
+        min_level, max_level = self.min_levels[level], self.max_levels[level]
+        low = min(min_level.item(row, col) for row in rows for col in cols)
+        high = max(max_level.item(row, col) for row in rows for col in cols)
+        if outside:
+            low, high = min(low, 0.0), max(high, 0.0)
+        return low, high
+
+
+_pyramid_cache: Dict[Tuple[str, float], ElevationPyramid] = {}
+
+
+def load_elevation_pyramid(dem_file: str, pixel_to_meter_scale: float) -> ElevationPyramid:
+    """픽셀 단위 고도의 피라미드 (DEM 파일/축척당 한 번만 생성하여 공유)"""
+    key = (dem_file, pixel_to_meter_scale)
+    pyramid = _pyramid_cache.get(key)
+    if pyramid is None:
+        pyramid = ElevationPyramid(load_dem(dem_file) / pixel_to_meter_scale)
+        _pyramid_cache[key] = pyramid
+    return pyramid
 
 class Terrain:
-    def __init__(self, dem_file: str = "database/xyz_coordinates.csv"):
+    def __init__(self, dem_file: str = "database/xyz_coordinates.csv", config: Config = None):
+        self.config = Config.from_any(config)
+        self.pixel_to_meter_scale = self.config.pixel_to_meter_scale
+
         # DEM 데이터 로드
-        self.dem_data = pd.read_csv(dem_file, header=None).values
+        self.dem_file = dem_file
+        self.dem_data = load_dem(dem_file)
+        self._pyramid = None
         
         # 지형 타입 상수 (픽셀 단위)
-        self.MOUNTAIN_THRESHOLD = 50 / PIXEL_TO_METER_SCALE  # 50m를 픽셀로 변환
-        self.RIVER_THRESHOLD = 39 / PIXEL_TO_METER_SCALE     # 39m를 픽셀로 변환
+        self.MOUNTAIN_THRESHOLD = 50 / self.pixel_to_meter_scale  # 50m를 픽셀로 변환
+        self.RIVER_THRESHOLD = 39 / self.pixel_to_meter_scale     # 39m를 픽셀로 변환
         
         # 지형별 이동속도 감소율
         self.terrain_decay_rates = {
@@ -31,9 +103,26 @@ class Terrain:
         x_int, y_int = int(x), int(y)
         if 0 <= x_int < self.dem_data.shape[1] and 0 <= y_int < self.dem_data.shape[0]:
             # DEM 데이터는 미터 단위이므로 픽셀로 변환
-            return self.dem_data[y_int, x_int] / PIXEL_TO_METER_SCALE
+            return self.dem_data[y_int, x_int] / self.pixel_to_meter_scale
         return 0.0  # 범위를 벗어난 경우 기본값
 
+    def get_elevations(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """여러 위치의 고도 (get_elevation과 같은 값, 픽셀 단위)"""
+        xs = np.asarray(xs, dtype=float).astype(int)  # int()와 같이 0 방향으로 버림
+        ys = np.asarray(ys, dtype=float).astype(int)
+        height, width = self.dem_data.shape
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        elevations = np.zeros(len(xs))
+        elevations[inside] = self.dem_data[ys[inside], xs[inside]] / self.pixel_to_meter_scale
+        return elevations
+
+    @property
+    def pyramid(self) -> ElevationPyramid:
+        """픽셀 단위 고도의 최대/최소 피라미드 (처음 사용할 때 생성)"""
+        if self._pyramid is None:
+            self._pyramid = load_elevation_pyramid(self.dem_file, self.pixel_to_meter_scale)
+        return self._pyramid
+
     def get_terrain_type(self, position: Tuple[int, int]) -> str:
         """주어진 위치의 지형 타입 반환"""
         elevation = self.get_elevation(position)
@@ -43,11 +132,63 @@ class Terrain:
             return 'river'
         return 'normal'
 
+    def terrain_type_mask(self, terrain_types) -> np.ndarray:
+        """DEM 격자([y, x]) 전체에서 지형 타입이 terrain_types 중 하나인 칸 (get_terrain_type과 같은 기준)"""
+        elevation = self.dem_data / self.pixel_to_meter_scale
+        mountain = elevation >= self.MOUNTAIN_THRESHOLD
+        river = ~mountain & (elevation <= self.RIVER_THRESHOLD)
+        masks = {'mountain': mountain, 'river': river, 'normal': ~(mountain | river)}
+        mask = np.zeros(self.dem_data.shape, dtype=bool)
+        for terrain_type in terrain_types:
+            mask |= masks[terrain_type]
+        return mask
+
+    def decay_rate_grid(self) -> np.ndarray:
+        """DEM 격자([y, x]) 전체의 지상 유닛 이동속도 감소율 (get_terrain_decay_rate와 같은 값)"""
+        grid = np.empty(self.dem_data.shape)
+        for terrain_type, decay_rate in self.terrain_decay_rates.items():
+            grid[self.terrain_type_mask([terrain_type])] = decay_rate
+        return grid
+
     def get_terrain_decay_rate(self, unit: Unit, position: Tuple[int, int]) -> float:
         """유닛의 지형에 따른 이동속도 감소율 반환"""
         # 드론은 지형 영향을 받지 않음
         if unit.unit_type == UnitType.DRONE:
             return 1.0
-            
+
         terrain_type = self.get_terrain_type(position)
-        return self.terrain_decay_rates[terrain_type] 
\ No newline at end of file
+        return self.terrain_decay_rates[terrain_type]
+
+    def get_decay_rates(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """여러 위치의 지상 유닛 이동속도 감소율 (get_terrain_decay_rate와 같은 값)"""
+        elevations = self.get_elevations(xs, ys)
+        return np.where(elevations >= self.MOUNTAIN_THRESHOLD, self.terrain_decay_rates['mountain'],
+                        np.where(elevations <= self.RIVER_THRESHOLD, self.terrain_decay_rates['river'],
+                                 self.terrain_decay_rates['normal']))
+
+    def next_decay_change(self, unit: Unit, position: Tuple[float, float], direction: Tuple[float, float],
+                          length: float) -> Tuple[float, float]:
+        """position에서 direction(단위 벡터) 방향으로 length만큼 직진할 때
+        출발 칸의 이동속도 감소율과, 감소율이 처음 바뀌는 지점까지의 거리(바뀌지 않으면 length) 반환
+
+        경로가 지나는 DEM 칸을 격자선 교차점으로 정확히 나누어 칸마다 감소율을 조회한다.
+        """
+        if unit.unit_type == UnitType.DRONE:
+            return 1.0, length
+        x0, y0 = position
+        dx, dy = direction
+        crossings = [np.array([0.0, length])]
+        for origin, step in ((x0, dx), (y0, dy)):
+            if step != 0:
+                low, high = sorted((origin, origin + step * length))
+                lines = np.arange(np.floor(low) + 1, np.ceil(high))
+                crossings.append((lines - origin) / step)
+        distances = np.unique(np.concatenate(crossings))
+        # 출발점이 격자선 위에 있을 때 부동소수점 오차로 생기는 아주 짧은 구간은 무시
+        distances = distances[(distances == 0.0) | ((distances > 1e-9) & (distances <= length))]
+        middles = (distances[:-1] + distances[1:]) / 2
+        rates = self.get_decay_rates(x0 + dx * middles, y0 + dy * middles)
+        changes = np.flatnonzero(rates != rates[0])
+        if len(changes):
+            return float(rates[0]), float(distances[changes[0]])
+        return float(rates[0]), length
\ No newline at end of file
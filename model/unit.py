@@ -1,16 +1,11 @@
-from dataclasses import dataclass
+import gc
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Tuple, Set, Optional
 from enum import Enum
 from model.event import Event, EventType
+from model.config import get_default_config
 import random
-import yaml
-
-# Load config
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
-
-# Constants
-PIXEL_TO_METER_SCALE = config['simulation']['pixel_to_meter_scale']
 
 class Team(Enum):
     RED = "RED"
@@ -43,6 +38,77 @@ class Action(Enum):
     MOVE = "MOVE"
     STOP = "STOP"
 
+# 유닛 타입별 사격 소요시간 분포 (초): ('triangular', (최소, 최대, 최빈값)) 또는 ('uniform', (최소, 최대))
+FIRE_INTERVALS = {
+    UnitType.ARTILLERY: ('triangular', (6.0, 20.0, 10.0)),  # 105밀리견인포 지속사격 분당 3발(장전 20초), 최고 10발(장전 6초)
+    UnitType.TANK: ('triangular', (5.0, 10.0, 6.0)),  # k-2전차 평균 분당 10발 (장전 6초)
+    UnitType.ANTI_TANK: ('triangular', (60.0, 180.0, 100.0)),  # 현궁 급속사격 장전 1분, 정상사격 3분
+    UnitType.RIFLE: ('uniform', (2.0, 3.0)),
+    UnitType.DRONE: ('uniform', (2.0, 3.0)),
+    UnitType.COMMAND_POST: ('uniform', (2.0, 3.0)),
+}
+
+
+def mean_fire_interval(unit_type: UnitType) -> float:
+    """유닛 타입별 평균 사격 소요시간 (초)"""
+    distribution, params = FIRE_INTERVALS[unit_type]
+    return sum(params) / len(params)  # 삼각분포 (a+b+c)/3, 균등분포 (a+b)/2
+
+
+# 임시 DB (나중에 DB에서 가져올 예정): 유닛 타입별 (탐지거리 m, 피탐지도, 사거리 m)
+UNIT_PROPERTIES_METERS = {
+    UnitType.RIFLE: (1000, 0.8, 400),
+    UnitType.ANTI_TANK: (3000, 0.8, 3000),
+    UnitType.TANK: (3000, 2.0, 3000),
+    UnitType.ARTILLERY: (1000, 2, 11300),
+    UnitType.DRONE: (500, 0, 0),
+    UnitType.COMMAND_POST: (1000, 1.0, 400),
+}
+
+# 유닛 타입별 탐지거리/사거리 미터 값을 지도 거리로 줄이는 비율 (포병 사거리는 줄이지 않음)
+RANGE_DIVISORS = {
+    unit_type: {'detect_range': 5, 'weapon_range': 1 if unit_type == UnitType.ARTILLERY else 5}
+    for unit_type in UnitType
+}
+
+# 유닛 타입별 (탐지거리, 피탐지도, 사거리): 거리는 RANGE_DIVISORS로 줄인 값 (픽셀 환산 전)
+UNIT_PROPERTIES = {
+    unit_type: (detect_range / RANGE_DIVISORS[unit_type]['detect_range'], detectability,
+                weapon_range / RANGE_DIVISORS[unit_type]['weapon_range'])
+    for unit_type, (detect_range, detectability, weapon_range) in UNIT_PROPERTIES_METERS.items()
+}
+
+
+@lru_cache(maxsize=None)
+def unit_properties(unit_type: UnitType, pixel_to_meter_scale: float) -> Tuple[float, float, float]:
+    """유닛 타입별 (탐지거리 픽셀, 피탐지도, 사거리 픽셀)"""
+    detect_range, detectability, weapon_range = UNIT_PROPERTIES[unit_type]
+    return detect_range / pixel_to_meter_scale, detectability, weapon_range / pixel_to_meter_scale
+
+
+# config.yaml의 unit_properties로 바꿀 수 있는 유닛 타입별 특성 (미터)
+OVERRIDABLE_PROPERTIES = ('detect_range', 'weapon_range')
+
+
+def apply_unit_properties(units: List['Unit'], overrides: Optional[dict], pixel_to_meter_scale: float) -> None:
+    """config.yaml의 unit_properties 항목을 유닛에 적용
+
+    예) {'TANK': {'detect_range': 3500, 'weapon_range': 2500}} (미터, 없는 항목은 UNIT_PROPERTIES 값 유지)
+    재정의 값은 UNIT_PROPERTIES_METERS와 같은 미터 값이며 기본값과 똑같이 RANGE_DIVISORS와 pixel_to_meter_scale로
+    환산한다 (TANK detect_range 3000이면 기본값과 같음).
+    피탐지도는 휴면 판정의 최대 피탐지도(model/activity.py)가 고정값이므로 바꿀 수 없다.
+    """
+    for type_name, properties in (overrides or {}).items():
+        unit_type = UnitType[type_name]
+        unknown = set(properties or {}) - set(OVERRIDABLE_PROPERTIES)
+        if unknown:
+            raise ValueError(f"Unknown unit properties for {type_name}: {sorted(unknown)}")
+        for name, meters in (properties or {}).items():
+            for unit in units:
+                if unit.unit_type == unit_type:
+                    setattr(unit, name, meters / RANGE_DIVISORS[unit_type][name] / pixel_to_meter_scale)
+
+
 @dataclass
 class Unit:
     id: int
@@ -55,17 +121,19 @@ class Unit:
     eligible_target_list: Set[int] = None
     objective: Optional[Tuple[float, float]] = None  # 이동 목표 지점
     target: Optional[int] = None  # 현재 사격 대상
+    pixel_to_meter_scale: Optional[float] = field(default=None, repr=False)  # None이면 기본 config.yaml 값 사용
+
+    def get_fire_interval(self, rng=None) -> float:
+        """유닛 타입별 사격 소요시간 반환 (rng: 사용할 난수 생성기, 기본값: random 모듈)"""
+        rng = rng or random
+        distribution, params = FIRE_INTERVALS[self.unit_type]
+        if distribution == 'triangular':
+            return rng.triangular(*params)
+        return rng.uniform(*params)
 
-    def get_fire_interval(self) -> float:
-        """유닛 타입별 사격 소요시간 반환"""
-        if self.unit_type == UnitType.ARTILLERY:
-            return random.triangular(6.0, 20.0, 10.0)  # 105밀리견인포 지속사격 분당 3발(장전 20초), 최고 10발(장전 6초)
-        elif self.unit_type == UnitType.TANK:
-            return random.triangular(5.0, 10.0, 6.0)  # k-2전차 평균 분당 10발 (장전 6초)
-        elif self.unit_type == UnitType.ANTI_TANK:
-            return random.triangular(60.0, 180.0, 100.0)  # 현궁 급속사격 장전 1분, 정상사격 3분
-        else:  # RIFLE, COMMAND_POST
-            return random.uniform(2.0, 3.0)
+    def mean_fire_interval(self) -> float:
+        """유닛 타입별 평균 사격 소요시간 (get_fire_interval의 기댓값)"""
+        return mean_fire_interval(self.unit_type)
 
     def __post_init__(self):
         if self.target_list is None:
@@ -85,33 +153,9 @@ class Unit:
         if len(self.position) != 2:
             raise ValueError(f"Position must be a 2D coordinate, got {self.position}")
 
-        # 임시 DB (나중에 DB에서 가져올 예정)
-        self.detect_range = {
-            UnitType.RIFLE: 1000 / 5 / PIXEL_TO_METER_SCALE,
-            UnitType.ANTI_TANK: 3000 / 5 / PIXEL_TO_METER_SCALE,
-            UnitType.TANK: 3000 / 5 / PIXEL_TO_METER_SCALE,     
-            UnitType.ARTILLERY: 1000 / 5 / PIXEL_TO_METER_SCALE,
-            UnitType.DRONE: 500 / 5 / PIXEL_TO_METER_SCALE,    
-            UnitType.COMMAND_POST: 1000 / 5 / PIXEL_TO_METER_SCALE
-        }[self.unit_type]
-
-        self.detectability = {
-            UnitType.RIFLE: 0.8,
-            UnitType.ANTI_TANK: 0.8,
-            UnitType.TANK: 2.0,     
-            UnitType.ARTILLERY: 2,
-            UnitType.DRONE: 0,    
-            UnitType.COMMAND_POST: 1.0
-        }[self.unit_type]
-
-        self.weapon_range = {
-            UnitType.RIFLE: 400 / 5 / PIXEL_TO_METER_SCALE,      
-            UnitType.ANTI_TANK: 3000 / 5 / PIXEL_TO_METER_SCALE,  
-            UnitType.TANK: 3000 / 5 / PIXEL_TO_METER_SCALE,       
-            UnitType.ARTILLERY: 11300 / 1 / PIXEL_TO_METER_SCALE,  
-            UnitType.DRONE: 0,      
-            UnitType.COMMAND_POST: 400 / 5 / PIXEL_TO_METER_SCALE 
-        }[self.unit_type]
+        if self.pixel_to_meter_scale is None:
+            self.pixel_to_meter_scale = get_default_config().pixel_to_meter_scale
+        self.detect_range, self.detectability, self.weapon_range = unit_properties(self.unit_type, self.pixel_to_meter_scale)
 
     def can_move(self) -> bool:
         """이동 가능 여부 확인"""
@@ -160,4 +204,56 @@ class Unit:
         """현재 사격 대상 업데이트"""
         self.target = target_id
 
-    
+
+class UnitList(list):
+    """id로 유닛을 바로 찾을 수 있는 유닛 목록 (append/extend로 추가한 유닛만 색인)"""
+
+    def __init__(self, units=()):
+        super().__init__(units)
+        self._by_id = {unit.id: unit for unit in self}
+
+    def append(self, unit: Unit) -> None:
+        super().append(unit)
+        self._by_id[unit.id] = unit
+
+    def extend(self, units) -> None:
+        for unit in units:
+            self.append(unit)
+
+    def find(self, unit_id: Optional[int]) -> Optional[Unit]:
+        return self._by_id.get(unit_id)
+
+
+def find_unit(units: List[Unit], unit_id: Optional[int]) -> Optional[Unit]:
+    """id로 유닛 찾기 (UnitList면 색인 사용, 일반 목록이면 순차 탐색)"""
+    if isinstance(units, UnitList):
+        return units.find(unit_id)
+    return next((unit for unit in units if unit.id == unit_id), None)
+
+
+def build_units(teams: List[Team], unit_types: List[UnitType], positions: List[Tuple[int, int]],
+                pixel_to_meter_scale: float, first_id: int = 0) -> UnitList:
+    """열(column)별 유닛 정보로 유닛 목록을 한 번에 생성 (id는 first_id부터 순서대로)
+
+    대규모 시나리오용: 유닛마다 Unit()의 검증(__post_init__)을 거치지 않고 필드를 직접 채운다.
+    position은 정수 좌표 튜플이어야 하며, 검증은 호출하는 쪽(model/scenario.py)에서 배열 단위로 한다.
+    """
+    units = []
+    new_unit = object.__new__
+    gc_enabled = gc.isenabled()
+    gc.disable()  # 새 객체만 만드는 동안 순환 참조 수집을 멈춤 (수만 개 생성 시 수집이 반복되는 비용 제거)
+    try:
+        for unit_id, (team, unit_type, position) in enumerate(zip(teams, unit_types, positions), first_id):
+            detect_range, detectability, weapon_range = unit_properties(unit_type, pixel_to_meter_scale)
+            unit = new_unit(Unit)
+            unit.__dict__ = {
+                'id': unit_id, 'team': team, 'unit_type': unit_type, 'position': position,
+                'status': Status.ALIVE, 'action': Action.STOP, 'target_list': set(), 'eligible_target_list': set(),
+                'objective': None, 'target': None, 'pixel_to_meter_scale': pixel_to_meter_scale,
+                'detect_range': detect_range, 'detectability': detectability, 'weapon_range': weapon_range,
+            }
+            units.append(unit)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return UnitList(units)
@@ -2,30 +2,40 @@ import pygame
 import os
 import sys
 import math
+import random
 import subprocess
 from typing import List, Dict, Tuple, Optional
-from .unit import Unit, Team, UnitType, Status
+from .unit import Unit, UnitList, Team, UnitType, Status, find_unit
 from .terrain import Terrain
 from .fire import Fire
 from .event import EventType
 from .function import calculate_distance
-import yaml
+from .config import Config
 
 
 
 
 
 # Sound 삽입
-# 초기화 (visualization.py 상단에 추가)
-pygame.mixer.init()
-#pygame.mixer.music.set_volume(1.0)  # 최대 볼륨
-
-# 사운드 파일 로딩
-sound_files = {
-    'RIFLE': pygame.mixer.Sound(os.path.join('database', 'rifle.wav')),
-    'TANK': pygame.mixer.Sound(os.path.join('database', 'tank.wav')),
-    'ARTILLERY': pygame.mixer.Sound(os.path.join('database', 'artillery.wav')),
+# 사운드 파일 (처음 재생할 때 mixer 초기화 후 로드)
+SOUND_FILES = {
+    'RIFLE': os.path.join('database', 'rifle.wav'),
+    'TANK': os.path.join('database', 'tank.wav'),
+    'ARTILLERY': os.path.join('database', 'artillery.wav'),
 }
+sound_files = {}
+
+def play_sound(sound_key: str):
+    """사운드 재생 (오디오 장치가 없으면 무시)"""
+    if sound_key not in sound_files:
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            sound_files[sound_key] = pygame.mixer.Sound(SOUND_FILES[sound_key])
+        except pygame.error:
+            sound_files[sound_key] = None
+    if sound_files[sound_key]:
+        sound_files[sound_key].play()
 
 # 유닛 유형별 매핑
 unit_sound_map = {
@@ -37,13 +47,10 @@ unit_sound_map = {
 
 }
 
-
-# Load config
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
-
 class Visualizer:
-    def __init__(self, width: int = 1600, height: int = 900, show_detection: bool = False, show_eligible_targets: bool = False, show_fire: bool = False, record_video: bool = False, output_path: str = "simulation.mp4"):
+    def __init__(self, width: int = 1600, height: int = 900, show_detection: bool = False, show_eligible_targets: bool = False, show_fire: bool = False, record_video: bool = False, output_path: str = "simulation.mp4",
+                 config: Config = None, terrain: Terrain = None, fire: Fire = None):
+        self.config = Config.from_any(config)
         pygame.init()
         self.width = width
         self.height = height
@@ -102,8 +109,27 @@ class Visualizer:
         # 유닛 크기
         self.unit_size = 10
 
-        self.terrain = Terrain()
-        self.fire = Fire()
+        self.terrain = terrain or Terrain(config=self.config)
+        self.fire = fire or Fire(self.config, self.terrain)
+        self.rng = random.Random()  # 탄착지점 표시용 난수 (모델 난수 흐름과 분리)
+        self.phases = None  # 스냅샷으로 그릴 때의 작전단계 (없으면 commands에서 읽음)
+
+    def draw_snapshot(self, snapshot, last_frame_time: float, events: List):
+        """모델 스레드가 만든 FrameSnapshot 그리기
+
+        events에는 이전에 그린 프레임 이후 건너뛴 프레임들의 이벤트까지 모두 담긴다.
+        """
+        self.current_time = snapshot.time
+        self.last_frame_time = last_frame_time
+        self.events = events
+        self.phases = snapshot.phases
+        self.draw_frame(UnitList(snapshot.units), snapshot.time)
+
+    def team_phase(self, team: Team):
+        """패널에 표시할 팀의 작전단계"""
+        if self.phases is not None:
+            return self.phases[team]
+        return self.commands[team].phase
 
     def draw_frame(self, units: List[Unit], current_time: float):
         """한 프레임 그리기"""
@@ -203,12 +229,12 @@ class Visualizer:
         }
 
         # RED 팀 작전단계
-        red_phase = phase_names.get(self.commands[Team.RED].phase.name, self.commands[Team.RED].phase.name)
+        red_phase = phase_names.get(self.team_phase(Team.RED).name, self.team_phase(Team.RED).name)
         red_phase_text = self.team_count_font.render(f"Red : {red_phase}", True, self.colors[Team.RED])
         self.screen.blit(red_phase_text, (panel_x + 10, separator_y + 35))
 
         # BLUE 팀 작전단계
-        blue_phase = phase_names.get(self.commands[Team.BLUE].phase.name, self.commands[Team.BLUE].phase.name)
+        blue_phase = phase_names.get(self.team_phase(Team.BLUE).name, self.team_phase(Team.BLUE).name)
         blue_phase_text = self.team_count_font.render(f"Blue : {blue_phase}", True, self.colors[Team.BLUE])
         self.screen.blit(blue_phase_text, (panel_x + 10, separator_y + 60))
 
@@ -256,7 +282,7 @@ class Visualizer:
             return
             
         for target_id in unit.target_list:
-            target = next((u for u in all_units if u.id == target_id), None)
+            target = find_unit(all_units, target_id)
             if target and target.status.value in ["ALIVE", "M_KILL"]:
                 start_pos = unit.position
                 end_pos = target.position
@@ -272,7 +298,7 @@ class Visualizer:
             return
             
         for target_id in unit.eligible_target_list:
-            target = next((u for u in all_units if u.id == target_id), None)
+            target = find_unit(all_units, target_id)
             if target and target.status.value in ["ALIVE", "M_KILL"]:
                 start_pos = unit.position
                 end_pos = target.position
@@ -292,7 +318,7 @@ class Visualizer:
             if (event.event_type == EventType.FIRE and 
                 event.source_id == unit.id and 
                 self.last_frame_time < event.time <= self.current_time):  # 이전 프레임 이후부터 현재까지의 이벤트
-                target = next((u for u in all_units if u.id == event.target_id), None)
+                target = find_unit(all_units, event.target_id)
                 if target and target.status in [Status.ALIVE, Status.M_KILL, Status.MINOR]:
                     # 사격선 색상 설정 (팀 색상)
                     color = self.colors[unit.team]
@@ -301,7 +327,7 @@ class Visualizer:
                     if unit.unit_type == UnitType.ARTILLERY:
                         # 탄착지점 계산
                         distance = calculate_distance(unit, target)
-                        impact_point = self.fire.calculate_impact_point(target.position, distance)
+                        impact_point = self.fire.calculate_impact_point(target.position, distance, self.rng)
                         
                         # 사격선 그리기 (포병 -> 탄착지점)
                         pygame.draw.line(
@@ -313,8 +339,8 @@ class Visualizer:
                         )
                         
                         # 살상반경 원 그리기 (반투명 주황색)
-                        lethal_radius = config['simulation']['lethal_radius']  # 치사반경 (m)
-                        PIXEL_TO_METER_SCALE = config['simulation']['pixel_to_meter_scale']
+                        lethal_radius = self.config.lethal_radius  # 치사반경 (m)
+                        PIXEL_TO_METER_SCALE = self.config.pixel_to_meter_scale
                         lethal_radius_pixels = 2*lethal_radius / PIXEL_TO_METER_SCALE  # 픽셀 단위로 변환 (시각화 목적으로 2배로 키웠음)
                         lethal_surface = pygame.Surface((lethal_radius_pixels * 2, lethal_radius_pixels * 2), pygame.SRCALPHA)
                         pygame.draw.circle(
@@ -332,7 +358,7 @@ class Visualizer:
                         self.draw_arrow(unit.position, impact_point, color)
                         sound_key = unit_sound_map.get(unit.unit_type)
                         if sound_key:
-                            sound_files[sound_key].play()
+                            play_sound(sound_key)
                     else:
                         # 일반 유닛의 경우 기존처럼 처리
                         pygame.draw.line(
@@ -346,7 +372,7 @@ class Visualizer:
 
                         sound_key = unit_sound_map.get(unit.unit_type)
                         if sound_key:
-                            sound_files[sound_key].play()
+                            play_sound(sound_key)
 
 
 
@@ -0,0 +1,50 @@
+import argparse
+import os
+import yaml
+from model.config import Config
+from model.optimize import CommandOptimizer, OptimizeSettings, PARAMETERS, OBJECTIVES
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='War Game course-of-action (command parameter) optimization')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Base config file')
+    parser.add_argument('--team', type=str, choices=['RED', 'BLUE'], default=None, help='Team whose commands are tuned')
+    parser.add_argument('--phases', type=str, default=None, help='Comma-separated phases to tune')
+    parser.add_argument('--parameters', type=str, default=None, help=f"Comma-separated fields to tune {PARAMETERS}")
+    parser.add_argument('--objective', type=str, choices=OBJECTIVES, default=None, help='Candidate score')
+    parser.add_argument('--generations', type=int, default=None, help='Cross-entropy generations')
+    parser.add_argument('--population', type=int, default=None, help='Candidates per generation')
+    parser.add_argument('--replications', type=int, default=None, help='Replications per candidate (shared seeds)')
+    parser.add_argument('--cache', type=str, default=None, help='Evaluation cache file (reused across runs)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='Base random seed for replications and sampling')
+    parser.add_argument('--max-time', type=float, default=None, help='Override max_time')
+    parser.add_argument('--output', type=str, default='results/optimize.yaml', help='Output YAML with tuned commands')
+
+    args = parser.parse_args()
+    config = Config.load(args.config)
+    section = dict(config.get('optimize') or {})
+    for key, value in [('team', args.team), ('objective', args.objective), ('generations', args.generations),
+                       ('population', args.population), ('replications', args.replications), ('cache_file', args.cache),
+                       ('phases', args.phases.split(',') if args.phases else None),
+                       ('parameters', args.parameters.split(',') if args.parameters else None)]:
+        if value is not None:
+            section[key] = value
+    settings = OptimizeSettings.from_config(section)
+
+    optimizer = CommandOptimizer(config, settings, workers=args.workers, base_seed=args.seed, max_time=args.max_time)
+    print(f"Tuning {settings.team.value} {', '.join(phase.name for phase in settings.phases)} "
+          f"({len(optimizer.space.dimensions)} dimensions, {settings.replications} replications per candidate)")
+    result = optimizer.run(
+        seed=args.seed,
+        progress=lambda summary: print(f"generation {summary.generation}: best {summary.best_score:.3f}, "
+                                       f"elite mean {summary.elite_mean:.3f}, "
+                                       f"{summary.evaluated} evaluated, {summary.cached} cached")
+    )
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        yaml.safe_dump({'commands': {settings.team.value: result.best.commands}}, f, sort_keys=False)
+    print(f"{settings.objective}: baseline {result.baseline.score:.3f} -> best {result.best.score:.3f} "
+          f"({result.replications_run} replications run)")
+    print(f"Saved tuned commands to {args.output}")
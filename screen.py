@@ -0,0 +1,68 @@
+import argparse
+import csv
+import os
+import time
+from model.config import Config
+from model.lanchester import LanchesterModel, GROUPS, calibrate, observed_counts, ignored_config_paths
+from model.runner import expand_grid, run_sweep
+from model.unit import Team
+from sweep import parse_param, load_grid
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='War Game aggregate (Lanchester) screening')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Base config file')
+    parser.add_argument('--grid', type=str, default=None, help='YAML file mapping config paths to value lists')
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help='Config path and values, e.g. simulation.lethal_radius=30,40 (repeatable)')
+    parser.add_argument('--max-time', type=float, default=None, help='Override max_time')
+    parser.add_argument('--calibrate', type=int, default=0,
+                        help='Fit rate_scale to this many entity-level replications of the base config first')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes for calibration runs')
+    parser.add_argument('--seed', type=int, default=0, help='Base random seed for calibration runs')
+    parser.add_argument('--output', type=str, default='results/screen.csv', help='Output CSV path')
+
+    args = parser.parse_args()
+    cells = expand_grid(load_grid(args))
+    ignored = ignored_config_paths(sorted({path for params in cells for path in params}))
+    if ignored:
+        parser.error(f"The aggregate model ignores {', '.join(ignored)} (it only reads unit counts, commands, "
+                     f"simulation.lethal_radius/pixel_to_meter_scale and lanchester.*); screen them with sweep.py")
+    base_config = Config.load(args.config)
+    max_time = args.max_time if args.max_time is not None else base_config.get('max_time', 100.0)
+
+    if args.calibrate > 0:
+        summary = run_sweep(base_config, {}, replications=args.calibrate, workers=args.workers,
+                            base_seed=args.seed, max_time=max_time)[0]
+        rate_scale, error = calibrate(base_config, observed_counts(summary), summary.mean_end_time)
+        print(f"Calibrated rate_scale over {args.calibrate} replications (squared error {error:.3f}):")
+        for team, scales in rate_scale.items():
+            print(f"  {team.value}: " + ', '.join(f"{fire_class}={scale:.4g}" for fire_class, scale in scales.items()))
+        # 보정값은 기본 설정에 넣어 격자의 lanchester.* 재정의와 함께 셀별 설정으로 읽음
+        base_config = base_config.with_overrides({'lanchester.rate_scale': {
+            team.value: {fire_class: float(scale) for fire_class, scale in scales.items()}
+            for team, scales in rate_scale.items()}})
+
+    configs = [base_config.with_overrides(params) for params in cells]
+    start = time.perf_counter()
+    model = LanchesterModel.from_configs(configs)  # 셀마다 자신의 lanchester 항목 사용
+    result = model.integrate(max_time)
+    elapsed = time.perf_counter() - start
+
+    final = result.final_counts()
+    strength = result.strength(model.initial)
+    rows = []
+    for index, params in enumerate(cells):
+        row = dict(params)
+        for team in [Team.RED, Team.BLUE]:
+            row[f'strength_{team.value}'] = float(strength[team][index])
+        for (team, unit_type), value in zip(GROUPS, final[index]):
+            row[f'surviving_{team.value}_{unit_type.value}'] = float(value)
+        rows.append(row)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Screened {len(rows)} configs in {elapsed * 1000:.1f} ms, saved to {args.output}")
@@ -1,24 +1,42 @@
-import yaml
 import time
-import pygame
-from typing import List, Dict, Optional
-from model.unit import Unit, Team, UnitType, Status, Action
-from model.visualization import Visualizer
-from model.event import Event, EventType
+from typing import List, Dict, Optional, Tuple, Union
+from model.unit import Unit, UnitList, Team, UnitType, Status, Action, apply_unit_properties
+from model.event import Event, EventType, create_event_queue
 from model.fire import Fire
 from model.detect import Detect
 from model.movement import Movement
-from model.command import Command, Phase
-import heapq
+from model.activity import ActivityManager
+from model.sensing import ParallelSensing
+from model.streams import RandomStreams
+from model.command import Command, Phase, parse_command_plan
+from model.config import Config
+from model.terrain import Terrain
+from model.termination import TerminationCriteria, SimulationResult
+from model.recorder import SnapshotRecorder
+from model.scenario import Scenario
+from model.playback import play
+from model.fork import Branch, run_forked, run_serial
+from model.checkpoint import SimulationState, capture_state, restore_state, save_checkpoint, load_checkpoint
 import argparse
 import os
+import random
+import shutil
 class Simulation:
-    def __init__(self, config_file: str, time_scale: float = 1.0, sim_speed: float = 1.0, 
-                 show_detection: bool = False, show_eligible_targets: bool = False, show_fire: bool = False):
-        """시뮬레이션 초기화"""
-        self.config = self._load_config(config_file)
-        self.units = []
-        self.events = []
+    def __init__(self, config: Union[str, dict, Config], time_scale: float = 1.0, sim_speed: float = 1.0, 
+                 show_detection: bool = False, show_eligible_targets: bool = False, show_fire: bool = False,
+                 headless: bool = False, verbose: bool = True):
+        """시뮬레이션 초기화
+
+        config는 설정 파일 경로, dict 또는 Config이며 모든 컴포넌트에 전달된다.
+        headless=True면 시각화/비디오 녹화 없이 실행하고, verbose=False면 로그를 출력하지 않는다.
+        """
+        self.config = Config.from_any(config)
+        self.verbose = verbose
+        self.units = UnitList()  # id로 바로 찾을 수 있는 유닛 목록
+        self.events = create_event_queue(
+            self.config['simulation'].get('event_queue', 'heap'),
+            self.config['simulation'].get('event_bucket_width', 1.0)
+        )
         self.current_time = 0.0
         self.time_scale = time_scale
         self.sim_speed = sim_speed
@@ -28,33 +46,49 @@ class Simulation:
         self.show_fire = show_fire
         
         # 비디오 설정
-        self.record_video = self.config.get('video', {}).get('enabled', False)
+        self.record_video = self.config.get('video', {}).get('enabled', False) and not headless
         self.output_path = self.config.get('video', {}).get('output_path', 'simulation.mp4')
         self.video_fps = self.config.get('video', {}).get('fps', 30)
         
-        print(f"Video recording: {'enabled' if self.record_video else 'disabled'}")  # 로그 추가
+        self._log(f"Video recording: {'enabled' if self.record_video else 'disabled'}")  # 로그 추가
         if self.record_video:
-            print(f"Output path: {self.output_path}")  # 로그 추가
-            print(f"Video FPS: {self.video_fps}")  # 로그 추가
+            self._log(f"Output path: {self.output_path}")  # 로그 추가
+            self._log(f"Video FPS: {self.video_fps}")  # 로그 추가
         
         # 시뮬레이션 시간 설정
         self.max_time = self.config.get('max_time', 100.0)
+        self.termination = TerminationCriteria.from_config(self.config.get('termination'))
+
+        # 틱별 상태 스냅샷 기록 (config.yaml의 recorder)
+        self.recorder = SnapshotRecorder.from_config(self.config.get('recorder'))
         
-        # 모델 컴포넌트 초기화
-        self.movement = Movement()
-        self.fire = Fire()
-        self.detect = Detect()
+        # 모델 컴포넌트 초기화 (지형은 한 번만 로드하여 공유)
+        self.terrain = Terrain(config=self.config)
+        # 용도별 난수 흐름 (config.yaml의 rng, 쓰지 않으면 전역 random)
+        self.streams = RandomStreams.from_config(self.config.get('rng'))
+        self.detect = Detect(self.config, self.terrain, self.streams)
+        self.fire = Fire(self.config, self.terrain, self.detect, self.streams)
+        self.movement = Movement(self.config, self.terrain, self.detect, self.streams)
+        # 접촉 범위 밖 유닛 휴면 (config.yaml의 activity)
+        self.activity = ActivityManager(self.config, self.movement, self.detect, self.fire, self.events, sim_speed)
+        # 탐색/사격 가능 타겟 계산 병렬 처리 (config.yaml의 parallel)
+        self.sensing = ParallelSensing(self.config, self.detect, self.fire)
         
-        # 명령 초기화
+        # 명령 초기화 (config.yaml의 commands 항목으로 작전단계별 명령 재정의 가능)
+        command_plans = self.config.get('commands') or {}
         self.commands = {
-            Team.RED: Command.create_phase_1_command(Team.RED),
-            Team.BLUE: Command.create_phase_1_command(Team.BLUE)
+            team: Command.create_phase_1_command(team).apply_plan(parse_command_plan(command_plans.get(team.value)))
+            for team in [Team.RED, Team.BLUE]
         }
         
         # 시각화 초기화
-        self.visualizer = Visualizer(800, 450, show_detection=self.show_detection, show_eligible_targets=self.show_eligible_targets, show_fire=self.show_fire, record_video=self.record_video, output_path=self.output_path)
-        self.visualizer.fire = self.fire  # Fire 객체 공유
-        self.visualizer.commands = self.commands  # Command 정보 공유
+        self.visualizer = None
+        if not headless:
+            from model.visualization import Visualizer  # pygame은 시각화할 때만 불러옴
+            self.visualizer = Visualizer(800, 450, show_detection=self.show_detection, show_eligible_targets=self.show_eligible_targets, show_fire=self.show_fire, record_video=self.record_video, output_path=self.output_path,
+                                         config=self.config, terrain=self.terrain, fire=self.fire)
+            self.visualizer.fire = self.fire  # Fire 객체 공유
+            self.visualizer.commands = self.commands  # Command 정보 공유
         
         # 초기 유닛 로드
         self._load_initial_units()
@@ -62,49 +96,25 @@ class Simulation:
         # 초기 이벤트 스케줄링
         self._schedule_initial_events()
 
-    def _load_config(self, config_file: str) -> dict:
-        """설정 파일 로드"""
-        with open(config_file, 'r') as f:
-            return yaml.safe_load(f)
+    def _log(self, message: str):
+        """verbose일 때만 로그 출력"""
+        if self.verbose:
+            print(message)
 
     def _load_initial_units(self):
-        """초기 유닛 로드"""
-        unit_id = 0
-        
-        def create_units_for_team(team: Team, unit_type: UnitType, positions: List[List[int]], num_units: int):
-            nonlocal unit_id
-            # 사용 가능한 위치 수 확인
-            available_positions = len(positions)
-            if available_positions < num_units:
-                print(f"Warning: Not enough positions for {team.value} {unit_type.value}. Requested {num_units}, but only {available_positions} positions available.")
-                num_units = available_positions
-            
-            # 지정된 수만큼 위치를 가져옴
-            for pos in positions[:num_units]:
-                position = (int(pos[0]), int(pos[1]))
-                self.units.append(Unit(
-                    id=unit_id,
-                    team=team,
-                    position=position,
-                    unit_type=unit_type
-                ))
-                unit_id += 1
-        
-        # RED 팀 유닛 생성
-        create_units_for_team(Team.RED, UnitType.ARTILLERY, self.config['initial_positions']['RED']['ARTILLERY'], self.config['num_artillery_red'])
-        create_units_for_team(Team.RED, UnitType.DRONE, self.config['initial_positions']['RED']['DRONE'], self.config['num_drone_red'])
-        create_units_for_team(Team.RED, UnitType.TANK, self.config['initial_positions']['RED']['TANK'], self.config['num_tank_red'])
-        create_units_for_team(Team.RED, UnitType.ANTI_TANK, self.config['initial_positions']['RED']['ANTI_TANK'], self.config['num_at_red'])
-        create_units_for_team(Team.RED, UnitType.RIFLE, self.config['initial_positions']['RED']['RIFLE'], self.config['num_infantry_red'])
-        create_units_for_team(Team.RED, UnitType.COMMAND_POST, self.config['initial_positions']['RED']['COMMAND_POST'], self.config['num_cp_red'])
-        
-        # BLUE 팀 유닛 생성
-        create_units_for_team(Team.BLUE, UnitType.ARTILLERY, self.config['initial_positions']['BLUE']['ARTILLERY'], self.config['num_artillery_blue'])
-        create_units_for_team(Team.BLUE, UnitType.DRONE, self.config['initial_positions']['BLUE']['DRONE'], self.config['num_drone_blue'])
-        create_units_for_team(Team.BLUE, UnitType.TANK, self.config['initial_positions']['BLUE']['TANK'], self.config['num_tank_blue'])
-        create_units_for_team(Team.BLUE, UnitType.ANTI_TANK, self.config['initial_positions']['BLUE']['ANTI_TANK'], self.config['num_at_blue'])
-        create_units_for_team(Team.BLUE, UnitType.RIFLE, self.config['initial_positions']['BLUE']['RIFLE'], self.config['num_infantry_blue'])
-        create_units_for_team(Team.BLUE, UnitType.COMMAND_POST, self.config['initial_positions']['BLUE']['COMMAND_POST'], self.config['num_cp_blue'])
+        """초기 유닛 로드
+
+        config.yaml의 scenario_file이 있으면 시나리오 파일(.npz/.csv, model/scenario.py)에서 한 번에 불러오고,
+        없으면 initial_positions와 num_* 유닛 수로 구성한다. 유닛 타입별 탐지거리/사거리는 unit_properties로 바꿀 수 있다.
+        """
+        scenario_file = self.config.get('scenario_file')
+        if scenario_file:
+            scenario = Scenario.load(scenario_file)
+            self._log(f"Loaded {len(scenario)} units from {scenario_file}")
+        else:
+            scenario = Scenario.from_config(self.config, self._log)
+        self.units = scenario.build_units(self.config.pixel_to_meter_scale)
+        apply_unit_properties(self.units, self.config.get('unit_properties'), self.config.pixel_to_meter_scale)
 
     def _get_command_for_team(self, team: Team) -> Command:
         """팀에 대한 명령 반환"""
@@ -116,152 +126,381 @@ class Simulation:
         for unit in self.units:
             unit.clear_targets()  # 이전 탐지 목록 초기화
         for unit in self.units:
-            self.detect.update_detection(unit, self.units)
+            self.detect.update_detection(unit, self.units, self.current_time)
             self.fire.update_eligible_targets(unit, self.units)
 
         # 이벤트 스케줄링
         for unit in self.units:
             command = self._get_command_for_team(unit.team)
+            # 탐색 이벤트 스케줄링 (이후 유닛 타입별 주기로 반복)
+            if self.detect.can_scan(unit):
+                self.events.schedule(self.detect.schedule_scan(unit, self.detect.first_scan_time(unit, self.current_time)))
             # 이동 이벤트 스케줄링
             if unit.can_move():
                 # 드론은 TAI로 이동, 다른 유닛은 maneuver_objective가 있을 때만 이동
                 if unit.unit_type == UnitType.DRONE or command.maneuver_objective is not None:
                     event = self.movement.move(unit, command, self.current_time, self.units)
                     if event:
-                        heapq.heappush(self.events, event)
+                        self.events.schedule(event)
             # 사격 이벤트 스케줄링
             if unit.can_fire():
                 event = self.fire.schedule_fire_event(unit, self.units, command, self.current_time)
                 if event:
-                    heapq.heappush(self.events, event)
+                    self.events.schedule(event)
 
     def handle_event(self, event: Event) -> Optional[Event]:
         """이벤트 처리
-        MOVE 이벤트는 move 메서드로 예약된 이벤트이고, move 메서드에서 unit.action와 unit.objective를 업데이트 해준다.
-                    objective와 충분히 가까우면 unit.action을 STOP으로 하고, 멀면 MOVE로 업데이트 해준다.
+        MOVE 이벤트는 move 메서드로 예약된 이동 구간 끝(도착, 지형 경계, 경유점) 이벤트이고,
+                    arrive 메서드에서 다음 구간을 예약하며 unit.action과 unit.objective를 업데이트 해준다.
+                    objective에 도착하면 unit.action을 STOP으로 하고, 아니면 MOVE로 유지한다.
         FIRE 이벤트는 schedule_fire_event 메서드로 예약된 이벤트이고
                      schedule_fire_event 메서드에서 unit.action을 FIRE로 업데이트 해준다.
                      fire 메서드는 사격을 실행하여 성공시 target의 상태를 업데이트 하고 unit.action을 STOP으로 업데이트 해준다.
+        DETECT 이벤트는 유닛 타입별 주기로 반복되는 탐색 이벤트이고, 탐지한 표적의 추적 정보를 갱신한 뒤 다음 탐색을 예약한다.
+                     휴면 유닛은 접촉 범위 안에 적이 없으므로 탐색 없이 다음 탐색만 예약한다.
         """
         if event.event_type == EventType.MOVE:
-            unit = next((u for u in self.units if u.id == event.source_id), None)
+            unit = self.units.find(event.source_id)
             if unit and unit.can_move():
-                # 유닛의 위치 업데이트
-                unit.update_position(event.position)
+                # 구간 끝 위치로 갱신하고 다음 구간 예약
+                return self.movement.arrive(unit, self.commands[unit.team], event, self.current_time)
 
         elif event.event_type == EventType.FIRE:
-            attacker = next((u for u in self.units if u.id == event.source_id), None)
-            target = next((u for u in self.units if u.id == event.target_id), None)
+            attacker = self.units.find(event.source_id)
+            target = self.units.find(event.target_id)
             if attacker and target:
-                return self.fire.fire(attacker, target, self.units, self.commands[attacker.team], self.current_time)
+                next_event = self.fire.fire(attacker, target, self.units, self.commands[attacker.team], self.current_time)
+                attacker.update_target(None)  # 사격 완료 후 사격 대상 초기화
+                return next_event
+
+        elif event.event_type == EventType.DETECT:
+            observer = self.units.find(event.source_id)
+            if observer and self.detect.can_scan(observer):
+                if not self.activity.is_dormant(observer.id):
+                    self.detect.update_detection(observer, self.units, self.current_time)
+                next_time = self.detect.next_scan_time(observer, event.time, self.current_time)
+                return self.detect.schedule_scan(observer, next_time)
+        return None
+
+    def _direct_fire_shot(self, event: Event) -> Optional[Tuple[Unit, Unit]]:
+        """직사화기 사격 이벤트면 (공격자, 표적), 아니면 None"""
+        if event.event_type != EventType.FIRE:
+            return None
+        attacker = self.units.find(event.source_id)
+        target = self.units.find(event.target_id)
+        if attacker and target and attacker.unit_type != UnitType.ARTILLERY:
+            return attacker, target
+        return None
+
+    def _resolve_direct_fire(self, shots: List[Tuple[Unit, Unit]]) -> None:
+        """모아둔 직사화기 사격을 처리 순서대로 한 번에 처리하고 목록 비우기 (handle_event의 FIRE 처리와 같은 결과)"""
+        if not shots:
+            return
+        self.fire.resolve_direct_fire(shots)
+        for attacker, _ in shots:
+            attacker.update_target(None)  # 사격 완료 후 사격 대상 초기화
+        shots.clear()
+
+    def _run_scans(self, scans: List[Event]) -> None:
+        """이 틱의 탐색(DETECT) 이벤트 처리
+
+        병렬 처리를 쓰면 탐색할 관측 유닛들을 모아 한 번에 계산하고(model/sensing.py), 다음 탐색은 이벤트 순서대로 예약한다.
+        """
+        if not self.sensing.enabled(self.units):
+            for event in scans:
+                next_event = self.handle_event(event)
+                if next_event:
+                    self.events.schedule(next_event)
+            return
+        observers = []
+        for event in scans:
+            observer = self.units.find(event.source_id)
+            if observer and self.detect.can_scan(observer):
+                if not self.activity.is_dormant(observer.id):
+                    observers.append(observer)
+                next_time = self.detect.next_scan_time(observer, event.time, self.current_time)
+                self.events.schedule(self.detect.schedule_scan(observer, next_time))
+        self.sensing.scan(observers, self.units, self.current_time)
+
+    def _cancel_disabled_events(self):
+        """사격/이동이 불가능해진 유닛의 대기 이벤트 취소"""
+        for unit in self.units:
+            if not unit.can_fire():
+                self.events.cancel_unit(unit.id, EventType.FIRE)
+            if not unit.can_move():
+                self.movement.halt(unit, self.current_time)
+                self.events.cancel_unit(unit.id, EventType.MOVE)
+            if not self.detect.can_scan(unit):
+                self.events.cancel_unit(unit.id, EventType.DETECT)
+
+    def step(self) -> List[Event]:
+        """현재 시간(current_time)의 한 틱 처리
+
+        이벤트 처리, 탐지/사격 가능 타겟 갱신, 지휘소 상황평가, 다음 이벤트 예약을 수행하고
+        처리한 이벤트 목록을 반환한다. 시간 증가는 호출하는 쪽에서 한다.
+        탐지/사격 가능 타겟 갱신과 다음 이벤트 예약은 휴면이 아닌 유닛만 처리한다 (model/activity.py).
+        """
+        # 이동 중인 유닛의 위치를 현재 시간의 궤적 위치로 갱신
+        self.movement.advance(self.units, self.current_time)
+
+        # 판정 주기마다 접촉 범위 밖 유닛 휴면 / 적이 접근한 유닛 깨우기
+        self.activity.update(self.units, self.current_time)
+
+        # 현재 시간에 발생할 모든 이벤트 수집
+        current_events = self.events.pop_until(self.current_time)
+        
+        # 현재 시간의 모든 이벤트 처리 (연달아 있는 직사화기 사격은 묶어서 한 번에 처리)
+        # 탐색은 이 틱의 사격 결과를 반영하도록 다른 이벤트를 모두 처리한 뒤 실행
+        direct_fire: List[Tuple[Unit, Unit]] = []
+        scans: List[Event] = []
+        for event in current_events:
+            if event.event_type == EventType.DETECT:
+                scans.append(event)
+                continue
+            shot = self._direct_fire_shot(event)
+            if shot:
+                direct_fire.append(shot)
+                continue
+            self._resolve_direct_fire(direct_fire)
+            next_event = self.handle_event(event)
+            if next_event:
+                self.events.schedule(next_event)
+        self._resolve_direct_fire(direct_fire)
+        self._run_scans(scans)
+
+        # 이벤트 처리 후 추적 정보로 모든 유닛의 탐지 목록과 사격 가능 타겟 목록 업데이트
+        # (이벤트 처리는 탐지/사격 가능 타겟 목록을 읽지 않으므로 틱마다 한 번만 갱신)
+        if current_events:
+            active_units = self.activity.active_units(self.units)
+            self.detect.refresh_tracks(self.units, self.current_time, active_units)
+            for team in [Team.RED, Team.BLUE]:
+                self.detect.share_info(team, self.units, active_units)
+            if self.sensing.enabled(self.units):
+                self.sensing.update_eligible_targets(active_units, self.units)
+            else:
+                for unit in active_units:
+                    self.fire.update_eligible_targets(unit, self.units)
+
+        # 무력화된 유닛의 대기 이벤트 취소
+        self._cancel_disabled_events()
+
+        # 지휘소 상황평가
+        for team in [Team.RED, Team.BLUE]:
+            command_posts = [unit for unit in self.units if unit.team == team and unit.unit_type == UnitType.COMMAND_POST]
+            if command_posts:  # 지휘소가 있는 경우에만
+                self.commands[team].evaluate_situation(command_posts[0], self.units)  # 지휘소와 모든 유닛 전달
+            # 작전단계가 바뀌었으면 팀의 휴면 유닛을 모두 깨움
+            self.activity.check_command(team, self.commands[team], self.units)
+            if command_posts:
+                # 작전단계가 변경된 경우 유닛들의 objective 업데이트
+                command = self.commands[team]
+                if command.maneuver_objective:
+                    for unit in self.activity.active_units(self.units):
+                        if unit.team == team :
+                            unit.update_objective(command.maneuver_objective[0])
+                            unit.update_action(Action.MOVE)
+    
+        # 다음 이벤트 예약
+        for unit in self.activity.active_units(self.units):
+            command = self._get_command_for_team(unit.team)
+            
+            # (a) 사격 이벤트 예약 (이미 대기 중인 사격 이벤트가 있으면 재탐지/재예약 생략)
+            if (unit.action != Action.FIRE and unit.eligible_target_list
+                    and not self.events.has_pending(unit.id, EventType.FIRE)):
+                fire_event = self.fire.schedule_fire_event(unit, self.units, command, self.current_time)
+                if fire_event:
+                    unit.update_action(Action.FIRE)
+                    self.events.schedule(fire_event)
+            
+            # (b) 이동 이벤트 예약 (목표가 바뀌거나 멈췄던 유닛만 새 구간 예약, 이전 이동 이벤트는 새 이벤트로 대체)
+            move_event = None
+            if unit.unit_type == UnitType.TANK: #Tank는 이동사격 가능
+                if unit.objective:
+                    move_event = self.movement.move(unit, command, self.current_time, self.units)
+            elif unit.action != Action.FIRE and unit.objective:
+                move_event = self.movement.move(unit, command, self.current_time, self.units)
+            elif unit.action == Action.FIRE and self.movement.halt(unit, self.current_time):
+                # 전차 외 유닛은 사격하는 동안 멈춤
+                self.events.cancel_unit(unit.id, EventType.MOVE)
+            if move_event:
+                self.events.schedule(move_event)
+
+        return current_events
+
+    def snapshot(self) -> SimulationState:
+        """현재 시뮬레이션 상태(유닛, FEL, 드론 패턴, 이동 구간, 탐지 추적, 휴면 유닛, 명령, 난수 상태) 스냅샷"""
+        return capture_state(self.units, self.events, self.movement, self.detect, self.activity, self.commands, self.current_time,
+                             config=self.config.data, streams=self.streams)
+
+    def restore(self, state: SimulationState) -> 'Simulation':
+        """snapshot()으로 저장한 상태로 복원 (같은 유닛 구성이어야 함)"""
+        restore_state(state, self.units, self.events, self.movement, self.detect, self.activity, self.commands, self.streams)
+        for unit in self.units:
+            self.fire.rebuild_target_index(unit, self.units)
+        self.current_time = state.current_time
+        return self
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """전역 random과 용도별 난수 흐름을 seed로 다시 설정 (스냅샷 복원 후 반복 실행/분기마다 사용)"""
+        random.seed(seed)
+        self.streams.seed_from_global()
+
+    def save_checkpoint(self, path: str) -> None:
+        """현재 상태를 체크포인트 파일로 저장 (.gz면 압축)"""
+        save_checkpoint(self.snapshot(), path)
+
+    @classmethod
+    def from_checkpoint(cls, path: str, config: Union[str, dict, Config, None] = None, **kwargs) -> 'Simulation':
+        """체크포인트 파일로부터 시뮬레이션 생성
+
+        config를 주지 않으면 체크포인트에 저장된 설정을 사용한다.
+        """
+        state = load_checkpoint(path)
+        simulation = cls(config if config is not None else state.config, **kwargs)
+        return simulation.restore(state)
+
+    def fork(self, n: Optional[int] = None, branches: Optional[List[Branch]] = None, max_time: Optional[float] = None,
+             base_seed: int = 0, workers: Optional[int] = None, use_fork: Optional[bool] = None) -> List[SimulationResult]:
+        """현재 시점에서 여러 what-if 분기를 실행하고 분기별 결과를 반환
+
+        branches를 주지 않으면 시드만 다른(base_seed + 분기 번호) n개의 분기를 실행한다.
+        os.fork를 쓸 수 있으면 분기마다 자식 프로세스를 만들고(copy-on-write로 지형/확률표 공유),
+        아니면(또는 use_fork=False) 스냅샷을 복원하며 차례로 실행한다. 어느 경우든 이 시뮬레이션의 상태는 바뀌지 않는다.
+        """
+        if branches is None:
+            if n is None:
+                raise ValueError("Either n or branches must be given")
+            branches = [Branch(seed=base_seed + index) for index in range(n)]
+        if use_fork is None:
+            use_fork = hasattr(os, 'fork')
+        if use_fork:
+            return run_forked(self, branches, max_time, workers)
+        return run_serial(self, branches, max_time)
+
+    def fast_forward(self, until_time: Optional[float] = None, until_phase: Optional[Phase] = None) -> Optional[str]:
+        """시각화 없이 until_time까지 또는 어느 한 팀이 until_phase에 도달할 때까지 진행
+
+        종료 조건(config.yaml의 termination)을 만족하면 멈추고 그 이름을 반환한다.
+        멈춘 시점의 상태는 다음 틱 처리 직전이므로 그대로 snapshot()/run_simulation()에 이어 쓸 수 있다.
+        """
+        if until_time is None:
+            until_time = self.max_time
+        while self.current_time < until_time:
+            if until_phase and any(command.phase.value >= until_phase.value for command in self.commands.values()):
+                break
+            self.step()
+            if self.recorder:
+                self.recorder.record(self.current_time, self.units, self.commands)
+            termination_reason = self.check_termination()
+            if termination_reason:
+                return termination_reason
+            self.current_time += self.sim_speed
         return None
 
-    def run_simulation(self, max_time: float = None):
-        """시뮬레이션 실행"""
+    def check_termination(self) -> Optional[str]:
+        """조기 종료 조건 검사, 만족한 조건 이름 반환
+
+        탐색(DETECT)은 무력화되지 않은 유닛마다 계속 다시 예약되므로 no_pending_events는 탐색을 뺀 이벤트 수로 판정한다.
+        """
+        pending_events = len(self.events)
+        if self.termination.no_pending_events:
+            pending_events = self.events.count_pending(exclude=(EventType.DETECT,))
+        return self.termination.check(self.units, self.commands, pending_events)
+
+    def get_result(self, reason: str) -> SimulationResult:
+        """현재 상태의 시뮬레이션 결과 반환"""
+        return SimulationResult.from_simulation(self.units, self.commands, self.current_time, reason, self.events.metrics())
+
+    def run_simulation(self, max_time: float = None, hold_window: Optional[bool] = None,
+                       threaded: Optional[bool] = None) -> SimulationResult:
+        """시뮬레이션 실행
+
+        max_time에 도달하거나 종료 조건(config.yaml의 termination)을 만족하면 결과를 반환한다.
+        hold_window가 True면 종료 후 창을 닫을 때까지 대기한다 (기본값: 시각화 사용 시 True).
+        threaded가 True면 모델을 별도 스레드에서 진행하고 화면은 스냅샷 큐에서 꺼내 그린다
+        (model/playback.py, 기본값: 시각화 사용 시 True, 비디오 녹화 시에는 틱마다 프레임을 저장하도록 False).
+        """
         if max_time is None:
             max_time = self.max_time
+        if hold_window is None:
+            hold_window = self.visualizer is not None
+        if threaded is None:
+            threaded = not self.record_video
+        threaded = threaded and self.visualizer is not None
             
-        print(f"Starting simulation with max_time: {max_time}")
+        self._log(f"Starting simulation with max_time: {max_time}")
         last_visualization_time = 0.0
         visualization_interval = 1 / self.time_scale  # Match simulation speed with visualization
 
         # 프레임 디렉토리 초기화
         if self.record_video:
-            import shutil
             if os.path.exists(self.visualizer.frame_dir):
                 shutil.rmtree(self.visualizer.frame_dir)
             os.makedirs(self.visualizer.frame_dir)
 
+        if self.visualizer:
+            import pygame
 
-        while self.current_time < max_time:
-            # pygame 이벤트 처리
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+        reason = 'max_time'
+        try:
+            if threaded:
+                reason = play(self, max_time, speed=self.time_scale)
+                if reason == 'quit':
                     self.visualizer.close()
-                    return 
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        self.visualizer.paused = not self.visualizer.paused
+                    return self.get_result('quit')
+            else:
+                while self.current_time < max_time:
+                    if self.visualizer:
+                        # pygame 이벤트 처리
+                        quit_requested = False
+                        for event in pygame.event.get():
+                            if event.type == pygame.QUIT:
+                                quit_requested = True
+                            if event.type == pygame.KEYDOWN:
+                                if event.key == pygame.K_SPACE:
+                                    self.visualizer.paused = not self.visualizer.paused
+                        if quit_requested:
+                            self.visualizer.close()
+                            return self.get_result('quit')
 
+                        if self.visualizer.paused:
+                            self.visualizer.show_pause_screen()
+                            continue
 
-            if self.visualizer.paused:
-                self.visualizer.show_pause_screen()
-                continue
+                    current_events = self.step()
+                    if self.recorder:
+                        self.recorder.record(self.current_time, self.units, self.commands)
 
-            # 현재 시간에 발생할 모든 이벤트 수집
-            current_events = []
-            while self.events and self.events[0].time <= self.current_time:
-                event = heapq.heappop(self.events)
-                current_events.append(event)
-            
-            # 현재 시간의 모든 이벤트 처리
-            for event in current_events:
-                next_event = self.handle_event(event)
-                if next_event:
-                    heapq.heappush(self.events, next_event)
-                
-                # 각 이벤트 처리 후 모든 유닛의 탐지 상태와 사격 가능 타겟 목록 업데이트
-                for unit in self.units:
-                    unit.clear_targets()  # 이전 탐지 목록 초기화
-                for unit in self.units:
-                    self.detect.update_detection(unit, self.units)
-                for team in [Team.RED, Team.BLUE]:
-                    self.detect.share_info(team, self.units)
-                for unit in self.units:
-                    self.fire.update_eligible_targets(unit, self.units)
+                    # 시각화 업데이트 (일정 간격으로만)
+                    if self.visualizer and self.current_time - last_visualization_time >= visualization_interval:
+                        self.visualizer.current_time = self.current_time
+                        self.visualizer.last_frame_time = last_visualization_time
+                        self.visualizer.events = current_events  # 현재 시간의 이벤트들을 전달
+                        self.visualizer.draw_frame(self.units, self.current_time)
+                        last_visualization_time = self.current_time
+                        time.sleep(visualization_interval)
 
-            # 지휘소 상황평가
-            for team in [Team.RED, Team.BLUE]:
-                command_posts = [unit for unit in self.units if unit.team == team and unit.unit_type == UnitType.COMMAND_POST]
-                if command_posts:  # 지휘소가 있는 경우에만
-                    self.commands[team].evaluate_situation(command_posts[0], self.units)  # 지휘소와 모든 유닛 전달
-                    
-                    # 작전단계가 변경된 경우 유닛들의 objective 업데이트
-                    command = self.commands[team]
-                    if command.maneuver_objective:
-                        for unit in self.units:
-                            if unit.team == team :
-                                unit.update_objective(command.maneuver_objective[0])
-                                unit.update_action(Action.MOVE)
-        
-            # 다음 이벤트 예약
-            for unit in self.units:
-                command = self._get_command_for_team(unit.team)
-                
-                # (a) 사격 이벤트 예약
-                if unit.action != Action.FIRE and unit.eligible_target_list:
-                    fire_event = self.fire.schedule_fire_event(unit, self.units, command, self.current_time)
-                    if fire_event:
-                        unit.update_action(Action.FIRE)
-                        heapq.heappush(self.events, fire_event)
-                
-                # (b) 이동 이벤트 예약
-                if unit.unit_type == UnitType.TANK: #Tank는 이동사격 가능
-                    if unit.objective:
-                        move_event = self.movement.move(unit, command, self.current_time, self.units)
-                    if move_event:
-                        heapq.heappush(self.events, move_event)
-                elif unit.action != Action.FIRE and unit.objective:
-                    move_event = self.movement.move(unit, command, self.current_time, self.units)
-                    if move_event:
-                        heapq.heappush(self.events, move_event)
-
-            # 시각화 업데이트 (일정 간격으로만)
-            if self.current_time - last_visualization_time >= visualization_interval:
-                self.visualizer.current_time = self.current_time
-                self.visualizer.last_frame_time = last_visualization_time
-                self.visualizer.events = current_events  # 현재 시간의 이벤트들을 전달
-                self.visualizer.draw_frame(self.units, self.current_time)
-                last_visualization_time = self.current_time
-                time.sleep(visualization_interval)
-
-            # 시간 증가
-            self.current_time += self.sim_speed
+                    # 종료 조건 검사
+                    termination_reason = self.check_termination()
+                    if termination_reason:
+                        reason = termination_reason
+                        break
 
-            
-        # 시뮬레이션 종료 후 마지막 상태 표시
-        self.visualizer.current_time = self.current_time
-        self.visualizer.draw_frame(self.units, self.current_time)
+                    # 시간 증가
+                    self.current_time += self.sim_speed
+        finally:
+            # 창을 닫아 중단한 경우에도 마지막 버퍼와 manifest.json 저장
+            if self.recorder:
+                self.recorder.close()
+
+        result = self.get_result(reason)
+        self._log(f"Simulation ended: {result.summary()}")
+        self._log(f"Event queue metrics: {result.event_metrics}")
+
+        if self.visualizer:
+            # 시뮬레이션 종료 후 마지막 상태 표시
+            self.visualizer.current_time = self.current_time
+            self.visualizer.draw_frame(self.units, self.current_time)
         
         # 비디오 녹화가 활성화된 경우 비디오 생성
         if self.record_video:
@@ -272,12 +511,17 @@ class Simulation:
                 shutil.rmtree(self.visualizer.frame_dir)
         
         # 창 유지
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.visualizer.close()
-                    return
-            time.sleep(0.1)
+        if self.visualizer and hold_window:
+            while True:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.visualizer.close()
+                        return result
+                time.sleep(0.1)
+        elif self.visualizer:
+            self.visualizer.close()
+
+        return result
 
         
 
@@ -288,15 +532,43 @@ if __name__ == "__main__":
     parser.add_argument('--eligible_TL', type=str, choices=['T', 'F'], default='F', help='Show eligible target lines (T/F)')
     parser.add_argument('--fire', type=str, choices=['T', 'F'], default='F', help='Show fire lines (T/F)')
     parser.add_argument('--sim_speed', type=float, default=1.0, help='Simulation speed')
+    parser.add_argument('--headless', action='store_true', help='Run without visualization and return immediately')
+    parser.add_argument('--sync', action='store_true', help='Step the model and draw in the same loop (no model thread)')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Config file')
+    parser.add_argument('--workers', type=str, default=None,
+                        help="Sensing threads (number or 'auto' for all cores, overrides parallel.workers)")
+    parser.add_argument('--resume', type=str, default=None, help='Resume from a checkpoint file')
+    parser.add_argument('--save-checkpoint', type=str, default=None,
+                        help='Fast-forward headless, save a checkpoint to this path and exit')
+    parser.add_argument('--until-time', type=float, default=None, help='Checkpoint time for --save-checkpoint')
+    parser.add_argument('--until-phase', type=str, choices=[phase.name for phase in Phase], default=None,
+                        help='Checkpoint when either team reaches this phase (for --save-checkpoint)')
 
     args = parser.parse_args()
-    
-    simulation = Simulation(
-        "config.yaml",  # 기본 설정 파일 사용
+
+    options = dict(
         time_scale=args.time_scale,
         show_detection=(args.detection == 'T'),
         show_eligible_targets=(args.eligible_TL == 'T'),
         show_fire=(args.fire == 'T'),
-        sim_speed=args.sim_speed
+        sim_speed=args.sim_speed,
+        headless=args.headless or args.save_checkpoint is not None
     )
-    simulation.run_simulation() 
+    overrides = {'parallel.workers': args.workers} if args.workers is not None else {}
+    if args.resume:
+        state = load_checkpoint(args.resume)
+        simulation = Simulation(Config.from_any(state.config).with_overrides(overrides), **options).restore(state)
+        if simulation.recorder:
+            simulation.recorder.continue_existing()  # 체크포인트 이전 기록의 청크를 덮어쓰지 않고 이어서 기록
+    else:
+        simulation = Simulation(Config.load(args.config).with_overrides(overrides), **options)  # 기본 설정 파일: config.yaml
+
+    if args.save_checkpoint:
+        until_phase = Phase[args.until_phase] if args.until_phase else None
+        simulation.fast_forward(args.until_time, until_phase)
+        simulation.save_checkpoint(args.save_checkpoint)
+        if simulation.recorder:
+            simulation.recorder.close()  # 체크포인트 시점까지의 기록과 manifest.json 저장
+        print(f"Saved checkpoint at t={simulation.current_time:.1f} to {args.save_checkpoint}")
+    else:
+        simulation.run_simulation(threaded=False if args.sync else None)
@@ -0,0 +1,82 @@
+import argparse
+import csv
+import os
+import yaml
+from model.config import Config
+from model.replication import StoppingRule
+from model.runner import run_sweep
+
+
+def parse_param(text: str):
+    """'경로=값1,값2' 형식의 파라미터를 (경로, 값 목록)으로 변환 (값은 YAML로 해석)"""
+    path, _, values = text.partition('=')
+    if not path or not values:
+        raise argparse.ArgumentTypeError(f"Parameter must look like path=value1,value2, got {text}")
+    return path, yaml.safe_load(f"[{values}]")
+
+
+def load_grid(args) -> dict:
+    """--grid 파일과 --param 인자를 합쳐 파라미터 격자 생성"""
+    grid = {}
+    if args.grid:
+        with open(args.grid, 'r') as f:
+            grid.update(yaml.safe_load(f) or {})
+    for path, values in args.param:
+        grid[path] = values
+    return grid
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='War Game parameter sweep')
+    parser.add_argument('--config', type=str, default='config.yaml', help='Base config file')
+    parser.add_argument('--grid', type=str, default=None, help='YAML file mapping config paths to value lists')
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help='Config path and values, e.g. simulation.lethal_radius=30,40 (repeatable)')
+    parser.add_argument('--replications', type=int, default=10, help='Replications per grid cell')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='Base random seed')
+    parser.add_argument('--max-time', type=float, default=None, help='Override max_time')
+    parser.add_argument('--checkpoint', type=str, default=None, help='Warm-start every replication from this checkpoint')
+    parser.add_argument('--ci-width', type=float, default=None,
+                        help='Replicate each cell until the confidence intervals of replication.metrics are this narrow '
+                             '(overrides --replications, other settings from the replication section of the config)')
+    parser.add_argument('--max-replications', type=int, default=None, help='Upper bound per cell with --ci-width')
+    parser.add_argument('--streams', action='store_true',
+                        help='Common random numbers: separate RNG streams per purpose (fire interval, impact, hit, kill, detection)')
+    parser.add_argument('--antithetic', action='store_true',
+                        help='Run replications as plain/antithetic pairs sharing a seed (implies --streams)')
+    parser.add_argument('--output', type=str, default='results/sweep.csv', help='Output CSV path')
+
+    args = parser.parse_args()
+    grid = load_grid(args)
+    config = Config.load(args.config)
+    if args.streams:
+        config = config.with_overrides({'rng.streams': True})
+
+    stopping = None
+    if args.ci_width is not None:
+        section = dict(config.get('replication') or {})
+        section['ci_width'] = args.ci_width
+        if args.max_replications is not None:
+            section['max_replications'] = args.max_replications
+        stopping = StoppingRule.from_config(section)
+
+    if args.antithetic and (stopping.max_replications if stopping else args.replications) % 2:
+        parser.error('--antithetic needs an even --replications (or --max-replications with --ci-width)')
+
+    summaries = run_sweep(config, grid, replications=args.replications, workers=args.workers,
+                          base_seed=args.seed, max_time=args.max_time,
+                          checkpoint=args.checkpoint, stopping=stopping, antithetic=args.antithetic)
+
+    rows = [summary.to_row() for summary in summaries]
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    for summary in summaries:
+        win_rate = ', '.join(f"{name} {rate:.2f}" for name, rate in summary.win_rate.items())
+        print(f"{summary.params}: win rate ({win_rate}), mean end time {summary.mean_end_time:.1f}, "
+              f"{summary.replications} replications")
+    print(f"Saved {len(rows)} cells to {args.output}")